@@ -0,0 +1,128 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from process_local import ProcessLocal, connect_sqlite
+
+CACHE_SCHEMA = ("CREATE TABLE IF NOT EXISTS analysis_cache ("
+                "key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, stored_at REAL NOT NULL, result TEXT NOT NULL)")
+
+
+def content_key(filename, data):
+    """Content-addressed key for an upload: its file type plus a SHA-256 of its bytes."""
+    extension = os.path.splitext(filename)[1].lower()
+    return f"{extension}:{hashlib.sha256(data).hexdigest()}"
+
+
+def file_content_key(filename, file, block_size=1 << 16):
+    """content_key() for a seekable file object, hashed block by block. Rewinds the file."""
+    extension = os.path.splitext(filename)[1].lower()
+    digest = hashlib.sha256()
+    file.seek(0)
+    for block in iter(lambda: file.read(block_size), b''):
+        digest.update(block)
+    file.seek(0)
+    return f"{extension}:{digest.hexdigest()}"
+
+
+class AnalysisCache:
+    """
+    Caches full resume analysis results by upload content and model version.
+
+    Entries live in an in-memory LRU with a TTL, with an optional SQLite tier for
+    persistence across restarts and workers. Every lookup checks the fingerprint
+    function; when the models change, all entries made with the old models are dropped.
+    """
+    def __init__(self, fingerprint, max_entries=1024, ttl_seconds=86400, db_path=None):
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+        self._entries = OrderedDict()  # key -> (stored_at, result)
+        self._current_fingerprint = None
+        self._db = ProcessLocal(lambda: connect_sqlite(self.db_path, CACHE_SCHEMA))
+        self._lock = threading.Lock()
+
+    def _check_fingerprint(self):
+        """Drops every entry made with other models. Must be called with the lock held."""
+        fingerprint = self.fingerprint()
+        if fingerprint != self._current_fingerprint:
+            if self._current_fingerprint is not None:
+                logging.info("Models changed; invalidating the analysis cache.")
+                self.stats['invalidations'] += 1
+            self._entries.clear()
+            if self.db_path:
+                db = self._db.get()
+                db.execute("DELETE FROM analysis_cache WHERE fingerprint != ?", (fingerprint,))
+                db.commit()
+            self._current_fingerprint = fingerprint
+        return fingerprint
+
+    def get(self, key):
+        """Returns the cached result for key, or None."""
+        now = time.time()
+        with self._lock:
+            fingerprint = self._check_fingerprint()
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    return entry[1]
+                del self._entries[key]
+
+            if self.db_path:
+                row = self._db.get().execute(
+                    "SELECT stored_at, result FROM analysis_cache WHERE key = ? AND fingerprint = ?",
+                    (key, fingerprint),
+                ).fetchone()
+                if row and now - row[0] <= self.ttl_seconds:
+                    result = json.loads(row[1])
+                    self._remember(key, row[0], result)
+                    self.stats['disk_hits'] += 1
+                    return result
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, key, result):
+        """Stores a result under key in memory and, if enabled, on disk."""
+        now = time.time()
+        with self._lock:
+            fingerprint = self._check_fingerprint()
+            self._remember(key, now, result)
+            if self.db_path:
+                db = self._db.get()
+                db.execute(
+                    "INSERT OR REPLACE INTO analysis_cache (key, fingerprint, stored_at, result) VALUES (?, ?, ?, ?)",
+                    (key, fingerprint, now, json.dumps(result)),
+                )
+                db.execute("DELETE FROM analysis_cache WHERE stored_at < ?", (now - self.ttl_seconds,))
+                db.commit()
+
+    def _remember(self, key, stored_at, result):
+        self._entries[key] = (stored_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def clear(self):
+        """Drops every entry, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+            if self.db_path:
+                db = self._db.get()
+                db.execute("DELETE FROM analysis_cache")
+                db.commit()
+
+    def snapshot(self):
+        """Returns the hit/miss counters plus the current number of in-memory entries."""
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries))
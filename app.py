@@ -1,44 +1,118 @@
 
-from flask import Flask, render_template, request
-from PyPDF2 import PdfReader
+from flask import Flask, Response, g, jsonify, make_response, render_template, request, url_for
 import re
-import pickle
 import os
 import logging
 import math
+import io
+import csv
+import hashlib
+import hmac
+import time
+import zipfile
+from functools import wraps
+
+from keyword_matcher import KeywordMatcher
+from text_normalizer import clean_resume_text
+from pdf_extraction import PdfExtractionService, PdfExtractionTimeout, PdfHasNoTextLayer
+from analysis_cache import AnalysisCache, content_key, file_content_key
+from candidate_store import CandidateStore
+from jd_matching import JobMatcher, skill_weights
+from keyword_bitsets import KeywordVocabulary
+from model_registry import ModelRegistry, load_memory_mapped
+from feature_pipeline import FeaturePipeline, StageTimer
+from job_queue import JobQueue, JobQueueFull
+from instrumentation import MetricsRegistry, RequestProfiler
+from extractor_registry import ExtractorRegistry, gil_disabled
+from streaming_ingest import (ArchiveTooLarge, FileTooLarge, SpooledRequest, check_file_size, file_size,
+                              format_size, iter_decoded_chunks, spool_stream)
 
 # Configure basic logging
 logging.basicConfig(level=logging.INFO)
 
 app = Flask(__name__)
 
+# --- Upload Limits ---
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024     # Whole request; larger requests are rejected with 413
+MAX_RESUME_BYTES = 10 * 1024 * 1024     # One resume file, including files inside ZIP archives
+MAX_ARCHIVE_MEMBERS = 200               # Files in one ZIP archive; archives with more are rejected with 400
+MAX_ARCHIVE_BYTES = 100 * 1024 * 1024   # Decompressed size of one ZIP archive; larger archives are rejected with 400
+UPLOAD_SPOOL_BYTES = 1024 * 1024        # Uploads larger than this are spooled to a temporary file
+EXTRACT_CHUNK_CHARS = 64 * 1024         # Resume text handed to the extractors at a time
+EXTRACT_OVERLAP_CHARS = 512             # Carried between chunks so matches across chunk boundaries are kept
+# Threads running a resume's extractors concurrently; by default only on a free-threaded interpreter,
+# since the regex engine holds the GIL. Set EXTRACTOR_WORKERS=0 to always run them one after another.
+EXTRACTOR_WORKERS = int(os.environ.get('EXTRACTOR_WORKERS', 4 if gil_disabled() else 0))
+
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
+SpooledRequest.spool_threshold = UPLOAD_SPOOL_BYTES
+app.request_class = SpooledRequest
+
+# --- Metrics and Profiling ---
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))   # Fraction of requests run under cProfile
+PROFILE_ON_REQUEST = os.environ.get('PROFILE_ON_REQUEST') == '1'        # Also profile requests sending 'X-Profile: 1'
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')                 # Where .prof files are written
+
+metrics = MetricsRegistry()
+REQUEST_SECONDS = metrics.histogram('resume_request_duration_seconds', "Request latency by route and status.",
+                                    labelnames=('route', 'method', 'status'))
+STAGE_SECONDS = metrics.histogram('resume_stage_duration_seconds', "Time spent in each analysis stage.",
+                                  labelnames=('route', 'stage'))
+DOCUMENT_BYTES = metrics.histogram('resume_document_bytes', "Size of each resume file read.", labelnames=('type',),
+                                   buckets=(1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216))
+PDF_PAGES = metrics.histogram('resume_pdf_pages', "Page count of each PDF (before the page cap).",
+                              buckets=(1, 2, 3, 5, 10, 20, 40, 100, 500))
+MODEL_FALLBACKS = metrics.counter('resume_model_fallbacks_total', "Times load_model returned a mock instead of a pickled model.",
+                                  labelnames=('model',))
+# Read from the live objects at scrape time
+metrics.callback('resume_models_mocked', "1 for each model of the current set that is a mock.", labelname='model',
+                 fn=lambda: {filename: int(info['type'].startswith('Mock')) for filename, info in model_registry.current().info.items()})
+metrics.callback('resume_pdf_extraction_total', "PDF extraction counters (documents, pages, truncated, timeouts, image-only, skipped, fallback and cached pages).",
+                 lambda: dict(pdf_service.stats), type='counter', labelname='event')
+metrics.callback('resume_analysis_cache_total', "Analysis cache counters (hits, misses, evictions, invalidations).",
+                 lambda: {k: v for k, v in analysis_cache.snapshot().items() if k != 'entries'}, type='counter', labelname='event')
+metrics.callback('resume_analysis_cache_entries', "Results held in the in-memory analysis cache.",
+                 lambda: analysis_cache.snapshot()['entries'])
+metrics.callback('resume_jobs_total', "Async job counters (submitted, rejected, completed, failed).",
+                 lambda: dict(job_queue.stats), type='counter', labelname='event')
+metrics.callback('resume_jobs_active', "Async jobs waiting for or running on a worker.", labelname='status',
+                 fn=lambda: {k: v for k, v in job_queue.snapshot().items() if k in ('queued', 'running')})
+
+request_profiler = RequestProfiler(sample_rate=PROFILE_SAMPLE_RATE, allow_requested=PROFILE_ON_REQUEST, output_dir=PROFILE_DIR)
+
 # --- Model Loading and Configuration ---
 MODELS_DIR = 'models'
 
-def load_model(filename):
+# Model files, loaded lazily through model_registry
+CATEGORIZATION_CLASSIFIER = 'rf_classifier_categorization.pkl'
+CATEGORIZATION_VECTORIZER = 'tfidf_vectorizer_categorization.pkl'
+JOB_RECOMMENDATION_CLASSIFIER = 'rf_classifier_job_recommendation.pkl'
+JOB_RECOMMENDATION_VECTORIZER = 'tfidf_vectorizer_job_recommendation.pkl'
+MODEL_FILES = [CATEGORIZATION_CLASSIFIER, CATEGORIZATION_VECTORIZER, JOB_RECOMMENDATION_CLASSIFIER, JOB_RECOMMENDATION_VECTORIZER]
+
+def load_model(filename, models_dir=MODELS_DIR):
     """Loads a pickled model from the models directory, falling back to a mock if files are missing."""
-    path = os.path.join(MODELS_DIR, filename)
+    path = os.path.join(models_dir, filename)
     try:
-        # 1. Attempt to load the real model
-        with open(path, 'rb') as f:
-            logging.info(f"Successfully loaded model: {filename}")
-            return pickle.load(f)
+        # 1. Attempt to load the real model (through a memory-mapped copy, see load_memory_mapped)
+        model = load_memory_mapped(path)
+        logging.info(f"Successfully loaded model: {filename}")
+        return model
             
     except (FileNotFoundError, EOFError):
         # 2. Fall back to Mock loading if the file is not found or corrupted
         logging.error(f"Model file not found or corrupted: {path}. Falling back to MockClassifier.")
-        if "vectorizer" in filename:
-            return MockVectorizer()
-        elif "classifier" in filename:
-            return MockClassifier(filename)
     except Exception as e:
         logging.error(f"Error loading model {filename}: {e}. Falling back to MockClassifier.")
-        if "vectorizer" in filename:
-            return MockVectorizer()
-        elif "classifier" in filename:
-            return MockClassifier(filename)
-    
-    return None
+
+    if "vectorizer" in filename:
+        model = MockVectorizer()
+    elif "classifier" in filename:
+        model = MockClassifier(filename)
+    else:
+        return None
+    MODEL_FALLBACKS.inc(model=filename)
+    return model
 
 # --- Mock Classes with Dynamic Keyword-Based Logic (CRITICAL FIX) ---
 class MockVectorizer:
@@ -58,8 +132,8 @@ class MockClassifier:
     def predict(self, cleaned_text):
         if not isinstance(cleaned_text, str):
             # This handles cases where the real vectorizer is present but the classifier is mocked.
-            # We return a default in this unlikely scenario.
-            return ["Data Science"] 
+            # We return a default (one per row for batched input) in this unlikely scenario.
+            return ["Data Science"] * getattr(cleaned_text, 'shape', (1,))[0]
 
         text_lower = cleaned_text.lower()
         
@@ -91,13 +165,81 @@ class MockClassifier:
             # Default fallback (original ML Engineer role)
             return ["Data Scientist"]
 
-# Load Categorization Models (They will be mocked if files are missing)
-rf_classifier_categorization = load_model('rf_classifier_categorization.pkl')
-tfidf_vectorizer_categorization = load_model('tfidf_vectorizer_categorization.pkl')
+# Model registry: each model is loaded on first use (they will be mocked if files are missing).
+# When the pickles change on disk, every server process swaps in the new set by itself.
+MODEL_CHECK_SECONDS = 5             # How often a request checks the models directory for changes
+model_registry = ModelRegistry(MODELS_DIR, load_model, preload=MODEL_FILES, check_interval=MODEL_CHECK_SECONDS)
+
+def preload_models():
+    """
+    Loads every model now instead of on first use. gunicorn.conf.py calls this in the master
+    process, so the forked workers share the loaded models copy-on-write.
+    """
+    model_registry.current().preload(MODEL_FILES)
+
+# --- PDF Extraction Configuration ---
+PDF_MAX_WORKERS = os.cpu_count() or 2   # Processes parsing PDF pages in parallel
+PDF_TIMEOUT_SECONDS = 15                # Wall-clock limit for extracting one document
+PDF_MAX_PAGES = 40                      # Pages beyond this are not extracted
+PDF_PAGE_CACHE_PAGES = 2048             # Extracted page texts kept for repeat uploads of the same PDF
+
+pdf_service = PdfExtractionService(max_workers=PDF_MAX_WORKERS, timeout=PDF_TIMEOUT_SECONDS, max_pages=PDF_MAX_PAGES,
+                                   on_page_count=PDF_PAGES.observe, page_cache_pages=PDF_PAGE_CACHE_PAGES)
+
+# --- Analysis Cache Configuration ---
+ANALYSIS_CACHE_SIZE = 1024                       # Results kept in memory (LRU)
+ANALYSIS_CACHE_TTL_SECONDS = 24 * 60 * 60        # Cached results expire after a day
+ANALYSIS_CACHE_DB = os.environ.get('ANALYSIS_CACHE_DB')  # Path to a SQLite file enables the on-disk tier
+
+analysis_cache = AnalysisCache(model_registry.fingerprint, max_entries=ANALYSIS_CACHE_SIZE,
+                               ttl_seconds=ANALYSIS_CACHE_TTL_SECONDS, db_path=ANALYSIS_CACHE_DB)
+
+# --- Async Job Queue Configuration ---
+JOB_WORKERS = 4                     # Threads analyzing submitted resumes
+JOB_QUEUE_SIZE = 64                 # Jobs allowed to wait; further submissions get 503
+JOB_TTL_SECONDS = 60 * 60           # Finished jobs can be polled for an hour
+JOB_QUEUE_DB = os.environ.get('JOB_QUEUE_DB')  # A SQLite file lets every worker process answer status polls
+
+job_queue = JobQueue(max_workers=JOB_WORKERS, max_pending=JOB_QUEUE_SIZE,
+                     ttl_seconds=JOB_TTL_SECONDS, db_path=JOB_QUEUE_DB)
+
+# --- Candidate Store Configuration ---
+# A SQLite path turns on saving every analyzed resume (contact details included); off by default
+CANDIDATE_STORE_DB = os.environ.get('CANDIDATE_STORE_DB', '')
+CANDIDATE_SEARCH_LIMIT = 20         # Default number of candidates a search returns
+CANDIDATE_SKILL_WEIGHT = 0.3        # Share of the ranking score from skill overlap when a job description is given
+
+# --- Access Control ---
+# Bearer token for the recruiter and admin endpoints (/candidates/*, /models/reload); while unset they answer 404
+ADMIN_API_TOKEN = os.environ.get('ADMIN_API_TOKEN', '')
 
-# Load Job Recommendation Models
-rf_classifier_job_recommendation = load_model('rf_classifier_job_recommendation.pkl')
-tfidf_vectorizer_job_recommendation = load_model('tfidf_vectorizer_job_recommendation.pkl')
+def requires_admin_token(view):
+    """
+    Guards a recruiter or admin endpoint: it answers 404 while ADMIN_API_TOKEN is unset, and 401
+    unless the request sends 'Authorization: Bearer <ADMIN_API_TOKEN>'.
+    """
+    @wraps(view)
+    def guarded(*args, **kwargs):
+        if not ADMIN_API_TOKEN:
+            return jsonify({'error': "Not found."}), 404
+        supplied = request.headers.get('Authorization', '').encode('utf-8')
+        if not hmac.compare_digest(supplied, f"Bearer {ADMIN_API_TOKEN}".encode('utf-8')):
+            return jsonify({'error': "A valid API token is required."}), 401, {'WWW-Authenticate': 'Bearer'}
+        return view(*args, **kwargs)
+    return guarded
+
+def candidate_vector_space():
+    """(version, dimension) of the vectorizer candidate vectors are made with; (None, 0) while it is mocked."""
+    models = model_registry.current()
+    vectorizer = models.get(JOB_RECOMMENDATION_VECTORIZER)
+    if not hasattr(vectorizer, 'vocabulary_'):
+        return None, 0
+    return models.info[JOB_RECOMMENDATION_VECTORIZER]['checksum'], len(vectorizer.vocabulary_)
+
+# --- Job Description Matching Configuration ---
+JD_SIMILARITY_WEIGHT = 0.5          # Share of a job-description ATS score from TF-IDF similarity; the rest is skill overlap
+JD_VECTOR_CACHE_SIZE = 256          # Job descriptions whose vectors are kept (per model set)
+MAX_JOB_DESCRIPTIONS = 100          # Job descriptions a single /match request may score against
 
 
 # List of all possible skills (Used for both extraction and ATS scoring)
@@ -162,35 +304,99 @@ ALL_SKILLS = [
     'Non-Fungible Tokens (NFTs)'
 ]
 
+# Education keywords (Used for education extraction)
+EDUCATION_KEYWORDS = [
+    'Computer Science', 'Information Technology', 'Software Engineering', 'Electrical Engineering', 'Mechanical Engineering', 'Civil Engineering',
+    'Chemical Engineering', 'Biomedical Engineering', 'Aerospace Engineering', 'Nuclear Engineering', 'Industrial Engineering', 'Systems Engineering',
+    'Environmental Engineering', 'Petroleum Engineering', 'Geological Engineering', 'Marine Engineering', 'Robotics Engineering', 'Biotechnology',
+    'Biochemistry', 'Microbiology', 'Genetics', 'Molecular Biology', 'Bioinformatics', 'Neuroscience', 'Biophysics', 'Biostatistics', 'Pharmacology',
+    'Physiology', 'Anatomy', 'Pathology', 'Immunology', 'Epidemiology', 'Public Health', 'Health Administration', 'Nursing', 'Medicine', 'Dentistry',
+    'Pharmacy', 'Veterinary Medicine', 'Medical Technology', 'Radiography', 'Physical Therapy', 'Occupational Therapy', 'Speech Therapy', 'Nutrition',
+    'Sports Science', 'Kinesiology', 'Exercise Physiology', 'Sports Medicine', 'Rehabilitation Science', 'Psychology', 'Counseling', 'Social Work',
+    'Sociology', 'Anthropology', 'Criminal Justice', 'Political Science', 'International Relations', 'Economics', 'Finance', 'Accounting', 'Business Administration',
+    'Management', 'Marketing', 'Entrepreneurship', 'Hospitality Management', 'Tourism Management', 'Supply Chain Management', 'Logistics Management',
+    'Operations Management', 'Human Resource Management', 'Organizational Behavior', 'Project Management', 'Quality Management', 'Risk Management',
+    'Strategic Management', 'Public Administration', 'Urban Planning', 'Architecture', 'Interior Design', 'Landscape Architecture', 'Fine Arts',
+    'Visual Arts', 'Graphic Design', 'Fashion Design', 'Industrial Design', 'Product Design', 'Animation', 'Film Studies', 'Media Studies',
+    'Communication Studies', 'Journalism', 'Broadcasting', 'Creative Writing', 'English Literature', 'Linguistics', 'Translation Studies',
+    'Foreign Languages', 'Modern Languages', 'Classical Studies', 'History', 'Archaeology', 'Philosophy', 'Theology', 'Religious Studies',
+    'Ethics', 'Education', 'Early Childhood Education', 'Elementary Education', 'Secondary Education', 'Special Education', 'Higher Education',
+    'Adult Education', 'Distance Education', 'Online Education', 'Instructional Design', 'Curriculum Development', 'Library Science', 
+    'Information Science', 'Computer Engineering', 'Software Development', 'Cybersecurity', 'Information Security',
+    'Network Engineering', 'Data Science', 'Data Analytics', 'Business Analytics', 'Operations Research', 'Decision Sciences',
+    'Human-Computer Interaction', 'User Experience Design', 'User Interface Design', 'Digital Marketing', 'Content Strategy',
+    'Brand Management', 'Public Relations', 'Corporate Communications', 'Media Production', 'Digital Media', 'Web Development',
+    'Mobile App Development', 'Game Development', 'Virtual Reality', 'Augmented Reality', 'Blockchain Technology', 'Cryptocurrency',
+    'Digital Forensics', 'Forensic Science', 'Criminalistics', 'Crime Scene Investigation', 'Emergency Management', 'Fire Science',
+    'Environmental Science', 'Climate Science', 'Meteorology', 'Geography', 'Geomatics', 'Remote Sensing', 'Geoinformatics',
+    'Cartography', 'GIS (Geographic Information Systems)', 'Environmental Management', 'Sustainability Studies', 'Renewable Energy',
+    'Green Technology', 'Ecology', 'Conservation Biology', 'Wildlife Biology', 'Zoology'
+]
+
+# Prebuilt single-pass matchers for the keyword lists above
+skill_matcher = KeywordMatcher(ALL_SKILLS)
+education_matcher = KeywordMatcher(EDUCATION_KEYWORDS, ignore_case=True)
+
+# Fixed bit positions of the same lists, for packing skills and education across many resumes
+skill_vocabulary = KeywordVocabulary(ALL_SKILLS)
+education_vocabulary = KeywordVocabulary(EDUCATION_KEYWORDS)
+
+candidate_store = (CandidateStore(CANDIDATE_STORE_DB, candidate_vector_space, skill_vocabulary, education_vocabulary)
+                   if CANDIDATE_STORE_DB else None)
+
 
 # --- Utility Functions (Modified to pass cleaned text to predict functions) ---
 
 def cleanResume(txt):
     """Cleans resume text for ML prediction by removing links, special characters, and extra spaces."""
-    cleanText = re.sub(r'http\S+\s', ' ', txt)
-    cleanText = re.sub('RT|cc', ' ', cleanText)
-    cleanText = re.sub(r'#\S+\s*', ' ', cleanText)
-    cleanText = re.sub(r'@\S+', ' ', cleanText)
-    # Remove isolated non-word characters and numbers often found in margins (ATS-friendly parsing)
-    cleanText = re.sub(r'\s+[^a-z0-9\s]\s+', ' ', cleanText)
-    # Remove punctuation and special characters (ATS-friendly for keyword matching)
-    cleanText = re.sub(r'[%s]' % re.escape("""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""), ' ', cleanText)
-    cleanText = re.sub(r'[^\x00-\x7f]', r' ', cleanText)
-    cleanText = re.sub(r'\s+', ' ', cleanText)
-    return cleanText.lower().strip()
+    # Fused normalizer (see text_normalizer.py); output is identical to the original eight re.sub passes
+    return clean_resume_text(txt)
  
+PDF_TIMEOUT_MESSAGE = (f"The PDF could not be read within {PDF_TIMEOUT_SECONDS} seconds. "
+                       "Please upload a smaller or simpler PDF, or a TXT file.")
+
+def pdf_extraction_error(error):
+    """
+    The ValueError to report for a failed PDF extraction: PdfHasNoTextLayer as it is, a timeout
+    as PDF_TIMEOUT_MESSAGE, or None for other failures (the file then counts as empty).
+    """
+    if isinstance(error, PdfHasNoTextLayer):
+        return error
+    if isinstance(error, PdfExtractionTimeout):
+        return ValueError(PDF_TIMEOUT_MESSAGE)
+    logging.error(f"PDF extraction failed: {error}")
+    return None
+
 def pdf_to_text(file):
-    """Extracts text from a PDF file object using PyPDF2."""
+    """
+    Extracts text from a PDF file object on the PDF extraction process pool. Raises ValueError
+    for scanned or image-only PDFs and for PDFs not extracted within PDF_TIMEOUT_SECONDS.
+    """
     try:
-        reader = PdfReader(file)
-        text = ' '.join(page.extract_text() or '' for page in reader.pages)
-        return text
+        return pdf_service.extract_text(file)
     except Exception as e:
-        logging.error(f"PDF extraction failed: {e}")
+        error = pdf_extraction_error(e)
+        if error is not None:
+            raise error
         return ""
 
+def pdfs_to_text(files):
+    """
+    Extracts text from many PDF file objects concurrently. Failed files give an empty string,
+    and PDFs without a text layer or timed out the ValueError to report.
+    """
+    texts = []
+    for result in pdf_service.extract_many(list(files)):
+        if isinstance(result, Exception):
+            result = pdf_extraction_error(result) or ""
+        texts.append(result)
+    return texts
+
 def predict_category(resume_text):
     """Predicts the general category of the resume using the categorization model."""
+    models = model_registry.current()
+    rf_classifier_categorization = models.get(CATEGORIZATION_CLASSIFIER)
+    tfidf_vectorizer_categorization = models.get(CATEGORIZATION_VECTORIZER)
     if not rf_classifier_categorization:
         return "Model Error: Categorization Model Missing" 
         
@@ -206,6 +412,9 @@ def predict_category(resume_text):
 
 def job_recommendation(resume_text):
     """Recommends a specific job title using the job recommendation model."""
+    models = model_registry.current()
+    rf_classifier_job_recommendation = models.get(JOB_RECOMMENDATION_CLASSIFIER)
+    tfidf_vectorizer_job_recommendation = models.get(JOB_RECOMMENDATION_VECTORIZER)
     if not rf_classifier_job_recommendation:
         return "Model Error: Job Recommendation Model Missing" 
         
@@ -219,78 +428,122 @@ def job_recommendation(resume_text):
     resume_tfidf = tfidf_vectorizer_job_recommendation.transform([clean_text])
     return rf_classifier_job_recommendation.predict(resume_tfidf)[0]
 
+def predict_batch(vectorizer, classifier, clean_texts, features=None):
+    """
+    Classifies many cleaned resumes with one sparse-matrix transform and one predict call.
+    Precomputed TF-IDF features (from feature_pipeline) skip the transform.
+    """
+    if isinstance(vectorizer, MockVectorizer):
+        # The mock vectorizer only handles one document at a time
+        return [classifier.predict(clean_text)[0] for clean_text in clean_texts]
+
+    resumes_tfidf = features if features is not None else vectorizer.transform(clean_texts)
+    return list(classifier.predict(resumes_tfidf))
+
+def predict_categories(clean_texts, features=None, models=None):
+    """Batch version of predict_category for already cleaned resume texts."""
+    models = models or model_registry.current()
+    rf_classifier_categorization = models.get(CATEGORIZATION_CLASSIFIER)
+    if not rf_classifier_categorization:
+        return ["Model Error: Categorization Model Missing"] * len(clean_texts)
+    return predict_batch(models.get(CATEGORIZATION_VECTORIZER), rf_classifier_categorization, clean_texts, features)
+
+def job_recommendations(clean_texts, features=None, models=None):
+    """Batch version of job_recommendation for already cleaned resume texts."""
+    models = models or model_registry.current()
+    rf_classifier_job_recommendation = models.get(JOB_RECOMMENDATION_CLASSIFIER)
+    if not rf_classifier_job_recommendation:
+        return ["Model Error: Job Recommendation Model Missing"] * len(clean_texts)
+    return predict_batch(models.get(JOB_RECOMMENDATION_VECTORIZER), rf_classifier_job_recommendation, clean_texts, features)
+
+def get_feature_pipeline(models):
+    """Returns the FeaturePipeline (clean once, tokenize once for both vectorizers) of a model set."""
+    return models.derived('feature_pipeline', lambda: FeaturePipeline(cleanResume, {
+        'categorization': models.get(CATEGORIZATION_VECTORIZER),
+        'job_recommendation': models.get(JOB_RECOMMENDATION_VECTORIZER),
+    }))
+
+def get_job_matcher(models):
+    """Returns the JobMatcher (ATS scores against job descriptions, with cached JD vectors) of a model set."""
+    def vectorize(texts):
+        _, features = get_feature_pipeline(models).run(texts)
+        return features.get('job_recommendation')
+    return models.derived('job_matcher', lambda: JobMatcher(
+        vectorize, skill_matcher, skill_weights(ALL_SKILLS, models.get(JOB_RECOMMENDATION_VECTORIZER)),
+        JD_SIMILARITY_WEIGHT, JD_VECTOR_CACHE_SIZE))
+
+
+PHONE_PATTERN = re.compile(r"\b(?:\+?\d{1,3}[-.\s]?)?\(?\d{2,4}\)?[-.\s]?\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}\b")
+EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+NAME_PATTERN = re.compile(r"(\b[A-Z][a-z]+\b)\s(\b[A-Z][a-z]+\b)(?:\s(\b[A-Z][a-z]+\b))?(?:\s(\b[A-Z][a-z]+\b))?")
+NAME_SEARCH_CHARS = 1000  # The name is only looked for near the start of the resume
 
 def extract_contact_number_from_resume(text):
     """Extracts a common phone number format."""
-    pattern = r"\b(?:\+?\d{1,3}[-.\s]?)?\(?\d{2,4}\)?[-.\s]?\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}\b"
-    match = re.search(pattern, text)
+    match = PHONE_PATTERN.search(text)
     return match.group() if match else "N/A"
 
+def clean_email(email):
+    """Removes common parsing artifacts (e.g. a leading 'ph' from 'phone') from a matched email."""
+    email = re.sub(r'^(pe|ph)', '', email, flags=re.IGNORECASE)
+    email = re.sub(r'^\W+|\s+', '', email)
+    return email if email else "N/A"
+
 def extract_email_from_resume(text):
     """Extracts an email address and cleans common parsing artifacts."""
-    pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"
-    match = re.search(pattern, text)
-    if match:
-        email = match.group()
-        email = re.sub(r'^(pe|ph)', '', email, flags=re.IGNORECASE)
-        email = re.sub(r'^\W+|\s+', '', email)
-        return email if email else "N/A"
-    return "N/A"
+    match = EMAIL_PATTERN.search(text)
+    return clean_email(match.group()) if match else "N/A"
 
 def extract_name_from_resume(text):
     """ATS-Friendly name extraction: Looks for 2-4 capitalized words near the start."""
-    pattern = r"(\b[A-Z][a-z]+\b)\s(\b[A-Z][a-z]+\b)(?:\s(\b[A-Z][a-z]+\b))?(?:\s(\b[A-Z][a-z]+\b))?"
-    match = re.search(pattern, text[:1000])
+    match = NAME_PATTERN.search(text[:NAME_SEARCH_CHARS])
     return ' '.join(filter(None, match.groups())) if match else "N/A"
 
 
 def extract_skills_from_resume(text):
     """Extracts skills from the global predefined list (ALL_SKILLS)."""
-    extracted_skills = []
-    text_lower = text.lower()
-    for skill in ALL_SKILLS:
-        pattern = r"\b{}\b".format(re.escape(skill.lower()))
-        if re.search(pattern, text_lower):
-            extracted_skills.append(skill)
+    extracted_skills = skill_matcher.find(text.lower())
     return list(set(extracted_skills)) 
 
 def extract_education_from_resume(text):
     """Extracts education keywords."""
-    education_keywords = [
-        'Computer Science', 'Information Technology', 'Software Engineering', 'Electrical Engineering', 'Mechanical Engineering', 'Civil Engineering',
-        'Chemical Engineering', 'Biomedical Engineering', 'Aerospace Engineering', 'Nuclear Engineering', 'Industrial Engineering', 'Systems Engineering',
-        'Environmental Engineering', 'Petroleum Engineering', 'Geological Engineering', 'Marine Engineering', 'Robotics Engineering', 'Biotechnology',
-        'Biochemistry', 'Microbiology', 'Genetics', 'Molecular Biology', 'Bioinformatics', 'Neuroscience', 'Biophysics', 'Biostatistics', 'Pharmacology',
-        'Physiology', 'Anatomy', 'Pathology', 'Immunology', 'Epidemiology', 'Public Health', 'Health Administration', 'Nursing', 'Medicine', 'Dentistry',
-        'Pharmacy', 'Veterinary Medicine', 'Medical Technology', 'Radiography', 'Physical Therapy', 'Occupational Therapy', 'Speech Therapy', 'Nutrition',
-        'Sports Science', 'Kinesiology', 'Exercise Physiology', 'Sports Medicine', 'Rehabilitation Science', 'Psychology', 'Counseling', 'Social Work',
-        'Sociology', 'Anthropology', 'Criminal Justice', 'Political Science', 'International Relations', 'Economics', 'Finance', 'Accounting', 'Business Administration',
-        'Management', 'Marketing', 'Entrepreneurship', 'Hospitality Management', 'Tourism Management', 'Supply Chain Management', 'Logistics Management',
-        'Operations Management', 'Human Resource Management', 'Organizational Behavior', 'Project Management', 'Quality Management', 'Risk Management',
-        'Strategic Management', 'Public Administration', 'Urban Planning', 'Architecture', 'Interior Design', 'Landscape Architecture', 'Fine Arts',
-        'Visual Arts', 'Graphic Design', 'Fashion Design', 'Industrial Design', 'Product Design', 'Animation', 'Film Studies', 'Media Studies',
-        'Communication Studies', 'Journalism', 'Broadcasting', 'Creative Writing', 'English Literature', 'Linguistics', 'Translation Studies',
-        'Foreign Languages', 'Modern Languages', 'Classical Studies', 'History', 'Archaeology', 'Philosophy', 'Theology', 'Religious Studies',
-        'Ethics', 'Education', 'Early Childhood Education', 'Elementary Education', 'Secondary Education', 'Special Education', 'Higher Education',
-        'Adult Education', 'Distance Education', 'Online Education', 'Instructional Design', 'Curriculum Development', 'Library Science', 
-        'Information Science', 'Computer Engineering', 'Software Development', 'Cybersecurity', 'Information Security',
-        'Network Engineering', 'Data Science', 'Data Analytics', 'Business Analytics', 'Operations Research', 'Decision Sciences',
-        'Human-Computer Interaction', 'User Experience Design', 'User Interface Design', 'Digital Marketing', 'Content Strategy',
-        'Brand Management', 'Public Relations', 'Corporate Communications', 'Media Production', 'Digital Media', 'Web Development',
-        'Mobile App Development', 'Game Development', 'Virtual Reality', 'Augmented Reality', 'Blockchain Technology', 'Cryptocurrency',
-        'Digital Forensics', 'Forensic Science', 'Criminalistics', 'Crime Scene Investigation', 'Emergency Management', 'Fire Science',
-        'Environmental Science', 'Climate Science', 'Meteorology', 'Geography', 'Geomatics', 'Remote Sensing', 'Geoinformatics',
-        'Cartography', 'GIS (Geographic Information Systems)', 'Environmental Management', 'Sustainability Studies', 'Renewable Energy',
-        'Green Technology', 'Ecology', 'Conservation Biology', 'Wildlife Biology', 'Zoology'
-    ]
-    extracted_education = []
-    text_lower = text.lower()
-    for keyword in education_keywords:
-        pattern = r"(?i)\b{}\b".format(re.escape(keyword))
-        if re.search(pattern, text_lower):
-            extracted_education.append(keyword)
+    extracted_education = education_matcher.find(text.lower())
     return list(set(extracted_education))
 
+# "5 years of experience", "7+ yrs of professional experience", "3.5 years' experience in ..."
+EXPERIENCE_PATTERN = re.compile(r"\b(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\b['\u2019]?(?:\s+of)?(?:\s+[A-Za-z-]+){0,2}?\s+experience\b",
+                                re.IGNORECASE)
+MAX_YEARS_OF_EXPERIENCE = 50  # Larger figures are taken to be something else (e.g. a company's age)
+
+CERTIFICATION_KEYWORDS = [
+    'AWS Certified', 'AWS Certified Solutions Architect', 'AWS Certified Developer', 'Microsoft Certified', 'Azure Fundamentals',
+    'Google Cloud Certified', 'Professional Cloud Architect', 'Certified Kubernetes Administrator', 'CKA', 'CKAD',
+    'Oracle Certified', 'Cisco Certified', 'CCNA', 'CCNP', 'CCIE', 'CompTIA A+', 'CompTIA Network+', 'CompTIA Security+',
+    'CISSP', 'CISM', 'CISA', 'CEH', 'Certified Ethical Hacker', 'OSCP', 'PMP', 'Project Management Professional', 'PRINCE2',
+    'Certified ScrumMaster', 'CSM', 'PSM', 'ITIL', 'Six Sigma', 'Lean Six Sigma', 'CPA', 'CFA', 'ACCA', 'FRM',
+    'Tableau Desktop Specialist', 'Salesforce Certified', 'Red Hat Certified', 'RHCE', 'RHCSA', 'TensorFlow Developer Certificate',
+]
+certification_matcher = KeywordMatcher(CERTIFICATION_KEYWORDS, ignore_case=True)
+
+def extract_years_of_experience(text):
+    """The largest 'N years of experience' figure stated in the resume, or "N/A"."""
+    years = [float(match.group(1)) for match in EXPERIENCE_PATTERN.finditer(text)]
+    years = [value for value in years if value <= MAX_YEARS_OF_EXPERIENCE]
+    if not years:
+        return "N/A"
+    return int(max(years)) if max(years).is_integer() else max(years)
+
+# Every extractor applied to a resume, in result order. Each one's value is added to the analysis
+# result under its field (and to RESULT_FIELDS); register new extractors here.
+extractors = ExtractorRegistry(chunk_chars=EXTRACT_CHUNK_CHARS, overlap=EXTRACT_OVERLAP_CHARS, max_workers=EXTRACTOR_WORKERS)
+extractors.add_function('name', extract_name_from_resume, head_chars=NAME_SEARCH_CHARS)
+extractors.add_pattern('phone', PHONE_PATTERN)
+extractors.add_pattern('email', EMAIL_PATTERN, transform=clean_email)
+extractors.add_keywords('skills', skill_matcher, field='extracted_skills')
+extractors.add_keywords('education', education_matcher, field='extracted_education')
+extractors.add_function('years_of_experience', extract_years_of_experience)
+extractors.add_keywords('certifications', certification_matcher)
+
 
 def calculate_ats_score(extracted_skills):
     """Calculates a simulated ATS score based on extracted skills."""
@@ -299,6 +552,22 @@ def calculate_ats_score(extracted_skills):
     score = (num_extracted_skills / MAX_RELEVANT_SKILLS) * 100
     return math.ceil(min(score, 100.0))
 
+def job_match_details(scores, row, column, extracted_skills):
+    """
+    One resume's match against one job description, from JobMatcher scores: the ATS score,
+    TF-IDF similarity, weighted skill overlap, and which of the JD's skills it has or lacks.
+    """
+    have = {skill.lower() for skill in extracted_skills}
+    wanted = scores['skills'][column]
+    overlap = scores['skill_overlap'][row, column]
+    return {
+        'ats_score': int(scores['ats_score'][row, column]),
+        'similarity': round(float(scores['similarity'][row, column]), 4),
+        'skill_overlap': None if math.isnan(overlap) else round(float(overlap), 4),
+        'matched_skills': [skill for skill in wanted if skill.lower() in have],
+        'missing_skills': [skill for skill in wanted if skill.lower() not in have],
+    }
+
 def generate_personalized_tips(name, phone, email, extracted_skills, predicted_category):
     """
     Generates specific, personalized tips based on the extracted data.
@@ -360,6 +629,390 @@ def generate_personalized_tips(name, phone, email, extracted_skills, predicted_c
     return tips
 
 
+# --- Resume Analysis (shared by the single, batch and CLI paths) ---
+
+MODEL_ERROR_MESSAGE = "A server error occurred: One or more machine learning models failed to load correctly. Please ensure the models are trained and saved in the 'models' directory."
+EMPTY_RESUME_MESSAGE = "Could not extract content from the file. File might be empty or unreadable."
+
+# Fields produced for every analyzed resume (the same values pred() renders)
+RESULT_FIELDS = ['predicted_category', 'recommended_job'] + extractors.fields + ['ats_score', 'personalized_tips']
+
+def read_resume_file(filename, file):
+    """Extracts text from a PDF or TXT file object. Raises ValueError for unsupported or unreadable files."""
+    if filename.endswith('.pdf'):
+        DOCUMENT_BYTES.observe(file_size(file), type='pdf')
+        return pdf_to_text(file)
+    elif filename.endswith('.txt'):
+        DOCUMENT_BYTES.observe(file_size(file), type='txt')
+        try:
+            # Decoded block by block; the upload itself may be spooled on disk
+            return ''.join(iter_decoded_chunks(file))
+        except Exception:
+            raise ValueError("Error reading TXT file.")
+    raise ValueError("Invalid file format. Please upload a PDF or TXT file.")
+
+def make_resume_document(source, text):
+    """Builds a document dict: {'source', 'text'} for usable text or {'source', 'error'} for empty text."""
+    if not text:
+        return {'source': source, 'error': EMPTY_RESUME_MESSAGE}
+    return {'source': source, 'text': text}
+
+def read_resume_document(source, file):
+    """Reads one resume file into a document dict."""
+    try:
+        text = read_resume_file(source, file)
+    except ValueError as e:
+        return {'source': source, 'error': str(e)}
+    return make_resume_document(source, text)
+
+def read_resume_archive(file):
+    """
+    Lists the (name, file object) pairs of every file inside a ZIP archive, each spooled to
+    disk when large. Members over MAX_RESUME_BYTES get a FileTooLarge in place of the file
+    object. Raises ArchiveTooLarge for archives with more than MAX_ARCHIVE_MEMBERS files or
+    decompressing to more than MAX_ARCHIVE_BYTES, and ValueError for invalid archives.
+    """
+    named_files = []
+    try:
+        with zipfile.ZipFile(file) as archive:
+            members = [member for member in archive.infolist()
+                       if not member.is_dir() and not member.filename.startswith('__MACOSX/')]
+            if len(members) > MAX_ARCHIVE_MEMBERS:
+                raise ArchiveTooLarge(f"ZIP archive has more than {MAX_ARCHIVE_MEMBERS} files.")
+            too_large = ArchiveTooLarge(f"ZIP archive decompresses to more than {format_size(MAX_ARCHIVE_BYTES)}.")
+            remaining = MAX_ARCHIVE_BYTES  # Decompressed bytes the archive may still take
+            for member in members:
+                limit = min(MAX_RESUME_BYTES, remaining)
+                if member.file_size > MAX_RESUME_BYTES:
+                    named_files.append((member.filename, FileTooLarge(MAX_RESUME_BYTES)))
+                    continue
+                if member.file_size > remaining:
+                    raise too_large
+                try:
+                    # The declared size can lie, so the copy enforces the limits too
+                    with archive.open(member) as f:
+                        member_file = spool_stream(f, limit, UPLOAD_SPOOL_BYTES)
+                    remaining -= file_size(member_file)
+                except FileTooLarge:
+                    if limit < MAX_RESUME_BYTES:
+                        raise too_large
+                    member_file = FileTooLarge(MAX_RESUME_BYTES)
+                    remaining -= limit
+                named_files.append((member.filename, member_file))
+    except zipfile.BadZipFile:
+        raise ValueError("Invalid ZIP archive.")
+    except ArchiveTooLarge:
+        for _, member_file in named_files:
+            if not isinstance(member_file, FileTooLarge):
+                member_file.close()
+        raise
+    return named_files
+
+def read_resume_documents(named_files, job_description=None):
+    """
+    Reads (name, file object) pairs into document dicts, expanding ZIP archives (raises
+    ArchiveTooLarge for an archive over the member or size limit).
+    Files already in the analysis cache (for job_description, if given) carry their cached
+    'result' and are not extracted; the remaining PDFs of the batch are extracted
+    concurrently on the PDF process pool.
+    """
+    documents = []
+    pending_pdfs = []  # (position in documents, source, file, cache key)
+    for source, file in named_files:
+        if source.endswith('.zip'):
+            try:
+                members = read_resume_archive(file)
+            except ArchiveTooLarge:
+                raise
+            except ValueError as e:
+                documents.append({'source': source, 'error': str(e)})
+                continue
+        else:
+            members = [(source, file)]
+
+        for member_source, member_file in members:
+            try:
+                if isinstance(member_file, FileTooLarge):
+                    raise member_file
+                check_file_size(member_file, MAX_RESUME_BYTES)
+            except FileTooLarge as e:
+                documents.append({'source': member_source, 'error': str(e)})
+                continue
+
+            cache_key = file_content_key(member_source, member_file)
+            cached_result = analysis_cache.get(match_cache_key(cache_key, job_description))
+            if cached_result is not None:
+                documents.append({'source': member_source, 'result': cached_result})
+            elif member_source.endswith('.pdf'):
+                pending_pdfs.append((len(documents), member_source, member_file, cache_key))
+                documents.append(None)
+            else:
+                document = read_resume_document(member_source, member_file)
+                documents.append(dict(document, cache_key=cache_key))
+
+    texts = pdfs_to_text([file for _, _, file, _ in pending_pdfs])
+    for (position, source, _, cache_key), text in zip(pending_pdfs, texts):
+        if isinstance(text, ValueError):
+            documents[position] = {'source': source, 'error': str(text)}
+        else:
+            documents[position] = dict(make_resume_document(source, text), cache_key=cache_key)
+    return documents
+
+def match_cache_key(cache_key, job_description):
+    """Analysis cache key of a resume scored against a job description (plain analyses keep the file's key)."""
+    if not job_description:
+        return cache_key
+    return f"{cache_key}:jd:{hashlib.sha256(job_description.encode('utf-8')).hexdigest()}"
+
+def has_model_error(result):
+    """True if either prediction in an analysis result is a model-loading error."""
+    return "Model Error" in result['predicted_category'] or "Model Error" in result['recommended_job']
+
+def extract_resume_details(resume_text, predicted_category, recommended_job, timer=None):
+    """
+    Runs the registered extractors, ATS score and tips for one resume whose predictions are
+    already known. Each extractor's time goes to timer as an 'extract_<name>' stage.
+    """
+    timer = timer or StageTimer()
+    extraction = extractors.run(resume_text)
+    for extractor, ms in extraction.timings.items():
+        timer.record(f"extract_{extractor}", ms)
+
+    details = extraction.values
+    with timer.stage('ats_score'):
+        ats_score = calculate_ats_score(details['extracted_skills'])
+    with timer.stage('tips'):
+        personalized_tips = generate_personalized_tips(details['name'], details['phone'], details['email'],
+                                                       details['extracted_skills'], predicted_category)
+
+    return {
+        'predicted_category': predicted_category,
+        'recommended_job': recommended_job,
+        **details,
+        'ats_score': ats_score,
+        'personalized_tips': personalized_tips,
+    }
+
+def analyze_resumes(resume_texts, timer=None, candidates=None, job_description=None):
+    """
+    Analyzes many resumes at once. The feature pipeline cleans and vectorizes the whole batch
+    in one pass, then each model runs a single predict. Stage timings go to timer.
+    With candidates ((key, source) per resume), the results are also saved to the candidate store.
+    With a job_description, each ats_score is the resume's match against it and the details
+    are added as 'jd_match' (the candidate store keeps the plain analysis).
+    """
+    if not resume_texts:
+        return []
+    timer = timer or StageTimer()
+
+    # One model set for the whole batch, even if a hot-swap happens meanwhile
+    models = model_registry.current()
+    with timer.stage('load_models'):
+        feature_pipeline = get_feature_pipeline(models)
+
+    clean_texts, features = feature_pipeline.run(resume_texts, timer)
+    with timer.stage('predict_category'):
+        predicted_categories = predict_categories(clean_texts, features.get('categorization'), models)
+    with timer.stage('recommend_job'):
+        recommended_jobs = job_recommendations(clean_texts, features.get('job_recommendation'), models)
+
+    # 'extract' is the total of the extract_*, ats_score and tips stages
+    with timer.stage('extract'):
+        results = [extract_resume_details(text, category, job, timer)
+                   for text, category, job in zip(resume_texts, predicted_categories, recommended_jobs)]
+
+    if candidates and candidate_store:
+        with timer.stage('store_candidates'):
+            save_candidates(candidates, results, features.get('job_recommendation'), models)
+
+    if job_description:
+        with timer.stage('jd_match'):
+            # One sparse product scores the whole batch against the (cached) job description vector
+            scores = get_job_matcher(models).score(features.get('job_recommendation'),
+                                                   [result['extracted_skills'] for result in results], [job_description])
+            for n, result in enumerate(results):
+                result['jd_match'] = job_match_details(scores, n, 0, result['extracted_skills'])
+                result['ats_score'] = result['jd_match']['ats_score']
+    return results
+
+def save_candidates(candidates, results, vectors, models):
+    """Adds analyzed resumes (with their job-recommendation TF-IDF vectors) to the candidate store."""
+    entries, rows = [], []
+    for n, ((key, source), result) in enumerate(zip(candidates, results)):
+        if not has_model_error(result):
+            entries.append(dict(result, key=key, source=source))
+            rows.append(n)
+    if not entries:
+        return
+    vector_version = models.info.get(JOB_RECOMMENDATION_VECTORIZER, {}).get('checksum') if vectors is not None else None
+    try:
+        candidate_store.add_many(entries, vectors[rows] if vector_version else None, vector_version)
+    except Exception as e:
+        # Saving candidates must never fail the analysis itself
+        logging.error(f"Could not save candidates: {e}")
+
+def rank_candidates(job_description='', skills=None, required_skills=(), required_education=(), category=None,
+                    limit=CANDIDATE_SEARCH_LIMIT):
+    """
+    Searches the candidate store: hard filters first, then ranking by TF-IDF similarity to the
+    job description blended with skill overlap. Without explicit skills, the skills named in
+    the job description are used.
+    """
+    timer = StageTimer()
+    if not skills and job_description:
+        skills = extract_skills_from_resume(job_description)
+
+    query_vector = query_version = None
+    if job_description:
+        models = model_registry.current()
+        with timer.stage('vectorize_query'):
+            _, features = get_feature_pipeline(models).run([job_description])
+        query_vector = features.get('job_recommendation')
+        query_version = models.info.get(JOB_RECOMMENDATION_VECTORIZER, {}).get('checksum')
+
+    with timer.stage('search'):
+        total, results = candidate_store.search(
+            query_vector, query_version, skills=skills or [], required_skills=required_skills,
+            required_education=required_education, category=category, skill_weight=CANDIDATE_SKILL_WEIGHT, limit=limit)
+    return {'matches': total, 'skills': skills or [], 'results': results, 'timings': timer.timings}
+
+def text_candidate_key(text):
+    """Candidate key for a resume that arrived as text rather than an uploaded file."""
+    return content_key('resume.txt', text.encode('utf-8'))
+
+def analyze_documents(documents, timer=None, job_description=None, save_candidates=True):
+    """
+    Analyzes the readable documents in one batch. Unreadable ones keep their error entry,
+    cached ones reuse their stored result, and new results are added to the analysis cache
+    (and, if save_candidates, to the candidate store).
+    Documents should be read with the same job_description.
+    """
+    pending = [doc for doc in documents if 'text' in doc]
+    candidates = None
+    if save_candidates:
+        candidates = [(doc.get('cache_key') or text_candidate_key(doc['text']), doc['source']) for doc in pending]
+    analyses = iter(analyze_resumes([doc['text'] for doc in pending], timer, candidates, job_description))
+
+    results = []
+    for doc in documents:
+        if 'error' in doc:
+            results.append({'source': doc['source'], 'error': doc['error']})
+        elif 'result' in doc:
+            results.append({'source': doc['source'], **doc['result']})
+        else:
+            result = next(analyses)
+            if doc.get('cache_key') and not has_model_error(result):
+                analysis_cache.put(match_cache_key(doc['cache_key'], job_description), result)
+            results.append({'source': doc['source'], **result})
+    return results
+
+def analyze_resume_upload(filename, file, timer=None, job_description=None):
+    """
+    The single-resume analysis behind /pred and /jobs, optionally scored against a job
+    description. Returns what pred() renders resume.html with: the analysis result, or
+    {'message': ...} if it could not be produced.
+    """
+    timer = timer or StageTimer()
+    try:
+        check_file_size(file, MAX_RESUME_BYTES)
+    except FileTooLarge as e:
+        return {'message': str(e)}
+
+    # Repeat uploads of the same file are served from the analysis cache (hashed without reading it whole)
+    cache_key = file_content_key(filename, file)
+    result = analysis_cache.get(match_cache_key(cache_key, job_description))
+    if result is not None:
+        return result
+
+    # Text extraction based on file type
+    try:
+        with timer.stage('pdf_to_text' if filename.endswith('.pdf') else 'read_file'):
+            resume_text = read_resume_file(filename, file)
+    except ValueError as e:
+        return {'message': str(e)}
+
+    if not resume_text:
+        return {'message': EMPTY_RESUME_MESSAGE}
+
+    # Run ML predictions, data extraction, ATS score and personalized tips
+    result = analyze_resumes([resume_text], timer, [(cache_key, filename)], job_description)[0]
+
+    # Check for critical model errors
+    if has_model_error(result):
+        return {'message': MODEL_ERROR_MESSAGE}
+
+    analysis_cache.put(match_cache_key(cache_key, job_description), result)
+    return result
+
+def run_analysis_job(filename, file, job_description=None):
+    """Job body for /jobs: analyzes the job's own spooled copy of the upload, then discards it."""
+    timer = StageTimer()
+    try:
+        return analyze_resume_upload(filename, file, timer, job_description)
+    finally:
+        file.close()
+        record_stage_metrics('/jobs', timer)
+
+def record_stage_metrics(route, timer):
+    """Adds a request's stage timings to the stage latency histogram."""
+    for stage, milliseconds in timer.timings.items():
+        STAGE_SECONDS.observe(milliseconds / 1000, route=route, stage=stage)
+
+# Extra CSV columns for results scored against a job description
+JD_MATCH_FIELDS = ['jd_similarity', 'jd_skill_overlap', 'jd_matched_skills', 'jd_missing_skills']
+
+def results_to_csv(results):
+    """Serializes batch results to CSV text, flattening list fields and tips into '; '-separated values."""
+    output = io.StringIO()
+    fieldnames = ['source', 'error'] + RESULT_FIELDS
+    if any('jd_match' in result for result in results):
+        fieldnames += JD_MATCH_FIELDS
+    writer = csv.DictWriter(output, fieldnames=fieldnames)
+    writer.writeheader()
+    for result in results:
+        row = dict(result)
+        if 'error' not in row:
+            row['personalized_tips'] = '; '.join(tip['title'] for tip in row['personalized_tips'])
+            for field in RESULT_FIELDS:
+                if isinstance(row.get(field), list):
+                    row[field] = '; '.join(row[field])
+        jd_match = row.pop('jd_match', None)
+        if jd_match:
+            row['jd_similarity'] = jd_match['similarity']
+            row['jd_skill_overlap'] = jd_match['skill_overlap']
+            row['jd_matched_skills'] = '; '.join(jd_match['matched_skills'])
+            row['jd_missing_skills'] = '; '.join(jd_match['missing_skills'])
+        writer.writerow(row)
+    return output.getvalue()
+
+
+# --- Request Instrumentation ---
+
+@app.before_request
+def start_request_instrumentation():
+    g.request_started = time.perf_counter()
+    requested = request.headers.get('X-Profile') == '1' or request.args.get('profile') == '1'
+    g.profiler = request_profiler.start(requested)
+
+@app.after_request
+def finish_request_instrumentation(response):
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    profiler = g.pop('profiler', None)
+    if profiler:
+        response.headers['X-Profile'] = os.path.basename(request_profiler.finish(profiler, f"{request.method} {route}"))
+    if 'request_started' in g:
+        REQUEST_SECONDS.observe(time.perf_counter() - g.request_started,
+                                route=route, method=request.method, status=str(response.status_code))
+    return response
+
+@app.teardown_request
+def stop_request_profiler(error=None):
+    # Requests that raised skip after_request; make sure their profiler is switched off
+    profiler = g.pop('profiler', None)
+    if profiler:
+        profiler.disable()
+
+
 # --- Flask Routes ---
 
 @app.route('/')
@@ -375,55 +1028,200 @@ def pred():
         return render_template("resume.html", message="No resume file uploaded.")
 
     file = request.files['resume']
-    filename = file.filename
-    resume_text = ""
+    job_description = request.form.get('job_description', '').strip()
+    timer = StageTimer()
+    result = analyze_resume_upload(file.filename, file, timer, job_description)
 
-    # Text extraction based on file type
-    if filename.endswith('.pdf'):
-        resume_text = pdf_to_text(file)
-    elif filename.endswith('.txt'):
-        try:
-            resume_text = file.read().decode('utf-8')
-        except Exception:
-            return render_template('resume.html', message="Error reading TXT file.")
-    else:
-        return render_template('resume.html', message="Invalid file format. Please upload a PDF or TXT file.")
+    # Render results, reporting where the time went; with a job description, its
+    # missing skills fill the dashboard's skill-gap card
+    missing_skills = result.get('jd_match', {}).get('missing_skills')
+    with timer.stage('render'):
+        response = make_response(render_template('resume.html', missing_skills=missing_skills, **result))
+    response.headers['Server-Timing'] = timer.server_timing()
+    logging.info(f"/pred stage timings: {timer.server_timing()}")
+    record_stage_metrics('/pred', timer)
+    return response
 
-    if not resume_text:
-         return render_template('resume.html', message="Could not extract content from the file. File might be empty or unreadable.")
+@app.route('/pred/batch', methods=['POST'])
+def pred_batch():
+    """
+    Analyzes many resumes in one request. Accepts several 'resumes' files (PDF, TXT or
+    ZIP archives of them) and returns JSON, or CSV when format=csv is given. An optional
+    job_description field scores every resume against it.
+    """
+    uploads = [file for file in request.files.getlist('resumes') if file.filename]
+    if not uploads:
+        return jsonify({'error': "No resume files uploaded."}), 400
 
-    # Run ML and parsing functions
-    predicted_category = predict_category(resume_text)
-    recommended_job = job_recommendation(resume_text)
-    
-    # Check for critical model errors
-    if "Model Error" in predicted_category or "Model Error" in recommended_job:
-         return render_template('resume.html', message="A server error occurred: One or more machine learning models failed to load correctly. Please ensure the models are trained and saved in the 'models' directory.")
-
-    # Data extraction
-    name = extract_name_from_resume(resume_text)
-    phone = extract_contact_number_from_resume(resume_text)
-    email = extract_email_from_resume(resume_text)
-    extracted_skills = extract_skills_from_resume(resume_text)
-    extracted_education = extract_education_from_resume(resume_text)
-    
-    # Calculate ATS Score
-    ats_score = calculate_ats_score(extracted_skills)
-    
-    # Generate Personalized Tips (NEW)
-    personalized_tips = generate_personalized_tips(name, phone, email, extracted_skills, predicted_category)
-
-    # Render results
-    return render_template('resume.html', 
-                           predicted_category=predicted_category,
-                           recommended_job=recommended_job,
-                           name=name,
-                           phone=phone,
-                           email=email,
-                           extracted_skills=extracted_skills,
-                           extracted_education=extracted_education,
-                           ats_score=ats_score,
-                           personalized_tips=personalized_tips) # Pass tips to template
+    job_description = request.values.get('job_description', '').strip()
+    timer = StageTimer()
+    try:
+        with timer.stage('read_files'):
+            documents = read_resume_documents([(file.filename, file) for file in uploads], job_description)
+    except ArchiveTooLarge as e:
+        return jsonify({'error': str(e)}), 400
+    results = analyze_documents(documents, timer, job_description)
+    record_stage_metrics('/pred/batch', timer)
+    if any('error' not in result and has_model_error(result) for result in results):
+        return jsonify({'error': MODEL_ERROR_MESSAGE}), 500
+
+    if request.values.get('format') == 'csv':
+        return Response(results_to_csv(results), mimetype='text/csv',
+                        headers={'Content-Disposition': 'attachment; filename=screening_results.csv',
+                                 'Server-Timing': timer.server_timing()})
+    return jsonify({'results': results, 'timings': timer.timings})
+
+@app.errorhandler(413)
+def upload_too_large(error):
+    """Rejects requests over MAX_UPLOAD_BYTES before their files are read."""
+    message = f"Upload is too large. The maximum request size is {format_size(MAX_UPLOAD_BYTES)}."
+    if request.path == '/pred':
+        return render_template('resume.html', message=message), 413
+    return jsonify({'error': message}), 413
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queues the uploaded 'resume' (and optional 'job_description') for background analysis and
+    returns its job id right away (202). Poll /jobs/<id> for the result. Answers 503 with
+    Retry-After when the queue is full.
+    """
+    if 'resume' not in request.files or request.files['resume'].filename == '':
+        return jsonify({'error': "No resume file uploaded."}), 400
+
+    file = request.files['resume']
+    try:
+        # The upload is closed when this request ends, so the job gets its own copy
+        upload = spool_stream(file.stream, MAX_RESUME_BYTES, UPLOAD_SPOOL_BYTES)
+    except FileTooLarge as e:
+        return jsonify({'error': str(e)}), 413
+
+    try:
+        job_id = job_queue.submit(run_analysis_job, file.filename, upload, request.form.get('job_description', '').strip())
+    except JobQueueFull as e:
+        upload.close()
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+    return jsonify({'job_id': job_id, 'status': 'queued', 'status_url': url_for('job_status', job_id=job_id)}), 202
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """
+    Returns a job's status. Once done, 'result' holds the same payload /pred renders
+    (the analysis fields, or 'message' when the resume could not be analyzed).
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': "Unknown or expired job."}), 404
+    return jsonify(job)
+
+@app.route('/jobs/stats')
+def job_stats():
+    """Returns the job queue counters and current queue depth."""
+    return jsonify(job_queue.snapshot())
+
+@app.route('/match', methods=['POST'])
+def match_job_descriptions():
+    """
+    Scores resume texts against job descriptions, every pair at once. JSON body: 'resumes'
+    and 'job_descriptions' (lists of texts). Returns a row per resume with its match against
+    each job description, in order.
+    """
+    query = request.get_json(silent=True)
+    query = query if isinstance(query, dict) else {}
+    resumes, job_descriptions = query.get('resumes') or [], query.get('job_descriptions') or []
+    if (not isinstance(resumes, list) or not isinstance(job_descriptions, list) or not resumes or not job_descriptions
+            or not all(isinstance(t, str) for t in resumes + job_descriptions)):
+        return jsonify({'error': "Provide 'resumes' and 'job_descriptions' as lists of texts."}), 400
+    if len(job_descriptions) > MAX_JOB_DESCRIPTIONS:
+        return jsonify({'error': f"At most {MAX_JOB_DESCRIPTIONS} job descriptions per request."}), 400
+
+    timer = StageTimer()
+    matcher = get_job_matcher(model_registry.current())
+    with timer.stage('extract_skills'):
+        skill_lists = [extract_skills_from_resume(text) for text in resumes]
+    with timer.stage('vectorize'):
+        resume_vectors = matcher.vectorize(resumes)
+    with timer.stage('jd_match'):
+        scores = matcher.score(resume_vectors, skill_lists, job_descriptions)
+    record_stage_metrics('/match', timer)
+    matches = [[job_match_details(scores, row, column, skill_lists[row]) for column in range(len(job_descriptions))]
+               for row in range(len(resumes))]
+    return jsonify({'matches': matches, 'timings': timer.timings})
+
+@app.route('/candidates/search', methods=['POST'])
+@requires_admin_token
+def search_candidates():
+    """
+    Ranks stored candidates. JSON body: job_description (text) and/or skills (list), plus
+    optional hard filters required_skills, required_education and category, and limit.
+    """
+    if candidate_store is None:
+        return jsonify({'error': "The candidate store is disabled."}), 404
+    query = request.get_json(silent=True)
+    if not isinstance(query, dict):
+        return jsonify({'error': "Send the search as a JSON object."}), 400
+    job_description, category = query.get('job_description') or '', query.get('category')
+    lists = {field: query.get(field) or [] for field in ('skills', 'required_skills', 'required_education')}
+    limit = query.get('limit', CANDIDATE_SEARCH_LIMIT)
+    if not isinstance(job_description, str) or not (category is None or isinstance(category, str)):
+        return jsonify({'error': "job_description and category must be strings."}), 400
+    if not all(isinstance(values, list) and all(isinstance(value, str) for value in values) for values in lists.values()):
+        return jsonify({'error': "skills, required_skills and required_education must be lists of strings."}), 400
+    if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+        return jsonify({'error': "limit must be a positive integer."}), 400
+    if not job_description and not lists['skills'] and not lists['required_skills']:
+        return jsonify({'error': "Provide a job_description, skills or required_skills."}), 400
+    return jsonify(rank_candidates(job_description, lists['skills'], lists['required_skills'],
+                                   lists['required_education'], category, limit))
+
+@app.route('/candidates/skills')
+@requires_admin_token
+def candidate_skills():
+    """
+    How many stored candidates have each skill, most frequent first. Query parameters:
+    field=education counts education keywords instead, by_category=1 groups the counts by
+    predicted category, and top limits the keywords listed.
+    """
+    if candidate_store is None:
+        return jsonify({'error': "The candidate store is disabled."}), 404
+    field = request.args.get('field', 'skills')
+    if field not in ('skills', 'education'):
+        return jsonify({'error': "field must be 'skills' or 'education'."}), 400
+    top = request.args.get('top', type=int)
+    return jsonify(candidate_store.keyword_frequency(field, request.args.get('by_category') == '1', top))
+
+@app.route('/candidates/stats')
+@requires_admin_token
+def candidate_stats():
+    """Returns the size of the candidate store and of its indexes."""
+    if candidate_store is None:
+        return jsonify({'error': "The candidate store is disabled."}), 404
+    return jsonify(candidate_store.snapshot())
+
+@app.route('/models')
+def models_info():
+    """Lists the current model set: generation plus version and checksum of each loaded model."""
+    return jsonify(model_registry.current().describe())
+
+@app.route('/models/reload', methods=['POST'])
+@requires_admin_token
+def models_reload():
+    """
+    Atomically swaps in a freshly loaded model set from the models directory, in the worker
+    handling the request. Changed pickles are picked up by every worker without it.
+    """
+    new_set = model_registry.swap(preload=MODEL_FILES)
+    return jsonify(new_set.describe())
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus metrics: request and stage latency histograms, document sizes, PDF pages, model fallbacks, cache and job counters."""
+    return Response(metrics.render(), content_type=MetricsRegistry.CONTENT_TYPE)
+
+@app.route('/cache/stats')
+def cache_stats():
+    """Returns the analysis cache hit/miss counters."""
+    return jsonify(analysis_cache.snapshot())
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,63 @@
+"""
+Benchmarks the single-pass KeywordMatcher against the original per-keyword regex loops.
+
+Run from the repository root:
+    python -m benchmarks.keyword_matching
+"""
+import re
+import time
+
+from app import ALL_SKILLS, EDUCATION_KEYWORDS, extract_skills_from_resume, extract_education_from_resume
+from benchmarks.synthetic_resumes import DATASET, load_resumes
+
+
+def legacy_extract_skills(text):
+    """The original extract_skills_from_resume: one regex search per skill."""
+    extracted_skills = []
+    text_lower = text.lower()
+    for skill in ALL_SKILLS:
+        pattern = r"\b{}\b".format(re.escape(skill.lower()))
+        if re.search(pattern, text_lower):
+            extracted_skills.append(skill)
+    return list(set(extracted_skills))
+
+
+def legacy_extract_education(text):
+    """The original extract_education_from_resume: one regex search per keyword."""
+    extracted_education = []
+    text_lower = text.lower()
+    for keyword in EDUCATION_KEYWORDS:
+        pattern = r"(?i)\b{}\b".format(re.escape(keyword))
+        if re.search(pattern, text_lower):
+            extracted_education.append(keyword)
+    return list(set(extracted_education))
+
+
+def time_function(func, resumes):
+    start = time.perf_counter()
+    results = [func(text) for text in resumes]
+    return time.perf_counter() - start, results
+
+
+def main():
+    resumes = load_resumes()
+    print(f"Loaded {len(resumes)} resumes from {DATASET}")
+
+    pairs = [
+        ('skills', legacy_extract_skills, extract_skills_from_resume),
+        ('education', legacy_extract_education, extract_education_from_resume),
+    ]
+    for label, legacy, current in pairs:
+        legacy_time, legacy_results = time_function(legacy, resumes)
+        current_time, current_results = time_function(current, resumes)
+
+        mismatches = sum(1 for a, b in zip(legacy_results, current_results) if a != b)
+        print(f"{label:<10} legacy: {legacy_time * 1000:8.1f} ms   "
+              f"matcher: {current_time * 1000:8.1f} ms   "
+              f"speedup: {legacy_time / current_time:5.1f}x   mismatches: {mismatches}")
+        if mismatches:
+            raise SystemExit(f"{label}: matcher output differs from the original function")
+
+
+if __name__ == '__main__':
+    main()
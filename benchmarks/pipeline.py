@@ -0,0 +1,300 @@
+"""
+Latency, throughput and memory benchmark for every stage of the /pred pipeline.
+
+Drives pdf_to_text, cleanResume, predict_category, job_recommendation, each
+extract_*_from_resume function and the full /pred route (TXT and PDF uploads, through
+Flask's test client) over resumes synthesized from UpdatedResumeDataSet.csv. Each stage
+runs one document at a time and reports p50/p95/p99 latency, sequential documents per
+second and peak traced Python memory, in mock mode (an empty models directory) and real
+mode (the pickles in models/).
+
+The load test then sends the /pred uploads from N concurrent clients (--concurrency) and
+reports the achieved throughput (requests completed per wall-clock second) and latency
+under load. By default the clients are threads calling the app in this process; with
+--url they post to a running server instead (e.g. gunicorn with several workers), and
+only the load test runs.
+
+Results are saved as JSON; pass an earlier file as --baseline to compare p50 latencies
+(the exit status is 1 if any stage got slower than --tolerance allows).
+
+Run from the repository root:
+    python -m benchmarks.pipeline --docs 200 --output benchmarks/results/baseline.json
+    python -m benchmarks.pipeline --baseline benchmarks/results/baseline.json
+    python -m benchmarks.pipeline --docs 100 --url http://127.0.0.1:8000 --concurrency 1 4 16 32
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Keep synthetic resumes out of the real candidate store (must be set before app is imported)
+os.environ.setdefault('CANDIDATE_STORE_DB', ':memory:')
+
+import app  # noqa: E402
+from benchmarks.synthetic_resumes import render_pdf, render_txt, synthesize_resumes  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join('benchmarks', 'results', 'pipeline.json')
+MODES = ('mock', 'real')
+LOAD_KINDS = ('txt', 'pdf')
+DEFAULT_CONCURRENCY = [1, 4, 16]
+
+
+def pred_route(client, filename, data):
+    response = client.post('/pred', data={'resume': (io.BytesIO(data), filename)})
+    if response.status_code != 200:
+        raise RuntimeError(f"/pred returned {response.status_code} for {filename}")
+    return response
+
+
+def post_url(url, filename, data):
+    """Posts one upload to a running server's /pred as multipart form data."""
+    boundary = uuid.uuid4().hex
+    body = (f'--{boundary}\r\nContent-Disposition: form-data; name="resume"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n').encode() + data + f'\r\n--{boundary}--\r\n'.encode()
+    request = urllib.request.Request(f"{url.rstrip('/')}/pred", data=body,
+                                     headers={'Content-Type': f'multipart/form-data; boundary={boundary}'})
+    with urllib.request.urlopen(request) as response:
+        response.read()
+
+
+def build_stages(client):
+    """Stage name -> function of one synthesized document."""
+    return {
+        'pdf_to_text': lambda doc: app.pdf_to_text(io.BytesIO(doc['pdf'])),
+        'cleanResume': lambda doc: app.cleanResume(doc['text']),
+        'predict_category': lambda doc: app.predict_category(doc['text']),
+        'job_recommendation': lambda doc: app.job_recommendation(doc['text']),
+        'extract_name_from_resume': lambda doc: app.extract_name_from_resume(doc['text']),
+        'extract_contact_number_from_resume': lambda doc: app.extract_contact_number_from_resume(doc['text']),
+        'extract_email_from_resume': lambda doc: app.extract_email_from_resume(doc['text']),
+        'extract_skills_from_resume': lambda doc: app.extract_skills_from_resume(doc['text']),
+        'extract_education_from_resume': lambda doc: app.extract_education_from_resume(doc['text']),
+        'pred_txt': lambda doc: pred_route(client, 'resume.txt', doc['txt']),
+        'pred_pdf': lambda doc: pred_route(client, 'resume.pdf', doc['pdf']),
+    }
+
+
+def time_stage(func, documents):
+    """Per-document latencies in seconds."""
+    latencies = []
+    for doc in documents:
+        start = time.perf_counter()
+        func(doc)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def peak_memory(func, documents):
+    """Peak Python memory traced while running the stage over the documents, in KB."""
+    tracemalloc.start()
+    try:
+        for doc in documents:
+            func(doc)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def summarize(latencies, peak_kb):
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'calls': len(latencies),
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(latencies_ms, 95)), 3),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 3),
+        'mean_ms': round(float(latencies_ms.mean()), 3),
+        'docs_per_sec': round(len(latencies) / sum(latencies), 2),
+        'peak_traced_kb': round(peak_kb, 1),
+    }
+
+
+def run_mode(mode, documents, warmup, stages, memory_docs, levels):
+    """
+    Benchmarks every stage with the mock or the real models, then load-tests /pred at each
+    concurrency level. Returns the mode's results.
+    """
+    if mode == 'mock':
+        models_dir = tempfile.mkdtemp(prefix='mock-models-')
+    else:
+        models_dir = app.MODELS_DIR
+    app.model_registry.swap(models_dir=models_dir)
+
+    results = {}
+    for name, func in stages.items():
+        func(warmup)  # loads models, starts the PDF pool, compiles templates
+        # Every stage measures cold documents: no cached analyses or extracted pages
+        app.analysis_cache.clear()
+        app.pdf_service.clear()
+        latencies = time_stage(func, documents)
+        # Memory is traced in a separate pass, since tracing slows every allocation
+        app.analysis_cache.clear()
+        app.pdf_service.clear()
+        peak_kb = peak_memory(func, documents[:memory_docs])
+        results[name] = summarize(latencies, peak_kb)
+        print(f"  {mode:<5} {name:<36} p50 {results[name]['p50_ms']:9.2f} ms   p95 {results[name]['p95_ms']:9.2f} ms   "
+              f"p99 {results[name]['p99_ms']:9.2f} ms   {results[name]['docs_per_sec']:9.1f} docs/s   "
+              f"peak {results[name]['peak_traced_kb']:9.1f} KB")
+    load = run_load(mode, documents, levels) if levels else {}
+    models = app.model_registry.current().describe()['models']
+    if mode == 'mock':
+        os.rmdir(models_dir)
+    return {'models': models, 'stages': results, 'load': load}
+
+
+def load_documents(documents, tag):
+    """Copies of the documents made unique with tag, so no request is answered from a cache."""
+    copies = []
+    for n, doc in enumerate(documents):
+        text = f"{doc['text']}\nReference {tag}-{n}"
+        copies.append({'text': text, 'txt': render_txt(text), 'pdf': render_pdf(text)})
+    return copies
+
+
+def load_test(send, documents, concurrency):
+    """
+    Sends every document through send(doc) from `concurrency` client threads at once.
+    Returns the achieved throughput and the latency percentiles under that load.
+    """
+    def timed(doc):
+        start = time.perf_counter()
+        try:
+            send(doc)
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        outcomes = list(clients.map(timed, documents))
+    wall_seconds = time.perf_counter() - start
+
+    latencies_ms = np.array([latency for latency in outcomes if latency is not None]) * 1000
+    return {
+        'concurrency': concurrency,
+        'requests': len(documents),
+        'errors': sum(latency is None for latency in outcomes),
+        'wall_seconds': round(wall_seconds, 3),
+        'requests_per_sec': round(len(latencies_ms) / wall_seconds, 2),
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 3) if len(latencies_ms) else None,
+        'p95_ms': round(float(np.percentile(latencies_ms, 95)), 3) if len(latencies_ms) else None,
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 3) if len(latencies_ms) else None,
+    }
+
+
+def run_load(label, documents, levels, url=None):
+    """Load-tests /pred with TXT and PDF uploads at each concurrency level. Returns {kind: [results]}."""
+    clients = threading.local()
+
+    def send(kind, doc):
+        if url:
+            return post_url(url, f'resume.{kind}', doc[kind])
+        if not hasattr(clients, 'client'):
+            clients.client = app.app.test_client()
+        return pred_route(clients.client, f'resume.{kind}', doc[kind])
+
+    results = {}
+    for kind in LOAD_KINDS:
+        results[kind] = []
+        for concurrency in levels:
+            batch = load_documents(documents, f"{label}-{kind}-{concurrency}")
+            stats = load_test(lambda doc: send(kind, doc), batch, concurrency)
+            results[kind].append(stats)
+            print(f"  {label:<6} load {kind} x{concurrency:<4} {stats['requests_per_sec']:9.1f} req/s   "
+                  f"p50 {stats['p50_ms'] or 0:9.2f} ms   p95 {stats['p95_ms'] or 0:9.2f} ms   errors {stats['errors']}")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Prints p50 changes against a baseline run. Returns the stages slower than the tolerance allows."""
+    regressions = []
+    print(f"\nComparison with baseline from {baseline.get('created_at', '?')} (p50, tolerance {tolerance:.0%}):")
+    if (baseline.get('documents'), baseline.get('seed')) != (results['documents'], results['seed']):
+        print("  (the baseline used a different document count or seed; latencies may not be comparable)")
+    for mode, mode_results in results['modes'].items():
+        base_stages = baseline.get('modes', {}).get(mode, {}).get('stages', {})
+        for name, stats in mode_results['stages'].items():
+            if name not in base_stages:
+                continue
+            base = base_stages[name]['p50_ms']
+            change = stats['p50_ms'] / base - 1 if base else 0.0
+            flag = ''
+            if change > tolerance:
+                regressions.append(f"{mode}/{name}")
+                flag = '  REGRESSION'
+            print(f"  {mode:<5} {name:<36} {base:9.2f} -> {stats['p50_ms']:9.2f} ms  ({change:+.1%}){flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every stage of the /pred pipeline.")
+    parser.add_argument('--docs', type=int, default=200, help="Synthesized documents per stage (default: 200)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for picking dataset rows (default: 0)")
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES), help="Model modes to run")
+    parser.add_argument('--memory-docs', type=int, default=20, help="Documents per stage in the memory pass")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f"JSON results file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument('--baseline', help="Earlier JSON results to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed p50 slowdown vs the baseline (default: 0.25)")
+    parser.add_argument('--concurrency', type=int, nargs='*', default=DEFAULT_CONCURRENCY,
+                        help="Concurrent clients per load-test run (default: 1 4 16; none skips the load test)")
+    parser.add_argument('--url', help="Load-test a running server at this base URL instead of benchmarking in-process")
+    args = parser.parse_args(argv)
+
+    # Mock mode logs an error per missing model file; keep the report readable
+    logging.disable(logging.ERROR)
+
+    texts = synthesize_resumes(args.docs + 1, seed=args.seed)
+    documents = [{'text': text, 'txt': render_txt(text), 'pdf': render_pdf(text)} for text in texts]
+    warmup, documents = documents[0], documents[1:]
+    print(f"Synthesized {len(documents)} resumes (TXT avg {np.mean([len(d['txt']) for d in documents]) / 1024:.1f} KB, "
+          f"PDF avg {np.mean([len(d['pdf']) for d in documents]) / 1024:.1f} KB)")
+
+    results = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'documents': len(documents),
+        'seed': args.seed,
+    }
+    if args.url:
+        post_url(args.url, 'resume.txt', warmup['txt'])
+        results['server'] = args.url
+        results['load'] = run_load('server', documents, args.concurrency or DEFAULT_CONCURRENCY, args.url)
+    else:
+        stages = build_stages(app.app.test_client())
+        results['modes'] = {mode: run_mode(mode, documents, warmup, stages, args.memory_docs, args.concurrency)
+                            for mode in args.modes}
+        app.model_registry.swap(models_dir=app.MODELS_DIR)
+    # ru_maxrss is in KB on Linux; PDF worker processes are not included
+    results['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nPeak RSS {results['peak_rss_kb'] / 1024:.1f} MB. Results written to {args.output}")
+
+    if args.baseline and not args.url:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) slower than the baseline: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Synthetic resumes for the benchmarks: rows of UpdatedResumeDataSet.csv with a generated
+name/email/phone header, rendered as TXT bytes and as simple text-layer PDFs.
+
+The PDFs are written by hand (Helvetica text, one content stream per page), so no PDF
+library beyond PyPDF2 is needed to read them back.
+"""
+import csv
+import random
+import sys
+import textwrap
+
+DATASET = 'UpdatedResumeDataSet.csv'
+
+FIRST_NAMES = ['Aarav', 'Priya', 'Rahul', 'Ananya', 'Vikram', 'Sneha', 'Arjun', 'Kavya', 'Rohan', 'Meera',
+               'Daniel', 'Sarah', 'Michael', 'Emily', 'David', 'Laura']
+LAST_NAMES = ['Sharma', 'Patel', 'Iyer', 'Khan', 'Reddy', 'Gupta', 'Nair', 'Singh', 'Mehta', 'Joshi',
+              'Walker', 'Turner', 'Hughes', 'Foster', 'Bennett', 'Carter']
+
+# Page layout of the generated PDFs (US Letter, 10pt Helvetica)
+PDF_LINES_PER_PAGE = 60
+PDF_CHARS_PER_LINE = 95
+
+
+def load_resumes(path=DATASET):
+    """Every resume text in the dataset, in file order (shared by all the benchmarks)."""
+    csv.field_size_limit(sys.maxsize)
+    with open(path, encoding='utf-8') as f:
+        return [row['Resume'] for row in csv.DictReader(f)]
+
+
+def synthesize_resumes(count, seed=0, path=DATASET):
+    """
+    Returns count resume texts drawn (with a fixed seed) from the dataset, each with a unique
+    contact header so no two documents share a cache key.
+    """
+    rows = load_resumes(path)
+    rng = random.Random(seed)
+    resumes = []
+    for n in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        header = (f"{first} {last}\n"
+                  f"Email: {first.lower()}.{last.lower()}{n}@example.com\n"
+                  f"Phone: +91 {rng.randint(70000, 99999)} {rng.randint(10000, 99999)}\n")
+        resumes.append(header + rows[rng.randrange(len(rows))])
+    return resumes
+
+
+def render_txt(text):
+    return text.encode('utf-8')
+
+
+def _pdf_string(line):
+    line = line.encode('ascii', 'replace').decode('ascii')
+    return '(' + line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ')'
+
+
+def render_pdf(text):
+    """Renders text as a minimal multi-page PDF with a real text layer."""
+    lines = []
+    for paragraph in text.splitlines():
+        lines.extend(textwrap.wrap(paragraph, PDF_CHARS_PER_LINE) or [''])
+    pages = [lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)] or [[]]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    page_ids = [4 + 2 * n for n in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(pages)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page_id, page_lines in zip(page_ids, pages):
+        content = ("BT /F1 10 Tf 12 TL 50 760 Td " + ' '.join(f"{_pdf_string(line)} Tj T*" for line in page_lines) + " ET").encode()
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode())
+        objects.append(b"<< /Length " + str(len(content)).encode() + b" >>\nstream\n" + content + b"\nendstream")
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return bytes(pdf)
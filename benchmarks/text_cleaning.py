@@ -0,0 +1,66 @@
+"""
+Regression and speed benchmark for the fused cleanResume normalizer.
+
+Checks that the precompiled three-pass normalizer produces byte-identical output to the
+original eight-substitution cleanResume on every row of UpdatedResumeDataSet.csv (plus a
+few hand-written edge cases), then compares their speed.
+
+Run from the repository root:
+    python -m benchmarks.text_cleaning
+"""
+import re
+import time
+
+from benchmarks.synthetic_resumes import DATASET, load_resumes
+from text_normalizer import clean_resume_text
+
+REPEATS = 5
+
+# Inputs where the order of the original substitutions matters
+EDGE_CASES = [
+    "#aRTb c", "@a#b c", "@#x y", "#ahttp://RTz y", "a. B c", " A B C D ", "succcess RT @user",
+    "see http://example.com/path now", "http://end", "• Python – SQL", "#tag next",
+]
+
+
+def legacy_clean_resume(txt):
+    """The original cleanResume: eight sequential re.sub passes."""
+    cleanText = re.sub(r'http\S+\s', ' ', txt)
+    cleanText = re.sub('RT|cc', ' ', cleanText)
+    cleanText = re.sub(r'#\S+\s*', ' ', cleanText)
+    cleanText = re.sub(r'@\S+', ' ', cleanText)
+    cleanText = re.sub(r'\s+[^a-z0-9\s]\s+', ' ', cleanText)
+    cleanText = re.sub(r'[%s]' % re.escape("""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""), ' ', cleanText)
+    cleanText = re.sub(r'[^\x00-\x7f]', r' ', cleanText)
+    cleanText = re.sub(r'\s+', ' ', cleanText)
+    return cleanText.lower().strip()
+
+
+def best_time(func, texts):
+    """Best of REPEATS wall-clock runs over all texts, in seconds."""
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    resumes = load_resumes()
+    print(f"Loaded {len(resumes)} resumes from {DATASET}")
+
+    mismatches = [text for text in resumes + EDGE_CASES if legacy_clean_resume(text) != clean_resume_text(text)]
+    print(f"Regression: {len(resumes) + len(EDGE_CASES)} inputs, {len(mismatches)} mismatches")
+    if mismatches:
+        raise SystemExit(f"First mismatching input: {mismatches[0][:200]!r}")
+
+    legacy_time = best_time(legacy_clean_resume, resumes)
+    fused_time = best_time(clean_resume_text, resumes)
+    print(f"legacy: {legacy_time * 1000:8.1f} ms   fused: {fused_time * 1000:8.1f} ms   "
+          f"speedup: {legacy_time / fused_time:4.1f}x   (best of {REPEATS})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,317 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from keyword_bitsets import contains_all, coverage_gaps, keyword_frequency, overlap_counts, write_bitsets
+from process_local import ProcessLocal, connect_sqlite
+
+# Rows appended since the last rebuild are kept in a small CSR matrix until there are this many
+MERGE_ROWS = 1024
+
+CANDIDATE_SCHEMA = ("CREATE TABLE IF NOT EXISTS candidates ("
+                    "id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL, source TEXT, name TEXT, email TEXT, phone TEXT, "
+                    "predicted_category TEXT, recommended_job TEXT, extracted_skills TEXT, extracted_education TEXT, "
+                    "ats_score INTEGER, added_at REAL, vector_version TEXT, vector BLOB)")
+
+CANDIDATE_FIELDS = ['id', 'source', 'name', 'email', 'phone', 'predicted_category', 'recommended_job',
+                    'extracted_skills', 'extracted_education', 'ats_score', 'added_at']
+
+
+def encode_vector(row):
+    """Packs one CSR row as int32 column indices followed by float32 values."""
+    return row.indices.astype(np.int32).tobytes() + row.data.astype(np.float32).tobytes()
+
+
+def decode_vector(blob):
+    nnz = len(blob) // 8
+    return np.frombuffer(blob, dtype=np.int32, count=nnz), np.frombuffer(blob, dtype=np.float32, offset=nnz * 4)
+
+
+def _append_rows(array, count, rows):
+    """Writes rows after the first count rows of array, growing its capacity geometrically."""
+    if count + len(rows) > len(array):
+        grown = np.zeros((max(2 * len(array), count + len(rows), MERGE_ROWS),) + array.shape[1:], dtype=array.dtype)
+        grown[:count] = array[:count]
+        array = grown
+    array[count:count + len(rows)] = rows
+    return array
+
+
+class CandidateStore:
+    """
+    Persistent pool of analyzed resumes, searchable by job description or skill set.
+
+    Each candidate is a SQLite row holding the extracted fields and the resume's TF-IDF vector.
+    Searches run on an in-memory index that is loaded on first use and brought up to date
+    before every search with the rows added since (by this or any other process):
+      - skills and education as packed bit rows (see keyword_bitsets.py) of the fixed
+        skill_vocabulary and education_vocabulary, so hard filters, skill overlap and
+        coverage gaps are byte-wise operations over the whole pool;
+      - a category code per candidate;
+      - a CSC matrix of all vectors, so a query's cosine similarity reads only the columns
+        of its own terms, plus a small CSR matrix of recent rows.
+
+    vector_space() returns the (version, dimension) of the vectorizer in use. Vectors made
+    with another version cannot be compared; those candidates still match filters but get
+    no similarity until they are imported again.
+    """
+    def __init__(self, db_path, vector_space, skill_vocabulary, education_vocabulary):
+        self.db_path = db_path
+        self.vector_space = vector_space
+        self.skill_vocabulary = skill_vocabulary
+        self.education_vocabulary = education_vocabulary
+        self._db = ProcessLocal(self._connect)
+        self._lock = threading.RLock()
+        self._reset_index(None, 0)
+
+    def _connect(self):
+        db = connect_sqlite(self.db_path, CANDIDATE_SCHEMA)
+        # A forked worker starts from an empty index of its own
+        self._reset_index(None, 0)
+        return db
+
+    def _reset_index(self, version, dimension):
+        self._version = version
+        self._dimension = dimension
+        self._last_id = 0
+        self._ids = []
+        # Rows per position; each array has spare capacity beyond len(self._ids)
+        self._skill_bits = np.zeros((0, self.skill_vocabulary.row_bytes), dtype=np.uint8)
+        self._education_bits = np.zeros((0, self.education_vocabulary.row_bytes), dtype=np.uint8)
+        self._category_codes = np.zeros(0, dtype=np.int32)
+        self._categories = {}       # category -> code
+        self._matrix = sp.csc_matrix((0, dimension), dtype=np.float32)
+        self._recent = []           # (indices, values) of rows not yet merged into the matrix
+        self._recent_matrix = None
+        self._vector_count = 0
+
+    def add_many(self, candidates, vectors=None, vector_version=None):
+        """
+        Saves analyzed resumes. candidates are dicts with a unique 'key' (e.g. the upload's
+        content key), 'source' and the analysis result fields; vectors is a CSR matrix with
+        one row per candidate, made by the vectorizer identified by vector_version.
+        Candidates whose key is already stored are left as they are. Returns the number added.
+        """
+        now = time.time()
+        rows = []
+        for n, candidate in enumerate(candidates):
+            vector = encode_vector(vectors[n]) if vectors is not None and vector_version else None
+            rows.append((candidate['key'], candidate.get('source'), candidate['name'], candidate['email'],
+                         candidate['phone'], candidate['predicted_category'], candidate['recommended_job'],
+                         json.dumps(candidate['extracted_skills']), json.dumps(candidate['extracted_education']),
+                         candidate['ats_score'], now, vector_version if vector else None, vector))
+        with self._lock:
+            db = self._db.get()
+            before = db.total_changes
+            db.executemany(
+                "INSERT OR IGNORE INTO candidates (key, source, name, email, phone, predicted_category, recommended_job, "
+                "extracted_skills, extracted_education, ats_score, added_at, vector_version, vector) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            db.commit()
+            return db.total_changes - before
+
+    def _refresh(self):
+        """Loads the rows added since the last refresh into the in-memory index. Must hold the lock."""
+        db = self._db.get()
+        version, dimension = self.vector_space()
+        if (version, dimension) != (self._version, self._dimension):
+            self._reset_index(version, dimension)
+
+        cursor = db.execute(
+            "SELECT id, predicted_category, extracted_skills, extracted_education, vector_version, vector "
+            "FROM candidates WHERE id > ? ORDER BY id", (self._last_id,))
+        count = len(self._ids)
+        skill_lists, education_lists, category_codes = [], [], []
+        for row_id, category, skills, education, vector_version, vector in cursor:
+            self._ids.append(row_id)
+            skill_lists.append(json.loads(skills))
+            education_lists.append(json.loads(education))
+            category_codes.append(self._categories.setdefault(category, len(self._categories)))
+            if vector and vector_version == self._version:
+                self._recent.append(decode_vector(vector))
+                self._vector_count += 1
+            else:
+                self._recent.append((np.empty(0, np.int32), np.empty(0, np.float32)))
+            self._last_id = row_id
+
+        if skill_lists:
+            self._skill_bits = _append_rows(self._skill_bits, count, self.skill_vocabulary.encode(skill_lists))
+            self._education_bits = _append_rows(self._education_bits, count, self.education_vocabulary.encode(education_lists))
+            self._category_codes = _append_rows(self._category_codes, count, category_codes)
+            self._recent_matrix = None
+            if len(self._recent) >= MERGE_ROWS:
+                self._matrix = sp.vstack([self._matrix, self._recent_csr()], format='csc')
+                self._recent = []
+                self._recent_matrix = None
+
+    def _recent_csr(self):
+        if self._recent_matrix is None:
+            lengths = [len(indices) for indices, _ in self._recent]
+            indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+            indices = np.concatenate([i for i, _ in self._recent]) if self._recent else np.empty(0, np.int32)
+            values = np.concatenate([v for _, v in self._recent]) if self._recent else np.empty(0, np.float32)
+            self._recent_matrix = sp.csr_matrix((values, indices, indptr), shape=(len(self._recent), self._dimension))
+        return self._recent_matrix
+
+    def _similarities(self, query_vector):
+        """Cosine similarity of every candidate to a 1 x dimension query vector."""
+        query = sp.csr_matrix(query_vector, dtype=np.float32)
+        norm = np.sqrt(query.multiply(query).sum())
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        if not norm or not self._vector_count:
+            return scores
+        columns, values = query.indices, query.data / norm
+        main_rows = self._matrix.shape[0]
+        if main_rows:
+            scores[:main_rows] = self._matrix[:, columns] @ values
+        if self._recent:
+            scores[main_rows:] = self._recent_csr()[:, columns] @ values
+        return scores
+
+    def search(self, query_vector=None, query_version=None, skills=(), required_skills=(), required_education=(),
+               category=None, skill_weight=0.3, limit=20):
+        """
+        Ranks candidates for a query. Hard filters (every required skill and education keyword,
+        and the category) narrow the pool with bit masks. The rest are scored by cosine
+        similarity to query_vector (made with vectorizer version query_version) and the share
+        of skills they have, blended by skill_weight when both are given. Each result lists
+        its matched_skills and the missing_skills of the query it lacks.
+        Returns (number of candidates passing the filters, the top `limit` candidates).
+        Raises ValueError unless limit is a positive integer.
+        """
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+            raise ValueError("limit must be a positive integer.")
+        with self._lock:
+            self._refresh()
+            total = len(self._ids)
+            if not total:
+                return 0, []
+            skill_bits = self._skill_bits[:total]
+
+            selected = np.ones(total, dtype=bool)
+            for keywords, vocabulary, bits in ((required_skills, self.skill_vocabulary, skill_bits),
+                                               (required_education, self.education_vocabulary, self._education_bits[:total])):
+                if not keywords:
+                    continue
+                if any(keyword.lower() not in vocabulary.positions for keyword in keywords):
+                    return 0, []
+                selected &= contains_all(bits, vocabulary.mask(keywords))
+            if category:
+                if category not in self._categories:
+                    return 0, []
+                selected &= self._category_codes[:total] == self._categories[category]
+            positions = np.flatnonzero(selected)
+            if not len(positions):
+                return 0, []
+
+            use_vector = query_vector is not None and query_version == self._version and self._version is not None
+            similarity = self._similarities(query_vector) if use_vector else np.zeros(total, dtype=np.float32)
+            skills = list(dict.fromkeys(skill.lower() for skill in skills))
+            query_skills = self.skill_vocabulary.mask(skills)
+            # Skills outside the vocabulary still count in the share, as no candidate can have them
+            skill_share = overlap_counts(skill_bits[positions], query_skills) / len(skills) if skills else np.zeros(len(positions))
+
+            if use_vector and skills:
+                candidate_scores = (1 - skill_weight) * similarity[positions] + skill_weight * skill_share
+            elif use_vector:
+                candidate_scores = similarity[positions]
+            else:
+                candidate_scores = skill_share
+
+            if len(positions) > limit:
+                top = np.argpartition(-candidate_scores, limit - 1)[:limit]
+            else:
+                top = np.arange(len(positions))
+            top = top[np.argsort(-candidate_scores[top], kind='stable')]
+            ranked = [(int(positions[i]), float(candidate_scores[i])) for i in top]
+            ids = [self._ids[position] for position, _ in ranked]
+
+            rows = self._load_candidates(ids)
+            results = []
+            for (position, row_score), row_id in zip(ranked, ids):
+                candidate = rows.get(row_id)
+                if candidate is None:
+                    continue
+                candidate['score'] = round(row_score, 4)
+                candidate['similarity'] = round(float(similarity[position]), 4)
+                candidate['matched_skills'] = [skill for skill in candidate['extracted_skills'] if skill.lower() in skills]
+                candidate['missing_skills'] = self.skill_vocabulary.decode(coverage_gaps(skill_bits[position], query_skills))[0]
+                results.append(candidate)
+            return len(positions), results
+
+    def _load_candidates(self, ids):
+        if not ids:
+            return {}
+        placeholders = ','.join('?' * len(ids))
+        cursor = self._db.get().execute(
+            f"SELECT {', '.join(CANDIDATE_FIELDS)} FROM candidates WHERE id IN ({placeholders})", ids)
+        candidates = {}
+        for row in cursor:
+            candidate = dict(zip(CANDIDATE_FIELDS, row))
+            candidate['extracted_skills'] = json.loads(candidate['extracted_skills'])
+            candidate['extracted_education'] = json.loads(candidate['extracted_education'])
+            candidates[candidate['id']] = candidate
+        return candidates
+
+    def keyword_frequency(self, field='skills', by_category=False, top=None):
+        """
+        Number of candidates having each skill (field='skills') or education keyword
+        (field='education'), most frequent first: {keyword: count}, or
+        {category: {keyword: count}} with by_category. top limits the keywords listed.
+        """
+        vocabulary = self.skill_vocabulary if field == 'skills' else self.education_vocabulary
+        with self._lock:
+            self._refresh()
+            total = len(self._ids)
+            bits = (self._skill_bits if field == 'skills' else self._education_bits)[:total]
+            if not by_category:
+                return self._ranked_keywords(vocabulary, keyword_frequency(bits, vocabulary.size), top)
+            counts = keyword_frequency(bits, vocabulary.size, self._category_codes[:total], len(self._categories))
+            return {category: self._ranked_keywords(vocabulary, counts[code], top)
+                    for category, code in self._categories.items()}
+
+    @staticmethod
+    def _ranked_keywords(vocabulary, counts, top):
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] > 0][:top]
+        return {vocabulary.keywords[i]: int(counts[i]) for i in order}
+
+    def export_bitsets(self, directory):
+        """
+        Writes the pool's skill and education bit rows as memory-mappable bitset files
+        (skills.bits, education.bits) plus candidates.npy, holding each row's candidate id
+        and category code. The category names are in the bitset files' metadata.
+        Returns the number of candidates written.
+        """
+        with self._lock:
+            self._refresh()
+            total = len(self._ids)
+            os.makedirs(directory, exist_ok=True)
+            metadata = {'categories': list(self._categories)}
+            write_bitsets(os.path.join(directory, 'skills.bits'), self.skill_vocabulary, [self._skill_bits[:total]], metadata)
+            write_bitsets(os.path.join(directory, 'education.bits'), self.education_vocabulary,
+                          [self._education_bits[:total]], metadata)
+            rows = np.zeros(total, dtype=[('id', np.int64), ('category', np.int32)])
+            rows['id'] = self._ids
+            rows['category'] = self._category_codes[:total]
+            np.save(os.path.join(directory, 'candidates.npy'), rows)
+            return total
+
+    def snapshot(self):
+        """Returns the number of candidates, how many have comparable vectors, and the index's vectorizer version."""
+        with self._lock:
+            try:
+                self._refresh()
+            except sqlite3.Error as e:
+                logging.error(f"Candidate store unavailable: {e}")
+            total = len(self._ids)
+            skills_present = np.bitwise_or.reduce(self._skill_bits[:total], axis=0) if total else np.zeros(1, np.uint8)
+            return {'candidates': total, 'with_vectors': self._vector_count,
+                    'skills_indexed': int(np.unpackbits(skills_present).sum()), 'vector_version': self._version,
+                    'index_bytes': int(self._skill_bits.nbytes + self._education_bits.nbytes + self._category_codes.nbytes)}
@@ -0,0 +1,106 @@
+"""
+Command-line access to the candidate store (CANDIDATE_STORE_DB, default candidates.db here;
+the server only saves resumes when it is set).
+
+    python candidates.py import UpdatedResumeDataSet.csv
+    python candidates.py import resumes/
+    python candidates.py search --jd job_description.txt --required-skills Python SQL --limit 10
+    python candidates.py search --skills Java Spring Hibernate --category "Java Developer"
+    python candidates.py skills --by-category --top 10
+    python candidates.py export-bitsets pool/
+
+Importing analyzes the resumes in batches (as screen_resumes.py does) and saves every result,
+with its TF-IDF vector, to the store. Resumes already in the store are skipped.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+
+# The store is off by default in the server, so the recruiter CLI names a default file (before app is imported)
+os.environ.setdefault('CANDIDATE_STORE_DB', 'candidates.db')
+
+import app  # noqa: E402
+from screen_resumes import DEFAULT_BATCH_SIZE, chunked, documents_from_csv, documents_from_directory  # noqa: E402
+
+
+def import_resumes(args):
+    if os.path.isdir(args.input):
+        documents = documents_from_directory(args.input, args.batch_size)
+    elif args.input.endswith('.csv'):
+        documents = documents_from_csv(args.input, args.text_column)
+    else:
+        raise SystemExit("input must be a directory or a .csv file")
+
+    before = app.candidate_store.snapshot()['candidates']
+    analyzed = failed = 0
+    for chunk in chunked(itertools.islice(documents, args.limit), args.batch_size):
+        for result in app.analyze_documents(chunk):
+            if 'error' in result:
+                failed += 1
+            else:
+                analyzed += 1
+        print(f"analyzed {analyzed} resumes ({failed} unreadable)", file=sys.stderr)
+
+    stats = app.candidate_store.snapshot()
+    print(json.dumps(dict(stats, added=stats['candidates'] - before), indent=2))
+
+
+def search(args):
+    job_description = ''
+    if args.jd:
+        with open(args.jd, encoding='utf-8') as f:
+            job_description = f.read()
+    results = app.rank_candidates(job_description, args.skills, args.required_skills, args.required_education,
+                                  args.category, args.limit)
+    print(json.dumps(results, indent=2))
+
+
+def skills(args):
+    print(json.dumps(app.candidate_store.keyword_frequency(args.field, args.by_category, args.top), indent=2))
+
+
+def export_bitsets(args):
+    count = app.candidate_store.export_bitsets(args.output)
+    print(f"wrote {count} candidates to {args.output}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import resumes into the candidate store and search it.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    importer = commands.add_parser('import', help="Analyze resumes and add them to the store")
+    importer.add_argument('input', help="Directory of PDF/TXT/ZIP resumes, or a CSV file with a resume text column")
+    importer.add_argument('--text-column', default='Resume', help="CSV column holding the resume text (default: Resume)")
+    importer.add_argument('--limit', type=int, help="Only import the first N resumes")
+    importer.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Resumes per model call")
+    importer.set_defaults(run=import_resumes)
+
+    searcher = commands.add_parser('search', help="Rank stored candidates")
+    searcher.add_argument('--jd', help="File holding the job description")
+    searcher.add_argument('--skills', nargs='*', default=[], help="Skills to rank by (default: those named in the job description)")
+    searcher.add_argument('--required-skills', nargs='*', default=[], help="Skills every candidate must have")
+    searcher.add_argument('--required-education', nargs='*', default=[], help="Education keywords every candidate must have")
+    searcher.add_argument('--category', help="Only candidates predicted in this category")
+    searcher.add_argument('--limit', type=int, default=app.CANDIDATE_SEARCH_LIMIT, help="Candidates to return")
+    searcher.set_defaults(run=search)
+
+    frequency = commands.add_parser('skills', help="Count stored candidates per skill or education keyword")
+    frequency.add_argument('--field', choices=['skills', 'education'], default='skills')
+    frequency.add_argument('--by-category', action='store_true', help="Count per predicted category")
+    frequency.add_argument('--top', type=int, help="Only list the N most frequent keywords")
+    frequency.set_defaults(run=skills)
+
+    exporter = commands.add_parser('export-bitsets', help="Write the pool's skills and education as memory-mappable bitset files")
+    exporter.add_argument('output', help="Directory for skills.bits, education.bits and candidates.npy")
+    exporter.set_defaults(run=export_bitsets)
+
+    args = parser.parse_args(argv)
+    if app.candidate_store is None:
+        raise SystemExit("The candidate store is disabled (CANDIDATE_STORE_DB is empty).")
+    args.run(args)
+
+
+if __name__ == '__main__':
+    main()
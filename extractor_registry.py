@@ -0,0 +1,121 @@
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from process_local import ProcessLocal
+from streaming_ingest import ChunkedTextScanner, iter_text_chunks
+
+
+def gil_disabled():
+    """True on a free-threaded interpreter with the GIL turned off (Python 3.13t and later)."""
+    return hasattr(sys, '_is_gil_enabled') and not sys._is_gil_enabled()
+
+
+class Extraction:
+    """Values extracted from one resume, by field, and the milliseconds each extractor took, by name."""
+    def __init__(self, values, timings):
+        self.values = values
+        self.timings = timings
+
+
+class ExtractorRegistry:
+    """
+    Named extractors run over each resume's text. There are three kinds:
+      - patterns: the first match of a compiled regex;
+      - keywords: every keyword of a KeywordMatcher found in the lowercased text;
+      - functions: any callable on the text (or only its first head_chars characters).
+    Patterns and keywords are scanned in chunks of chunk_chars (see ChunkedTextScanner),
+    so no full-size copies of the text are made.
+
+    With a worker pool (max_workers > 0), extractors run concurrently, each pattern and
+    keyword set on its own scanner. Otherwise they run one after another, with patterns
+    and keywords sharing a single pass over the text. Regex matching holds the GIL, so the
+    pool only pays off on a free-threaded interpreter or with extractors that release it.
+    """
+    def __init__(self, chunk_chars=64 * 1024, overlap=512, max_workers=0):
+        self.chunk_chars = chunk_chars
+        self.overlap = overlap
+        self.max_workers = max_workers
+        self.extractors = {}  # name -> (kind, extractor, field, options)
+        self._executor = ProcessLocal(lambda: ThreadPoolExecutor(max_workers=self.max_workers,
+                                                                 thread_name_prefix='extractor'))
+
+    def _add(self, name, kind, extractor, field, options):
+        if name in self.extractors:
+            raise ValueError(f"An extractor named {name!r} is already registered")
+        self.extractors[name] = (kind, extractor, field or name, options)
+
+    def add_pattern(self, name, pattern, field=None, transform=None, default="N/A", flags=0):
+        """
+        Registers a regex; its first match (passed through transform) is the value, else default.
+        Pattern strings are compiled here, once.
+        """
+        pattern = re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+        self._add(name, 'pattern', pattern, field, {'transform': transform, 'default': default})
+
+    def add_keywords(self, name, matcher, field=None):
+        """Registers a KeywordMatcher; the value is the keywords found, in list order."""
+        self._add(name, 'keywords', matcher, field, {})
+
+    def add_function(self, name, fn, field=None, head_chars=None):
+        """Registers fn(text); with head_chars, fn only gets that many characters from the start."""
+        self._add(name, 'function', fn, field, {'head_chars': head_chars})
+
+    @property
+    def fields(self):
+        return [field for _, _, field, _ in self.extractors.values()]
+
+    def _scan(self, names, text):
+        """Runs the named pattern and keyword extractors in one chunked pass. Returns (values, seconds)."""
+        patterns = {name: self.extractors[name][1] for name in names if self.extractors[name][0] == 'pattern'}
+        matchers = {name: self.extractors[name][1] for name in names if self.extractors[name][0] == 'keywords'}
+        scanner = ChunkedTextScanner(patterns=patterns, matchers=matchers, overlap=self.overlap)
+        for chunk in iter_text_chunks(text, self.chunk_chars):
+            scanner.feed(chunk)
+        scanner.close()
+
+        values = {}
+        for name in patterns:
+            options = self.extractors[name][3]
+            match = scanner.matches[name]
+            if match is None:
+                values[name] = options['default']
+            else:
+                values[name] = options['transform'](match) if options['transform'] else match
+        for name in matchers:
+            values[name] = scanner.found_keywords(name)
+        return values, scanner.timings
+
+    def _call(self, name, text):
+        _, fn, _, options = self.extractors[name]
+        started = time.perf_counter()
+        value = fn(text if options['head_chars'] is None else text[:options['head_chars']])
+        return {name: value}, {name: time.perf_counter() - started}
+
+    def run(self, text, parallel=None):
+        """
+        Runs every extractor over text, concurrently if parallel (by default, when the registry
+        has a worker pool; without one they always run one after another). Returns an
+        Extraction of values by field and timings by extractor name.
+        """
+        parallel = self.max_workers > 0 and parallel is not False
+        scanned = [name for name, (kind, _, _, _) in self.extractors.items() if kind != 'function']
+        functions = [name for name, (kind, _, _, _) in self.extractors.items() if kind == 'function']
+
+        if parallel:
+            executor = self._executor.get()
+            futures = [executor.submit(self._scan, [name], text) for name in scanned]
+            futures += [executor.submit(self._call, name, text) for name in functions]
+            outcomes = [future.result() for future in futures]
+        else:
+            outcomes = [self._scan(scanned, text)] if scanned else []
+            outcomes += [self._call(name, text) for name in functions]
+
+        values, seconds = {}, {}
+        for extracted, timings in outcomes:
+            values.update(extracted)
+            seconds.update(timings)
+        # Fields in registration order, whatever order the extractors finished in
+        return Extraction({field: values[name] for name, (_, _, field, _) in self.extractors.items()},
+                          {name: seconds[name] * 1000 for name in self.extractors})
@@ -0,0 +1,125 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+# Vectorizer parameters that decide how text is split into tokens
+ANALYZER_PARAMS = ('analyzer', 'lowercase', 'preprocessor', 'tokenizer', 'token_pattern',
+                   'stop_words', 'strip_accents', 'ngram_range', 'input', 'encoding', 'decode_error')
+
+
+class StageTimer:
+    """Collects wall-clock time (in milliseconds) per named pipeline stage."""
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name, milliseconds):
+        """Adds time measured elsewhere to a stage."""
+        self.timings[name] = self.timings.get(name, 0.0) + milliseconds
+
+    def server_timing(self):
+        """Formats the timings as an HTTP Server-Timing header value."""
+        return ', '.join(f"{name};dur={duration:.2f}" for name, duration in self.timings.items())
+
+
+class _TokenGroup:
+    """Fitted TfidfVectorizers with identical tokenization, sharing one union vocabulary."""
+    def __init__(self, vectorizers):
+        self.vectorizers = vectorizers  # name -> vectorizer
+        self.analyze = next(iter(vectorizers.values())).build_analyzer()
+
+        self.vocabulary = {}
+        for vectorizer in vectorizers.values():
+            for token in vectorizer.vocabulary_:
+                self.vocabulary.setdefault(token, len(self.vocabulary))
+
+        # Union column -> column in each vectorizer (-1 where the token is not in its vocabulary)
+        self.column_maps = {}
+        for name, vectorizer in vectorizers.items():
+            column_map = np.full(len(self.vocabulary), -1, dtype=np.int64)
+            for token, column in vectorizer.vocabulary_.items():
+                column_map[self.vocabulary[token]] = column
+            self.column_maps[name] = column_map
+
+    def count(self, clean_texts):
+        """Tokenizes every text once, returning union-vocabulary counts as (row ids, columns, counts)."""
+        rows, columns, counts = [], [], []
+        vocabulary = self.vocabulary
+        for row, text in enumerate(clean_texts):
+            token_counts = Counter(vocabulary[token] for token in self.analyze(text) if token in vocabulary)
+            rows.extend([row] * len(token_counts))
+            columns.extend(token_counts.keys())
+            counts.extend(token_counts.values())
+        return np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64), np.array(counts, dtype=np.int64)
+
+    def transform(self, clean_texts):
+        """Returns name -> TF-IDF matrix, identical to each vectorizer's own transform()."""
+        rows, columns, counts = self.count(clean_texts)
+        features = {}
+        for name, vectorizer in self.vectorizers.items():
+            mapped = self.column_maps[name][columns]
+            keep = mapped >= 0
+            X = sp.csr_matrix((counts[keep], (rows[keep], mapped[keep])),
+                              shape=(len(clean_texts), len(vectorizer.vocabulary_)), dtype=vectorizer.dtype)
+            X.sort_indices()
+            features[name] = _apply_tfidf(vectorizer, X)
+        return features
+
+
+def _apply_tfidf(vectorizer, X):
+    """Applies a fitted TfidfVectorizer's weighting to a raw count matrix (mirrors TfidfTransformer)."""
+    if vectorizer.binary:
+        X.data.fill(1)
+    if vectorizer.sublinear_tf:
+        np.log(X.data, X.data)
+        X.data += 1.0
+    if vectorizer.use_idf:
+        X.data *= vectorizer.idf_[X.indices]
+    if vectorizer.norm is not None:
+        X = normalize(X, norm=vectorizer.norm, copy=False)
+    return X
+
+
+class FeaturePipeline:
+    """
+    Cleans resume texts once and vectorizes them for every model in a single pass.
+
+    Fitted TfidfVectorizers with the same tokenization settings share one tokenization
+    and one count pass over a union vocabulary; each model's matrix is then a column
+    remap of those counts. Anything else (e.g. MockVectorizer) gets no features and is
+    left to the caller.
+    """
+    def __init__(self, clean, vectorizers):
+        self.clean = clean
+        groups = {}
+        for name, vectorizer in vectorizers.items():
+            if isinstance(vectorizer, TfidfVectorizer) and hasattr(vectorizer, 'vocabulary_'):
+                params = vectorizer.get_params()
+                key = repr([params[param] for param in ANALYZER_PARAMS])
+                groups.setdefault(key, {})[name] = vectorizer
+        self.groups = [_TokenGroup(group) for group in groups.values()]
+
+    def run(self, resume_texts, timer=None):
+        """Returns (clean texts, name -> TF-IDF matrix) for a batch of raw resume texts."""
+        timer = timer or StageTimer()
+        with timer.stage('clean'):
+            clean_texts = [self.clean(text) for text in resume_texts]
+
+        features = {}
+        with timer.stage('vectorize'):
+            if clean_texts:
+                for group in self.groups:
+                    features.update(group.transform(clean_texts))
+        return clean_texts, features
@@ -0,0 +1,25 @@
+"""
+gunicorn settings, picked up when the server is started from the repository root:
+    gunicorn app:app --workers 4
+
+The app and every model are loaded once in the master process before the workers are
+forked, so the workers share the model memory copy-on-write. Loading lazily in each
+worker instead gives every worker its own copy of the models.
+
+Async jobs are kept by the worker that received them, so with several workers and no
+JOB_QUEUE_DB set, the job records are mirrored to a SQLite file in the temporary directory
+that every worker can read when it answers a poll.
+"""
+import os
+import tempfile
+
+preload_app = True
+
+
+def when_ready(server):
+    # Runs in the master after the app is imported and before any worker is forked
+    import app
+    app.preload_models()
+    if server.cfg.workers > 1 and not app.job_queue.db_path:
+        app.job_queue.db_path = os.path.join(tempfile.gettempdir(), f'resume-jobs-{os.getpid()}.db')
+        server.log.info(f"JOB_QUEUE_DB is not set; sharing job status between workers through {app.job_queue.db_path}")
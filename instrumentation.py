@@ -0,0 +1,174 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+
+# Stage latencies span sub-millisecond regexes to multi-second PDF parses
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing count per label combination."""
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, _format_labels(self.labelnames, key), value) for key, value in sorted(self._values.items())]
+
+
+class Histogram:
+    """Observations counted into cumulative buckets per label combination, plus their sum."""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, buckets=LATENCY_BUCKETS, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self.labelnames = tuple(labelnames)
+        self._values = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, state):
+                    cumulative += count
+                    labels = _format_labels(self.labelnames, key, [('le', _format_value(bound))])
+                    samples.append((f"{self.name}_bucket", labels, cumulative))
+                labels = _format_labels(self.labelnames, key)
+                samples.append((f"{self.name}_sum", labels, state[-2]))
+                samples.append((f"{self.name}_count", labels, state[-1]))
+        return samples
+
+
+class CallbackMetric:
+    """
+    A counter or gauge read from existing state at scrape time (e.g. cache statistics).
+    fn returns {label value: number} for a single label, or a number when there is none.
+    """
+    def __init__(self, name, documentation, fn, type='gauge', labelname=None):
+        self.name = name
+        self.documentation = documentation
+        self.fn = fn
+        self.type = type
+        self.labelname = labelname
+
+    def samples(self):
+        values = self.fn()
+        if self.labelname is None:
+            return [(self.name, '', values)]
+        return [(self.name, _format_labels((self.labelname,), (key,)), value) for key, value in sorted(values.items())]
+
+
+class MetricsRegistry:
+    """Holds the app's metrics and renders them in the Prometheus text exposition format."""
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, buckets=LATENCY_BUCKETS, labelnames=()):
+        return self.register(Histogram(name, documentation, buckets, labelnames))
+
+    def callback(self, name, documentation, fn, type='gauge', labelname=None):
+        return self.register(CallbackMetric(name, documentation, fn, type, labelname))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+class RequestProfiler:
+    """
+    Runs cProfile around individual requests: a random sample_rate fraction of them, plus
+    those that ask for it when allow_requested is set. Each profile is saved to output_dir
+    as a .prof file (open with pstats or snakeviz) and its top functions are logged.
+    """
+    def __init__(self, sample_rate=0.0, allow_requested=False, output_dir='profiles', top=20):
+        self.sample_rate = sample_rate
+        self.allow_requested = allow_requested
+        self.output_dir = output_dir
+        self.top = top
+
+    def start(self, requested=False):
+        """Returns a running profiler if this request should be profiled, else None."""
+        if not ((requested and self.allow_requested) or (self.sample_rate and random.random() < self.sample_rate)):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active (e.g. a nested request in the same thread)
+            return None
+        return profiler
+
+    def finish(self, profiler, label):
+        """Stops the profiler, saves its stats and returns the file path."""
+        profiler.disable()
+        os.makedirs(self.output_dir, exist_ok=True)
+        safe_label = ''.join(c if c.isalnum() else '_' for c in label).strip('_') or 'request'
+        path = os.path.join(self.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_label}-{uuid.uuid4().hex[:8]}.prof")
+        profiler.dump_stats(path)
+
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(self.top)
+        logging.info(f"Profile of {label} saved to {path}\n{summary.getvalue()}")
+        return path
@@ -0,0 +1,134 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+
+def skill_weights(skills, vectorizer=None):
+    """
+    Weight of each skill in the overlap score: the mean IDF of its tokens in a fitted
+    vectorizer, so rare skills count for more than ubiquitous ones (the highest IDF for
+    skills made only of unseen tokens), or 1.0 for every skill without one.
+    Repeated skills only count at their first position.
+    """
+    weights = np.ones(len(skills))
+    if vectorizer is not None and hasattr(vectorizer, 'idf_'):
+        analyze = vectorizer.build_analyzer()
+        vocabulary, idf = vectorizer.vocabulary_, vectorizer.idf_
+        for n, skill in enumerate(skills):
+            token_idf = [idf[vocabulary[token]] for token in analyze(skill) if token in vocabulary]
+            weights[n] = np.mean(token_idf) if token_idf else idf.max()
+
+    seen = set()
+    for n, skill in enumerate(skills):
+        if skill.lower() in seen:
+            weights[n] = 0.0
+        seen.add(skill.lower())
+    return weights
+
+
+class JobMatcher:
+    """
+    Scores resumes against job descriptions (JDs) with two sparse matrix products:
+      - TF-IDF cosine similarity: resume vectors (n x V) times JD vectors (m x V) transposed;
+      - weighted skill overlap: resume skill indicators (n x S) times weighted JD skills
+        (m x S) transposed, over each JD's total skill weight.
+    The ATS score blends them by similarity_weight; JDs naming no known skill are scored
+    on similarity alone. One call scores any number of resumes against any number of JDs.
+
+    JD rows are cached by text (LRU), so scoring a stream of resumes against the same
+    openings vectorizes each JD once. vectorize(texts) returns a TF-IDF matrix, or None
+    when no fitted vectorizer is available (scores then use skill overlap only).
+    """
+    def __init__(self, vectorize, skill_matcher, weights, similarity_weight=0.5, cache_size=256):
+        self.vectorize = vectorize
+        self.skill_matcher = skill_matcher
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.similarity_weight = similarity_weight
+        self.cache_size = cache_size
+        # Lowercased skill -> its first position in the skill list
+        self._positions = {}
+        for n, skill in enumerate(skill_matcher.keywords):
+            self._positions.setdefault(skill.lower(), n)
+        self._cache = OrderedDict()  # sha256 of JD text -> (TF-IDF row or None, weighted skill row, skill names)
+        self._lock = threading.Lock()
+
+    def _vectors(self, texts):
+        vectors = self.vectorize(texts)
+        return normalize(sp.csr_matrix(vectors)) if vectors is not None else None
+
+    def skill_matrix(self, skill_lists, weighted=False):
+        """One row per list of skill names, with a column per position in the skill list."""
+        rows, columns = [], []
+        for row, skills in enumerate(skill_lists):
+            found = {self._positions[skill.lower()] for skill in skills if skill.lower() in self._positions}
+            rows.extend([row] * len(found))
+            columns.extend(found)
+        values = self.weights[columns] if weighted else np.ones(len(columns))
+        return sp.csr_matrix((values, (rows, columns)), shape=(len(skill_lists), len(self.weights)))
+
+    def _job_description_rows(self, job_descriptions):
+        """Cached (TF-IDF row, weighted skill row, skills) per JD, computing the missing ones in one batch."""
+        keys = [hashlib.sha256(text.encode('utf-8')).hexdigest() for text in job_descriptions]
+        with self._lock:
+            entries = {key: self._cache[key] for key in keys if key in self._cache}
+            for key in entries:
+                self._cache.move_to_end(key)
+
+        missing = list(dict.fromkeys(key for key in keys if key not in entries))
+        if missing:
+            texts = {key: text for key, text in zip(keys, job_descriptions)}
+            texts = [texts[key] for key in missing]
+            skill_lists = [self.skill_matcher.find(text.lower()) for text in texts]
+            vectors = self._vectors(texts)
+            skill_rows = self.skill_matrix(skill_lists, weighted=True)
+            with self._lock:
+                for n, key in enumerate(missing):
+                    skills = {}
+                    for skill in skill_lists[n]:
+                        skills.setdefault(skill.lower(), skill)  # Each skill once, as first spelled
+                    entries[key] = self._cache[key] = (vectors[n] if vectors is not None else None,
+                                                       skill_rows[n], list(skills.values()))
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return [entries[key] for key in keys]
+
+    def score(self, resume_vectors, resume_skills, job_descriptions):
+        """
+        Scores n resumes against m JDs. resume_vectors is the resumes' n x V TF-IDF matrix
+        (or None) and resume_skills their lists of extracted skills.
+        Returns a dict of n x m arrays: 'ats_score' (0-100), 'similarity' and 'skill_overlap'
+        (NaN for JDs naming no known skill), plus each JD's 'skills'.
+        """
+        rows = self._job_description_rows(job_descriptions)
+        n, m = len(resume_skills), len(job_descriptions)
+
+        use_vectors = resume_vectors is not None and all(vector is not None for vector, _, _ in rows)
+        if use_vectors:
+            jd_vectors = sp.vstack([vector for vector, _, _ in rows])
+            similarity = (normalize(sp.csr_matrix(resume_vectors)) @ jd_vectors.T).toarray()
+        else:
+            similarity = np.zeros((n, m))
+
+        jd_skills = sp.vstack([skills for _, skills, _ in rows]).tocsr()
+        totals = np.asarray(jd_skills.sum(axis=1)).ravel()
+        has_skills = totals > 0
+        overlap = (self.skill_matrix(resume_skills) @ jd_skills.T).toarray()
+        overlap[:, has_skills] /= totals[has_skills]
+        overlap[:, ~has_skills] = np.nan
+
+        if use_vectors:
+            blended = np.where(has_skills, self.similarity_weight * similarity + (1 - self.similarity_weight) * overlap,
+                               similarity)
+        else:
+            blended = np.where(has_skills, overlap, 0.0)
+        return {
+            'ats_score': np.rint(100 * np.clip(blended, 0, 1)).astype(int),
+            'similarity': similarity,
+            'skill_overlap': overlap,
+            'skills': [skills for _, _, skills in rows],
+        }
+
@@ -0,0 +1,138 @@
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from process_local import ProcessLocal, connect_sqlite
+
+FINISHED_STATUSES = ('done', 'failed')
+
+JOBS_SCHEMA = ("CREATE TABLE IF NOT EXISTS jobs ("
+               "id TEXT PRIMARY KEY, status TEXT NOT NULL, updated_at REAL NOT NULL, record TEXT NOT NULL)")
+
+
+class JobQueueFull(Exception):
+    """Raised by JobQueue.submit() when max_pending jobs are already waiting."""
+
+
+class JobQueue:
+    """
+    Runs jobs in the background on a bounded pool of worker threads.
+
+    submit() returns a job id immediately. At most max_pending jobs wait for a worker; beyond
+    that submit() raises JobQueueFull so callers can push back. get() reports a job's status
+    ('queued', 'running', 'done' or 'failed') and its result once done. Finished jobs are kept
+    for ttl_seconds. With db_path, job records are also written to SQLite so every worker
+    process sharing the file can answer status polls (jobs still run where they were submitted).
+    The worker threads start on first use in each process.
+    """
+    def __init__(self, max_workers=4, max_pending=64, ttl_seconds=3600, db_path=None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.stats = {'submitted': 0, 'rejected': 0, 'completed': 0, 'failed': 0}
+        self._jobs = OrderedDict()  # job id -> record
+        self._queue = ProcessLocal(self._start_workers)
+        self._db = ProcessLocal(lambda: connect_sqlite(self.db_path, JOBS_SCHEMA))
+        self._lock = threading.Lock()
+
+    def _start_workers(self):
+        """Creates a work queue and starts the worker threads taking jobs from it."""
+        work_queue = queue.Queue(maxsize=self.max_pending)
+        for n in range(self.max_workers):
+            threading.Thread(target=self._work, args=(work_queue,), name=f"job-worker-{n}", daemon=True).start()
+        return work_queue
+
+    def submit(self, fn, *args):
+        """Queues fn(*args) and returns the new job's id. Raises JobQueueFull when the queue is full."""
+        job_id = uuid.uuid4().hex
+        work_queue = self._queue.get()
+        with self._lock:
+            self._expire()
+            try:
+                work_queue.put_nowait((job_id, fn, args))
+            except queue.Full:
+                self.stats['rejected'] += 1
+                raise JobQueueFull(f"The job queue is full ({self.max_pending} jobs waiting). Try again shortly.")
+            self.stats['submitted'] += 1
+            self._jobs[job_id] = {'id': job_id, 'status': 'queued', 'submitted_at': time.time()}
+            self._save(self._jobs[job_id])
+        return job_id
+
+    def _work(self, work_queue):
+        while True:
+            job_id, fn, args = work_queue.get()
+            # Saving a status can fail too (a locked database, a result that is not JSON), so
+            # every step is covered: the job ends up failed and the worker takes the next one
+            try:
+                self._update(job_id, status='running', started_at=time.time())
+                result = fn(*args)
+                self._update(job_id, status='done', result=result, finished_at=time.time())
+            except Exception as e:
+                logging.error(f"Job {job_id} failed: {e}")
+                self._update(job_id, status='failed', error=str(e), finished_at=time.time())
+            finally:
+                work_queue.task_done()
+
+    def _update(self, job_id, **fields):
+        """
+        Applies fields to a job's record once it is saved. If saving fails, the record is left as
+        it was and the error raised, except for a 'failed' status, which is kept in memory anyway.
+        """
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None:
+                return
+            updated = dict(record, **fields)
+            try:
+                self._save(updated)
+            except Exception as e:
+                if updated['status'] != 'failed':
+                    raise
+                logging.error(f"Could not save the failure of job {job_id}: {e}")
+            self._jobs[job_id] = updated
+            if updated['status'] in FINISHED_STATUSES:
+                self.stats['completed' if updated['status'] == 'done' else 'failed'] += 1
+
+    def _save(self, record):
+        """Writes a job record to SQLite, if enabled. Must be called with the lock held."""
+        if self.db_path:
+            db = self._db.get()
+            db.execute("INSERT OR REPLACE INTO jobs (id, status, updated_at, record) VALUES (?, ?, ?, ?)",
+                       (record['id'], record['status'], time.time(), json.dumps(record)))
+            db.commit()
+
+    def _expire(self):
+        """Drops finished jobs older than the TTL. Must be called with the lock held."""
+        cutoff = time.time() - self.ttl_seconds
+        expired = [job_id for job_id, record in self._jobs.items()
+                   if record['status'] in FINISHED_STATUSES and record['finished_at'] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+        if self.db_path:
+            db = self._db.get()
+            db.execute("DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", FINISHED_STATUSES + (cutoff,))
+            db.commit()
+
+    def get(self, job_id):
+        """Returns a copy of the job's record, or None if the job is unknown or expired."""
+        with self._lock:
+            self._expire()
+            record = self._jobs.get(job_id)
+            if record is not None:
+                return dict(record)
+            if self.db_path:
+                row = self._db.get().execute("SELECT record FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                if row:
+                    return json.loads(row[0])
+            return None
+
+    def snapshot(self):
+        """Returns the job counters plus the number of jobs waiting and running."""
+        with self._lock:
+            statuses = [record['status'] for record in self._jobs.values()]
+            return dict(self.stats, queued=statuses.count('queued'), running=statuses.count('running'))
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Number of set bits in every byte value
+_POPCOUNT = np.array([bin(n).count('1') for n in range(256)], dtype=np.uint8)
+
+# Rows unpacked at a time by keyword_frequency(), bounding its memory on large pools
+FREQUENCY_CHUNK_ROWS = 65536
+
+BITSET_MAGIC = b'KWBITS1\n'
+BITSET_ALIGNMENT = 64  # Packed rows start at a multiple of this in the file
+
+
+class KeywordVocabulary:
+    """
+    Fixed encoding of keyword sets as bit arrays: keyword i of the list is bit i, packed
+    eight to a byte (np.packbits order), so a resume's skills take len(keywords) / 8 bytes.
+    Keywords are matched case-insensitively; repeated keywords share their first bit.
+    """
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self.size = len(self.keywords)
+        self.row_bytes = (self.size + 7) // 8
+        self.positions = {}  # lowercased keyword -> bit
+        for n, keyword in enumerate(self.keywords):
+            self.positions.setdefault(keyword.lower(), n)
+        self.fingerprint = hashlib.sha256('\n'.join(self.keywords).encode('utf-8')).hexdigest()
+
+    def encode(self, keyword_lists):
+        """Packs lists of keywords into an (n, row_bytes) uint8 array. Unknown keywords are ignored."""
+        rows, columns = [], []
+        for row, keywords in enumerate(keyword_lists):
+            for keyword in keywords:
+                bit = self.positions.get(keyword.lower())
+                if bit is not None:
+                    rows.append(row)
+                    columns.append(bit)
+        bits = np.zeros((len(keyword_lists), self.row_bytes * 8), dtype=bool)
+        bits[rows, columns] = True
+        return np.packbits(bits, axis=1)
+
+    def mask(self, keywords):
+        """Packs one keyword list into a single (row_bytes,) row, e.g. a query."""
+        return self.encode([keywords])[0]
+
+    def decode(self, packed):
+        """Keyword lists of packed rows (in vocabulary order)."""
+        bits = np.unpackbits(np.atleast_2d(packed), axis=1, count=self.size)
+        return [[self.keywords[i] for i in np.flatnonzero(row)] for row in bits]
+
+
+def popcount(packed):
+    """Number of set bits in each row."""
+    return _POPCOUNT[packed].sum(axis=-1, dtype=np.int64)
+
+
+def overlap_counts(packed, query):
+    """Number of the query's keywords each row has. Only the bytes the query touches are read."""
+    columns = np.flatnonzero(query)
+    return popcount(packed[:, columns] & query[columns])
+
+
+def contains_all(packed, query):
+    """Boolean mask of the rows having every keyword of the query."""
+    columns = np.flatnonzero(query)
+    return ((packed[:, columns] & query[columns]) == query[columns]).all(axis=-1)
+
+
+def coverage_gaps(packed, query):
+    """Packed rows of the query keywords each row lacks (decode them with the vocabulary)."""
+    return query & ~packed
+
+
+def keyword_frequency(packed, size, groups=None, group_count=None, chunk_rows=FREQUENCY_CHUNK_ROWS):
+    """
+    Number of rows having each keyword. With groups (an integer group code per row, e.g. a
+    category), returns a (group_count, size) array of per-group counts instead.
+    Rows are unpacked a chunk at a time, so packed may be a memory-mapped pool of any size.
+    """
+    if groups is None:
+        counts = np.zeros(size, dtype=np.int64)
+    else:
+        group_count = group_count if group_count is not None else int(np.max(groups, initial=-1)) + 1
+        counts = np.zeros((group_count, size), dtype=np.int64)
+    for start in range(0, len(packed), chunk_rows):
+        bits = np.unpackbits(np.asarray(packed[start:start + chunk_rows]), axis=1, count=size)
+        if groups is None:
+            counts += bits.sum(axis=0, dtype=np.int64)
+            continue
+        chunk_groups = np.asarray(groups[start:start + chunk_rows])
+        for group in np.unique(chunk_groups):
+            counts[group] += bits[chunk_groups == group].sum(axis=0, dtype=np.int64)
+    return counts
+
+
+def _header(vocabulary, metadata):
+    body = json.dumps({'keywords': vocabulary.keywords, 'fingerprint': vocabulary.fingerprint,
+                       'metadata': metadata or {}}).encode('utf-8')
+    length = len(BITSET_MAGIC) + 8 + len(body)
+    padding = -length % BITSET_ALIGNMENT
+    return BITSET_MAGIC + (len(body) + padding).to_bytes(8, 'little') + body + b' ' * padding
+
+
+def write_bitsets(path, vocabulary, chunks, metadata=None):
+    """
+    Writes packed rows to a bitset file: a JSON header (the keyword list, so the file
+    decodes on its own, and any metadata) followed by the rows as one flat uint8 block.
+    chunks is an iterable of (n, row_bytes) arrays, so pools larger than memory can be
+    streamed out. Returns the number of rows written.
+    """
+    rows = 0
+    with open(path, 'wb') as f:
+        f.write(_header(vocabulary, metadata))
+        for chunk in chunks:
+            chunk = np.ascontiguousarray(chunk, dtype=np.uint8)
+            if chunk.ndim != 2 or chunk.shape[1] != vocabulary.row_bytes:
+                raise ValueError(f"Expected rows of {vocabulary.row_bytes} bytes, got shape {chunk.shape}")
+            f.write(chunk.tobytes())
+            rows += len(chunk)
+    return rows
+
+
+def read_bitsets(path, vocabulary=None):
+    """
+    Opens a bitset file as a read-only memory map, without reading the rows.
+    Returns (vocabulary, packed rows, metadata). With a vocabulary, raises ValueError if
+    the file was written with a different keyword list.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(BITSET_MAGIC)) != BITSET_MAGIC:
+            raise ValueError(f"{path} is not a bitset file")
+        header_length = int.from_bytes(f.read(8), 'little')
+        header = json.loads(f.read(header_length))
+
+    file_vocabulary = KeywordVocabulary(header['keywords'])
+    if vocabulary is not None and vocabulary.fingerprint != file_vocabulary.fingerprint:
+        raise ValueError(f"{path} was written with a different keyword list")
+    offset = len(BITSET_MAGIC) + 8 + header_length
+    rows = (os.path.getsize(path) - offset) // file_vocabulary.row_bytes
+    if rows:
+        packed = np.memmap(path, dtype=np.uint8, mode='r', offset=offset, shape=(rows, file_vocabulary.row_bytes))
+    else:
+        packed = np.zeros((0, file_vocabulary.row_bytes), dtype=np.uint8)
+    return file_vocabulary, packed, header['metadata']
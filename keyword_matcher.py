@@ -0,0 +1,90 @@
+import re
+
+# Characters that Python's IGNORECASE mode treats as equal to an ASCII letter
+# even after str.lower() (e.g. the long s matches 's').
+_IGNORECASE_FIXES = str.maketrans({'\u017f': 's', '\u0131': 'i', '\u212a': 'k'})
+
+
+class KeywordMatcher:
+    """
+    Finds every keyword of a fixed list in a single scan of the text.
+
+    The keywords are compiled once into a trie-shaped regex wrapped in a lookahead,
+    so one finditer() reports every position where a keyword starts (overlaps included).
+    The trie returns the longest keyword at each position; shorter keywords that are
+    prefixes of it and whose trailing word boundary holds are resolved from a
+    precomputed table. Results are identical to searching r'\\b<keyword>\\b' per keyword.
+    """
+    def __init__(self, keywords, ignore_case=False):
+        self.keywords = list(keywords)
+        self.ignore_case = ignore_case
+
+        # Lowercased keyword -> indices of the original keywords it stands for
+        self._index = {}
+        for i, keyword in enumerate(self.keywords):
+            self._index.setdefault(keyword.lower(), []).append(i)
+
+        # Lowercased keyword -> indices of every keyword that also matches at the same position
+        self._implied = {}
+        for key in self._index:
+            implied = []
+            for other in self._index:
+                if key.startswith(other) and (other == key or self._is_boundary(key, len(other))):
+                    implied.extend(self._index[other])
+            self._implied[key] = implied
+
+        flags = re.IGNORECASE if ignore_case else 0
+        self.pattern = re.compile(r'(?=\b(' + self._trie_regex(sorted(self._index)) + r')\b)', flags)
+
+    @staticmethod
+    def _is_boundary(text, pos):
+        """Mirrors regex \\b between text[pos - 1] and text[pos]."""
+        before = pos > 0 and (text[pos - 1].isalnum() or text[pos - 1] == '_')
+        after = pos < len(text) and (text[pos].isalnum() or text[pos] == '_')
+        return before != after
+
+    @classmethod
+    def _trie_regex(cls, keys):
+        """Builds a regex from sorted keys, trying longer continuations before shorter ones."""
+        branches = []
+        ends_here = False
+        i = 0
+        while i < len(keys):
+            if keys[i] == '':
+                ends_here = True
+                i += 1
+                continue
+            head = keys[i][0]
+            j = i
+            while j < len(keys) and keys[j] and keys[j][0] == head:
+                j += 1
+            branches.append(re.escape(head) + cls._trie_regex([k[1:] for k in keys[i:j]]))
+            i = j
+
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if ends_here:
+            # Greedy optional: backtracks to the shorter keyword if the boundary fails
+            body = '(?:' + body + ')?' if len(branches) == 1 else body + '?'
+        return body
+
+    def find_indices(self, text, start=0, stop=None):
+        """
+        Returns the sorted indices (into self.keywords) of all keywords found in text.
+        With start/stop, only keywords starting in text[start:stop] are reported, but the
+        characters around that range still count for word boundaries.
+        """
+        found = set()
+        for match in self.pattern.finditer(text, start):
+            if stop is not None and match.start() >= stop:
+                break
+            key = match.group(1).lower()
+            if self.ignore_case:
+                key = key.translate(_IGNORECASE_FIXES)
+            found.update(self._implied[key])
+        return sorted(found)
+
+    def find(self, text):
+        """Returns the keywords found in text, in list order."""
+        return [self.keywords[i] for i in self.find_indices(text)]
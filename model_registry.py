@@ -0,0 +1,202 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+
+import joblib
+
+# Memory-mappable joblib copies of the pickles live in this subdirectory of the models directory
+MMAP_DIRNAME = '.mmap'
+MANIFEST_FILENAME = 'manifest.json'
+
+
+def models_fingerprint(models_dir):
+    """Fingerprints the pickles in a models directory by name, size and modification time."""
+    digest = hashlib.sha256()
+    try:
+        filenames = sorted(os.listdir(models_dir))
+    except FileNotFoundError:
+        filenames = []
+    for filename in filenames:
+        if not filename.endswith('.pkl'):
+            continue
+        stat = os.stat(os.path.join(models_dir, filename))
+        digest.update(f"{filename}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=64)
+def _checksum(path, size, mtime_ns):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def file_checksum(path):
+    """SHA-256 of a file, memoized on its size and modification time."""
+    stat = os.stat(path)
+    return _checksum(path, stat.st_size, stat.st_mtime_ns)
+
+
+def load_memory_mapped(path):
+    """
+    Loads a pickled model through a joblib copy whose NumPy arrays are memory-mapped read-only.
+    Only arrays the model keeps as loaded stay mapped (e.g. a vectorizer's idf_ or a linear
+    model's coef_): tree ensembles copy their node arrays out while unpickling, and dicts such
+    as a vectorizer's vocabulary_ are ordinary objects. Workers therefore share models mainly
+    by loading them before the fork (see preload_models in app.py), not through the mapping.
+    The copy is written next to the pickle on first use and named by the pickle's checksum.
+    If it cannot be written (e.g. a read-only models directory) the pickle is loaded normally.
+    """
+    checksum = file_checksum(path)
+    directory = os.path.join(os.path.dirname(path), MMAP_DIRNAME)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    mmap_path = os.path.join(directory, f"{stem}-{checksum[:16]}.joblib")
+
+    if not os.path.exists(mmap_path):
+        with open(path, 'rb') as f:
+            model = pickle.load(f)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            temp_path = f"{mmap_path}.{os.getpid()}.tmp"
+            joblib.dump(model, temp_path)
+            os.replace(temp_path, mmap_path)
+        except OSError as e:
+            logging.warning(f"Could not write memory-mappable copy of {path}: {e}. Using the pickle directly.")
+            return model
+        # Copies made from older versions of this pickle are no longer needed
+        for filename in os.listdir(directory):
+            if filename.startswith(f"{stem}-") and filename.endswith('.joblib') and filename != os.path.basename(mmap_path):
+                try:
+                    os.remove(os.path.join(directory, filename))
+                except OSError:
+                    pass
+
+    return joblib.load(mmap_path, mmap_mode='r')
+
+
+class ModelSet:
+    """
+    One version of the model files in a directory. Each model is loaded on first use
+    and its checksum and version (from manifest.json, else the checksum) are recorded.
+    Objects derived from the models (e.g. feature pipelines) can be cached per set.
+    """
+    def __init__(self, models_dir, loader, generation):
+        self.models_dir = models_dir
+        self.loader = loader
+        self.generation = generation
+        self.created_at = time.time()
+        self.files_fingerprint = models_fingerprint(models_dir)  # The pickles on disk when the set was made
+        self.fingerprint = f"{os.path.abspath(models_dir)}:{self.files_fingerprint}"
+        self.manifest = self._read_manifest()
+        self.info = {}
+        self._models = {}
+        self._derived = {}
+        self._lock = threading.RLock()
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.models_dir, MANIFEST_FILENAME)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def get(self, filename):
+        """Returns the model stored in filename, loading it on first use."""
+        if filename in self._models:
+            return self._models[filename]
+        with self._lock:
+            if filename not in self._models:
+                path = os.path.join(self.models_dir, filename)
+                start = time.perf_counter()
+                model = self.loader(filename, self.models_dir)
+                checksum = file_checksum(path) if os.path.exists(path) else None
+                self.info[filename] = {
+                    'version': self.manifest.get(filename) or (checksum[:12] if checksum else None),
+                    'checksum': checksum,
+                    'type': type(model).__name__,
+                    'load_seconds': round(time.perf_counter() - start, 3),
+                }
+                self._models[filename] = model
+            return self._models[filename]
+
+    def derived(self, key, factory):
+        """Returns an object built from this set's models, building it once with factory()."""
+        if key not in self._derived:
+            with self._lock:
+                if key not in self._derived:
+                    self._derived[key] = factory()
+        return self._derived[key]
+
+    def preload(self, filenames):
+        """Loads the given models now rather than on first use."""
+        for filename in filenames:
+            self.get(filename)
+
+    def describe(self):
+        return {
+            'generation': self.generation,
+            'models_dir': self.models_dir,
+            'created_at': self.created_at,
+            'models': dict(self.info),
+        }
+
+
+class ModelRegistry:
+    """
+    Holds the current ModelSet. swap() builds a new set and replaces the current one in a
+    single reference assignment, so requests already running keep the set they started with.
+
+    current() also swaps by itself when the pickles in the set's directory change (checked at
+    most every check_interval seconds; None turns this off), loading the preload filenames
+    first. Every process serving the app thus picks up retrained models without a restart.
+    """
+    def __init__(self, models_dir, loader, preload=(), check_interval=None):
+        self.models_dir = models_dir
+        self.loader = loader
+        self.preload = list(preload)
+        self.check_interval = check_interval
+        self._generation = 0
+        self._swap_lock = threading.Lock()
+        self._next_check = 0.0
+        self._current = ModelSet(models_dir, loader, self._generation)
+
+    def current(self):
+        """Returns the current set, first swapping in a new one if the pickles have changed."""
+        if self.check_interval is not None and time.monotonic() >= self._next_check:
+            self._next_check = time.monotonic() + self.check_interval
+            self._reload_if_changed()
+        return self._current
+
+    def _reload_if_changed(self):
+        current = self._current
+        if models_fingerprint(current.models_dir) == current.files_fingerprint:
+            return
+        logging.info(f"Models in {current.models_dir} changed on disk; reloading them.")
+        self.swap(current.models_dir, self.preload, replacing=current)
+
+    def fingerprint(self):
+        """Changes whenever the set is swapped or the pickles on disk change."""
+        current = self._current
+        return f"{current.fingerprint}:{models_fingerprint(current.models_dir)}"
+
+    def swap(self, models_dir=None, preload=(), replacing=None):
+        """
+        Loads a new model set (eagerly for the filenames in preload, lazily for the rest)
+        and makes it current. Returns the new set. With replacing, nothing is loaded if
+        another thread has already swapped that set out.
+        """
+        with self._swap_lock:
+            if replacing is not None and self._current is not replacing:
+                return self._current
+            self._generation += 1
+            new_set = ModelSet(models_dir or self.models_dir, self.loader, self._generation)
+            new_set.preload(preload)
+            self._current = new_set
+        logging.info(f"Model set swapped to generation {new_set.generation} from {new_set.models_dir}")
+        return new_set
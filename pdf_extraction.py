@@ -0,0 +1,312 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+from PyPDF2 import PdfReader
+
+from process_local import ProcessLocal
+
+# pdfminer.six is optional; when installed it re-extracts pages PyPDF2 reads poorly
+try:
+    from pdfminer.high_level import extract_text as pdfminer_extract_text
+except ImportError:
+    pdfminer_extract_text = None
+
+# A text-layer page whose extracted text has fewer visible characters than this, an average
+# "word" longer than this (spaces lost), or this share of unmapped glyphs counts as poor
+POOR_TEXT_MIN_CHARS = 20
+POOR_TEXT_MAX_WORD_LENGTH = 25
+POOR_TEXT_MAX_GARBLED = 0.1
+
+COPY_BLOCK_BYTES = 1024 * 1024
+
+# Times a document's tasks are resubmitted after another document's timeout replaced the pool
+POOL_RESUBMITS = 2
+
+# Form XObjects nested deeper than this are not inspected for fonts; such pages are extracted anyway
+MAX_FORM_DEPTH = 2
+
+
+class PdfExtractionTimeout(Exception):
+    """Raised when a PDF is not fully extracted within the service's wall-clock timeout."""
+
+
+class PdfHasNoTextLayer(ValueError):
+    """Raised for PDFs with no text on any page (scanned or image-only), before any page is parsed."""
+
+
+def is_poor_text(text):
+    """True if a page's extracted text looks empty, run together or garbled."""
+    visible = len(text) - sum(c.isspace() for c in text)
+    if visible < POOR_TEXT_MIN_CHARS:
+        return True
+    if visible / len(text.split()) > POOR_TEXT_MAX_WORD_LENGTH:
+        return True
+    garbled = text.count('\ufffd') + text.count('(cid:')
+    return garbled / visible > POOR_TEXT_MAX_GARBLED
+
+
+# --- Worker-side functions (run inside the process pool) ---
+
+# Each worker keeps the last opened document so consecutive pages skip re-parsing it
+_worker_reader = (None, None)
+
+def _open_reader(path):
+    global _worker_reader
+    if _worker_reader[0] != path:
+        _worker_reader = (path, PdfReader(path))
+    return _worker_reader[1]
+
+def _has_fonts(resources, depth=0):
+    """
+    True if a resource dictionary (or a form XObject inside it) declares a font, or if its
+    forms nest deeper than MAX_FORM_DEPTH, so a page is only skipped when it surely has no text.
+    """
+    resources = resources.get_object() if resources is not None else None
+    if not resources:
+        return False
+    if resources.get('/Font'):
+        return True
+    xobjects = resources.get('/XObject')
+    if xobjects is None:
+        return False
+    if depth >= MAX_FORM_DEPTH:
+        return True
+    for xobject in xobjects.get_object().values():
+        xobject = xobject.get_object()
+        if xobject.get('/Subtype') == '/Form' and _has_fonts(xobject.get('/Resources'), depth + 1):
+            return True
+    return False
+
+def _probe(path, max_pages):
+    """
+    Returns (page count, whether each of the first max_pages pages has a text layer).
+    Only the page dictionaries are read: a page without fonts has no text to extract.
+    """
+    pages = _open_reader(path).pages
+    return len(pages), [_has_fonts(pages[n].get('/Resources')) for n in range(min(len(pages), max_pages))]
+
+def _extract_page(path, page_number, fallback=True):
+    """Returns (page_number, text, whether pdfminer's text was used)."""
+    text = _open_reader(path).pages[page_number].extract_text() or ''
+    if fallback and pdfminer_extract_text is not None and is_poor_text(text):
+        try:
+            alternative = pdfminer_extract_text(path, page_numbers=[page_number]) or ''
+        except Exception as e:
+            logging.warning(f"pdfminer could not extract page {page_number}: {e}")
+        else:
+            if not is_poor_text(alternative) or len(alternative.strip()) > len(text.strip()):
+                return page_number, alternative, True
+    return page_number, text, False
+
+
+@contextmanager
+def _spooled_pdf(source):
+    """
+    Writes a PDF (bytes, or a binary file object copied in blocks) to a temporary file
+    so workers receive a path instead of the whole document. Yields (path, sha256 digest).
+    """
+    # The random prefix keeps paths unique, since workers cache readers by path
+    fd, path = tempfile.mkstemp(prefix=f'resume-{uuid.uuid4().hex}-', suffix='.pdf')
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if isinstance(source, (bytes, bytearray)):
+                digest.update(source)
+                f.write(source)
+            else:
+                for block in iter(lambda: source.read(COPY_BLOCK_BYTES), b''):
+                    digest.update(block)
+                    f.write(block)
+        yield path, digest.hexdigest()
+    finally:
+        os.remove(path)
+
+
+class PdfExtractionService:
+    """
+    Extracts PDF text on a shared process pool so parsing never runs in the request thread.
+
+    Extraction is tiered:
+      1. a probe reads only the page dictionaries; pages declaring no font have no text
+         layer and are skipped, and a PDF with none raises PdfHasNoTextLayer at once;
+      2. the remaining pages are extracted with PyPDF2 in parallel and yielded in page
+         order, so the first page is available as soon as it is done;
+      3. pages whose text looks poor are re-extracted with pdfminer, when installed.
+    Page texts are cached by document content (page_cache_pages pages, LRU), so the same
+    file uploaded again is not parsed again.
+
+    Each document gets a wall-clock timeout and a page cap. A timed-out document's workers
+    are stopped and the pool replaced; other documents in flight on it are resubmitted on the
+    new pool. Workers are started with start_method (forkserver where available, else spawn),
+    never forked from the server process and its threads. Each server process has its own pool.
+    on_page_count, if given, is called with each document's page count (before the cap).
+    """
+    def __init__(self, max_workers=None, timeout=15.0, max_pages=40, on_page_count=None, page_cache_pages=2048,
+                 fallback=True, start_method=None):
+        self.max_workers = max_workers or os.cpu_count() or 2
+        self.start_method = start_method or ('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods()
+                                             else 'spawn')
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.on_page_count = on_page_count
+        self.page_cache_pages = page_cache_pages
+        self.fallback = fallback
+        self.stats = {'documents': 0, 'pages': 0, 'truncated': 0, 'timeouts': 0, 'image_only': 0,
+                      'pages_without_text': 0, 'fallback_pages': 0, 'cached_pages': 0, 'resubmitted_tasks': 0}
+        self._executor = ProcessLocal(lambda: ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=multiprocessing.get_context(self.start_method)))
+        self._lock = threading.Lock()
+        self._probes = OrderedDict()      # document digest -> (page count, text layer per page)
+        self._page_cache = OrderedDict()  # (document digest, page number) -> text
+
+    def _discard_executor(self, executor):
+        """Drops a pool whose workers are stuck on a timed-out document."""
+        self._executor.discard(executor)
+        # A running task cannot be cancelled, so stop the worker processes directly. Every task
+        # still on this pool then fails with BrokenProcessPool, and _run_tasks resubmits it.
+        for process in list((getattr(executor, '_processes', None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False)
+
+    def _run_tasks(self, tasks, deadline):
+        """
+        Runs (function, *args) tasks on the pool, yielding their results as they complete.
+        Tasks lost because the pool was replaced meanwhile are resubmitted on the new one, up
+        to POOL_RESUBMITS times. At the deadline, the pool is discarded and TimeoutError raised.
+        """
+        pending = list(tasks)
+        for attempt in range(POOL_RESUBMITS + 1):
+            executor = self._executor.get()
+            futures = {}
+            try:
+                for task in pending:
+                    futures[executor.submit(*task)] = task
+            except (BrokenProcessPool, RuntimeError):
+                pass  # The pool was replaced while submitting; the tasks left out are retried
+            try:
+                for future in as_completed(futures, timeout=max(deadline - time.monotonic(), 0)):
+                    try:
+                        result = future.result()
+                    except (BrokenProcessPool, CancelledError):
+                        continue
+                    pending.remove(futures[future])
+                    yield result
+            except TimeoutError:
+                self._discard_executor(executor)
+                raise
+            finally:
+                for future in futures:
+                    future.cancel()
+            if not pending:
+                return
+            self._count('resubmitted_tasks', len(pending))
+            # Replaces the broken pool, unless another document already has
+            self._discard_executor(executor)
+        raise BrokenProcessPool(f"PDF extraction workers failed {POOL_RESUBMITS + 1} times")
+
+    def _count(self, stat, amount=1):
+        with self._lock:
+            self.stats[stat] += amount
+
+    def _cached(self, cache, key):
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _remember(self, cache, key, value):
+        with self._lock:
+            cache[key] = value
+            while len(cache) > self.page_cache_pages:
+                cache.popitem(last=False)
+
+    def clear(self):
+        """Empties the page text cache."""
+        with self._lock:
+            self._probes.clear()
+            self._page_cache.clear()
+
+    def iter_pages(self, source):
+        """
+        Yields (page_number, text) for each page of a PDF in page order, each as soon as it
+        and the pages before it are done. Pages without a text layer give ''.
+        source is the PDF's bytes or a binary file object positioned at its start.
+        """
+        deadline = time.monotonic() + self.timeout
+        with _spooled_pdf(source) as (path, digest):
+            try:
+                probe = self._cached(self._probes, digest)
+                if probe is None:
+                    [probe] = self._run_tasks([(_probe, path, self.max_pages)], deadline)
+                    self._remember(self._probes, digest, probe)
+                page_count, text_layers = probe
+                self._count('documents')
+                self._count('pages', page_count)
+                if self.on_page_count:
+                    self.on_page_count(page_count)
+                if page_count > self.max_pages:
+                    self._count('truncated')
+                    logging.warning(f"PDF has {page_count} pages; only the first {self.max_pages} are extracted.")
+                if page_count and not any(text_layers):
+                    self._count('image_only')
+                    raise PdfHasNoTextLayer("This PDF has no text layer (it looks scanned or image-only). "
+                                            "Please upload a text-based PDF or a TXT file.")
+
+                done = {}
+                for n, has_text in enumerate(text_layers):
+                    text = self._cached(self._page_cache, (digest, n)) if has_text else ''
+                    if text is not None:
+                        done[n] = text
+                        self._count('cached_pages' if has_text else 'pages_without_text')
+                tasks = [(_extract_page, path, n, self.fallback) for n in range(len(text_layers)) if n not in done]
+
+                next_page = 0
+                while next_page in done:
+                    yield next_page, done.pop(next_page)
+                    next_page += 1
+                for n, text, used_fallback in self._run_tasks(tasks, deadline):
+                    self._remember(self._page_cache, (digest, n), text)
+                    if used_fallback:
+                        self._count('fallback_pages')
+                    done[n] = text
+                    while next_page in done:
+                        yield next_page, done.pop(next_page)
+                        next_page += 1
+            except TimeoutError:
+                self._count('timeouts')
+                raise PdfExtractionTimeout(f"PDF extraction exceeded {self.timeout} seconds")
+
+    def extract_pages(self, source):
+        """Returns the text of each page of a PDF, in page order ('' for pages without a text layer)."""
+        return [text for _, text in self.iter_pages(source)]
+
+    def extract_text(self, source):
+        """Extracts the full text of a PDF (bytes or a file object), joining pages in document order."""
+        return ' '.join(self.extract_pages(source))
+
+    def extract_many(self, documents):
+        """
+        Extracts several PDFs concurrently. Returns one entry per document, in order:
+        the text, or the exception raised while extracting it.
+        """
+        def extract(source):
+            try:
+                return self.extract_text(source)
+            except Exception as e:
+                return e
+
+        if not documents:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(documents), self.max_workers)) as threads:
+            return list(threads.map(extract, documents))
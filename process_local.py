@@ -0,0 +1,38 @@
+import os
+import sqlite3
+import threading
+
+
+class ProcessLocal:
+    """
+    Holds one object per process: factory() creates it on first use, and again on first use
+    in a forked child, so pre-forked server workers never share their parent's SQLite
+    connection, executor or threads (none of which survive a fork).
+    """
+    def __init__(self, factory):
+        self.factory = factory
+        self._value = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Returns this process's object, creating it if needed."""
+        with self._lock:
+            if self._value is None or self._pid != os.getpid():
+                self._value = self.factory()
+                self._pid = os.getpid()
+            return self._value
+
+    def discard(self, value):
+        """Forgets value if it is still the current object, so the next get() creates a new one."""
+        with self._lock:
+            if self._value is value:
+                self._value = None
+
+
+def connect_sqlite(path, schema):
+    """Opens a SQLite connection usable from any thread, running schema (a CREATE TABLE IF NOT EXISTS)."""
+    db = sqlite3.connect(path, check_same_thread=False)
+    db.execute(schema)
+    db.commit()
+    return db
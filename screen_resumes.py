@@ -0,0 +1,125 @@
+"""
+Command-line bulk screening. Analyzes a directory of PDF/TXT/ZIP resumes, or a CSV shaped
+like UpdatedResumeDataSet.csv, with batched model calls and writes JSON or CSV results.
+
+Examples (run from the repository root so the models directory is found):
+    python screen_resumes.py resumes/ --format csv --output results.csv
+    python screen_resumes.py UpdatedResumeDataSet.csv --limit 200
+    python screen_resumes.py resumes/ --jd job_description.txt --format csv --output ranked.csv
+
+Screened resumes are not saved to the candidate store unless --save-candidates is given
+(candidates.py import is the usual way to fill it).
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+from contextlib import ExitStack
+
+import app
+from app import analyze_documents, read_resume_documents, results_to_csv
+from streaming_ingest import ArchiveTooLarge
+
+# Keeps memory bounded on very large inputs; each chunk is still one transform/predict per model
+DEFAULT_BATCH_SIZE = 500
+
+
+def documents_from_directory(path, batch_size=DEFAULT_BATCH_SIZE, job_description=None):
+    """
+    Yields a document dict for every PDF/TXT/ZIP file in a directory (sorted by name).
+    Files are read a chunk at a time so the PDFs of each chunk are extracted concurrently.
+    They are streamed from disk rather than loaded into memory.
+    """
+    filenames = sorted(f for f in os.listdir(path) if f.endswith(('.pdf', '.txt', '.zip')))
+    for chunk in chunked(filenames, batch_size):
+        with ExitStack() as files:
+            named_files = [(filename, files.enter_context(open(os.path.join(path, filename), 'rb')))
+                           for filename in chunk]
+            try:
+                documents = read_resume_documents(named_files, job_description)
+            except ArchiveTooLarge:
+                # Read the chunk again file by file, so only the rejected archive is reported
+                documents = [document for filename, file in named_files
+                             for document in read_file_documents(filename, file, job_description)]
+        yield from documents
+
+
+def read_file_documents(filename, file, job_description=None):
+    """Document dicts of one file, with an over-limit ZIP archive reported as an error."""
+    file.seek(0)
+    try:
+        return read_resume_documents([(filename, file)], job_description)
+    except ArchiveTooLarge as e:
+        return [{'source': filename, 'error': str(e)}]
+
+
+def documents_from_csv(path, text_column='Resume'):
+    """Yields a document dict for every row of a resume CSV."""
+    csv.field_size_limit(sys.maxsize)
+    with open(path, encoding='utf-8') as f:
+        for row_number, row in enumerate(csv.DictReader(f), start=1):
+            text = row.get(text_column) or ''
+            if text:
+                yield {'source': f"row {row_number}", 'text': text}
+            else:
+                yield {'source': f"row {row_number}", 'error': "Empty resume text."}
+
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen many resumes with batched model predictions.")
+    parser.add_argument('input', help="Directory of PDF/TXT resumes, or a CSV file with a resume text column")
+    parser.add_argument('--format', choices=['json', 'csv'], default='json', help="Output format (default: json)")
+    parser.add_argument('--output', help="Output file (default: stdout)")
+    parser.add_argument('--text-column', default='Resume', help="CSV column holding the resume text (default: Resume)")
+    parser.add_argument('--limit', type=int, help="Only screen the first N resumes")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Resumes per model call")
+    parser.add_argument('--jd', help="File holding a job description to score every resume against")
+    parser.add_argument('--save-candidates', action='store_true',
+                        help="Also save the analyzed resumes to the candidate store (CANDIDATE_STORE_DB)")
+    args = parser.parse_args(argv)
+    if args.save_candidates and app.candidate_store is None:
+        parser.error("--save-candidates needs CANDIDATE_STORE_DB set to the candidate store's path")
+
+    job_description = None
+    if args.jd:
+        with open(args.jd, encoding='utf-8') as f:
+            job_description = f.read()
+
+    if os.path.isdir(args.input):
+        documents = documents_from_directory(args.input, args.batch_size, job_description)
+    elif args.input.endswith('.csv'):
+        documents = documents_from_csv(args.input, args.text_column)
+    else:
+        parser.error("input must be a directory or a .csv file")
+
+    documents = itertools.islice(documents, args.limit)
+    results = [result for chunk in chunked(documents, args.batch_size)
+               for result in analyze_documents(chunk, job_description=job_description, save_candidates=args.save_candidates)]
+
+    if args.format == 'csv':
+        output = results_to_csv(results)
+    else:
+        output = json.dumps({'results': results}, indent=2)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+import codecs
+import tempfile
+import time
+
+from flask import Request
+
+# Bytes read from an upload at a time while hashing, copying or decoding it
+READ_BLOCK_BYTES = 64 * 1024
+
+
+class SpooledRequest(Request):
+    """
+    Flask request whose file uploads are kept in memory only up to spool_threshold bytes
+    and roll over to a temporary file on disk beyond it (Werkzeug's fixed limit is 500 KB).
+    """
+    spool_threshold = 1024 * 1024
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=self.spool_threshold, mode='rb+')
+
+
+class FileTooLarge(ValueError):
+    """Raised when an uploaded file (or an archive member) exceeds the configured size limit."""
+    def __init__(self, max_bytes):
+        super().__init__(f"File is too large. The maximum size is {format_size(max_bytes)}.")
+
+
+class ArchiveTooLarge(ValueError):
+    """Raised when a ZIP archive has too many members or decompresses to too many bytes."""
+
+
+def format_size(num_bytes):
+    if num_bytes >= 1024 * 1024:
+        return f"{num_bytes / (1024 * 1024):g} MB"
+    return f"{num_bytes / 1024:g} KB"
+
+
+def file_size(file):
+    """Size of a seekable file object in bytes. Leaves the position at the start."""
+    file.seek(0, 2)
+    size = file.tell()
+    file.seek(0)
+    return size
+
+
+def check_file_size(file, max_bytes):
+    """Raises FileTooLarge if a seekable file object holds more than max_bytes."""
+    if max_bytes is not None and file_size(file) > max_bytes:
+        raise FileTooLarge(max_bytes)
+
+
+def spool_stream(stream, max_bytes=None, spool_threshold=SpooledRequest.spool_threshold):
+    """
+    Copies a stream into a SpooledTemporaryFile, block by block, and rewinds it.
+    Stops with FileTooLarge as soon as more than max_bytes have been read.
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=spool_threshold, mode='w+b')
+    copied = 0
+    for block in iter(lambda: stream.read(READ_BLOCK_BYTES), b''):
+        copied += len(block)
+        if max_bytes is not None and copied > max_bytes:
+            spooled.close()
+            raise FileTooLarge(max_bytes)
+        spooled.write(block)
+    spooled.seek(0)
+    return spooled
+
+
+def iter_decoded_chunks(file, encoding='utf-8', block_bytes=READ_BLOCK_BYTES):
+    """
+    Decodes a binary file object incrementally, yielding str chunks. Multi-byte characters
+    split across blocks are handled by the incremental decoder. Raises UnicodeDecodeError.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for block in iter(lambda: file.read(block_bytes), b''):
+        chunk = decoder.decode(block)
+        if chunk:
+            yield chunk
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def iter_text_chunks(text, chunk_chars):
+    """Yields consecutive slices of at most chunk_chars characters of text."""
+    for start in range(0, len(text), chunk_chars):
+        yield text[start:start + chunk_chars]
+
+
+class ChunkedTextScanner:
+    """
+    Runs first-match regexes and KeywordMatchers over text that arrives in chunks, giving
+    the same results as running them on the whole text.
+
+    Each extractor keeps a buffer of the current chunk plus the last `overlap` characters
+    of the previous one. Only match positions that are at least `overlap` characters before
+    the end of the buffer are settled: a match there has all the context it needs (its
+    preceding character for \\b, and up to `overlap` characters after its start). Later
+    positions are carried into the next buffer and scanned again with more text.
+
+    KeywordMatchers see the lowercased stream (as extract_skills/extract_education do);
+    their overlap is raised to cover the longest keyword. Regex matches longer than the
+    overlap could be cut short, so it should exceed any realistic phone number or email.
+    timings accumulates the seconds spent in each named extractor.
+    """
+    def __init__(self, patterns=None, matchers=None, overlap=512):
+        self.overlap = overlap
+        self.matches = {name: None for name in (patterns or {})}
+        self.keywords = {name: set() for name in (matchers or {})}
+        self.timings = {name: 0.0 for name in list(patterns or {}) + list(matchers or {})}
+
+        self._patterns = dict(patterns or {})
+        self._matchers = dict(matchers or {})
+        self._matcher_overlap = max([overlap] + [max(map(len, m.keywords), default=0) + 2
+                                                 for m in self._matchers.values()])
+        # Buffer and first unsettled position, one for the original and one for the lowercased stream
+        self._text = ['', 0]
+        self._lower = ['', 0]
+
+    def feed(self, chunk):
+        """Scans the next chunk of text."""
+        if self._patterns:
+            self._scan_patterns(self._advance(self._text, chunk, self.overlap))
+        if self._matchers:
+            self._scan_matchers(self._advance(self._lower, chunk.lower(), self._matcher_overlap))
+
+    def close(self):
+        """Scans what is left once the text has ended."""
+        if self._patterns:
+            self._scan_patterns(self._advance(self._text, '', 0))
+        if self._matchers:
+            self._scan_matchers(self._advance(self._lower, '', 0))
+        return self
+
+    @staticmethod
+    def _advance(state, chunk, overlap):
+        """
+        Appends chunk to a stream's buffer. Returns (buffer, start, limit): positions in
+        [start, limit) are settled and get scanned now. The buffer then keeps text from
+        limit onwards, plus one character of lookbehind context.
+        """
+        buffer = state[0] + chunk
+        start = state[1]
+        limit = len(buffer) - overlap
+        if limit <= start:
+            state[0] = buffer
+            return buffer, start, start
+        state[0] = buffer[limit - 1:]
+        state[1] = 1
+        return buffer, start, limit
+
+    def _scan_patterns(self, region):
+        buffer, start, limit = region
+        for name, pattern in self._patterns.items():
+            if self.matches[name] is None:
+                started = time.perf_counter()
+                match = pattern.search(buffer, start)
+                if match and match.start() < limit:
+                    self.matches[name] = match.group()
+                self.timings[name] += time.perf_counter() - started
+
+    def _scan_matchers(self, region):
+        buffer, start, limit = region
+        for name, matcher in self._matchers.items():
+            started = time.perf_counter()
+            self.keywords[name].update(matcher.find_indices(buffer, start, limit))
+            self.timings[name] += time.perf_counter() - started
+
+    def found_keywords(self, name):
+        """Keywords found by the named matcher, in list order."""
+        matcher = self._matchers[name]
+        return [matcher.keywords[i] for i in sorted(self.keywords[name])]
@@ -0,0 +1,31 @@
+import csv
+import os
+import random
+import sys
+
+import pytest
+
+# Keep test resumes out of the real candidate store (must be set before app is imported)
+os.environ.setdefault('CANDIDATE_STORE_DB', '')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RESUME_SAMPLES = 8  # Dataset resumes (and as many synthetic texts) in resume_texts
+
+FILLER = ['Experience', 'with', 'python,', 'Java', 'and', 'Machine Learning.', 'Bachelor of Science',
+          'B.Tech', 'AWS Certified', 'CCNA', 'sql', 'C++', 'Node.js', '\n', 'ph', 'contact:', '-', '(',
+          'r.sharma@example.com', '+91 98765 43210', '555-123-4567', 'Data Science', 'M.B.A']
+
+
+@pytest.fixture(scope='session')
+def resume_texts():
+    """Resumes from the dataset, plus texts packed with keywords, emails and phone numbers."""
+    csv.field_size_limit(sys.maxsize)
+    with open(os.path.join(ROOT, 'UpdatedResumeDataSet.csv'), encoding='utf-8') as f:
+        resumes = [row['Resume'] for row in csv.DictReader(f)]
+    rng = random.Random(0)
+    texts = rng.sample(resumes, RESUME_SAMPLES)
+    # Dense enough that many matches straddle chunk boundaries
+    texts += [' '.join(rng.choice(FILLER) for _ in range(400)) for _ in range(RESUME_SAMPLES)]
+    return texts
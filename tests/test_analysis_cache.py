@@ -0,0 +1,98 @@
+import os
+import pickle
+import sqlite3
+import types
+
+import pytest
+
+import analysis_cache
+from analysis_cache import AnalysisCache
+from model_registry import ModelRegistry
+
+RESULT = {'predicted_category': 'Data Science', 'extracted_skills': ['Python', 'SQL'], 'ats_score': 8}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the cache's wall clock with one the test moves by hand."""
+    clock = types.SimpleNamespace(now=1_000_000.0)
+    monkeypatch.setattr(analysis_cache, 'time', types.SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def rows(db_path):
+    with sqlite3.connect(db_path) as db:
+        return db.execute("SELECT key, fingerprint FROM analysis_cache ORDER BY key").fetchall()
+
+
+def test_changed_pickle_invalidates_entries(tmp_path):
+    models_dir = tmp_path / 'models'
+    models_dir.mkdir()
+    model = models_dir / 'model.pkl'
+    model.write_bytes(pickle.dumps('model'))
+    registry = ModelRegistry(str(models_dir), lambda filename, directory: None)
+    db_path = str(tmp_path / 'cache.db')
+    cache = AnalysisCache(registry.fingerprint, db_path=db_path)
+
+    cache.put('resume', RESULT)
+    assert cache.get('resume') == RESULT
+    assert cache.snapshot()['invalidations'] == 0
+
+    stat = os.stat(model)
+    os.utime(model, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.get('resume') is None
+    assert cache.snapshot()['invalidations'] == 1
+    assert cache.snapshot()['entries'] == 0
+    assert rows(db_path) == []
+
+
+def test_ttl_expiry(clock):
+    cache = AnalysisCache(lambda: 'v1', ttl_seconds=60)
+    cache.put('resume', RESULT)
+    clock.now += 60
+    assert cache.get('resume') == RESULT
+    clock.now += 1
+    assert cache.get('resume') is None
+    assert cache.snapshot() == dict(memory_hits=1, disk_hits=0, misses=1, evictions=0, invalidations=0, entries=0)
+
+
+def test_lru_eviction():
+    cache = AnalysisCache(lambda: 'v1', max_entries=2)
+    cache.put('a', {'n': 1})
+    cache.put('b', {'n': 2})
+    assert cache.get('a') == {'n': 1}  # b is now the least recently used
+    cache.put('c', {'n': 3})
+    assert cache.get('b') is None
+    assert cache.get('a') == {'n': 1} and cache.get('c') == {'n': 3}
+    assert cache.snapshot()['evictions'] == 1
+    assert cache.snapshot()['entries'] == 2
+
+
+def test_disk_tier_is_shared(tmp_path, clock):
+    db_path = str(tmp_path / 'cache.db')
+    AnalysisCache(lambda: 'v1', db_path=db_path, ttl_seconds=60).put('resume', RESULT)
+
+    # As another worker or a restarted server: served from disk, then from memory
+    cache = AnalysisCache(lambda: 'v1', db_path=db_path, ttl_seconds=60)
+    assert cache.get('resume') == RESULT
+    assert cache.get('resume') == RESULT
+    assert cache.snapshot()['disk_hits'] == 1
+    assert cache.snapshot()['memory_hits'] == 1
+
+    clock.now += 61
+    assert AnalysisCache(lambda: 'v1', db_path=db_path, ttl_seconds=60).get('resume') is None
+
+
+def test_disk_tier_drops_other_fingerprints(tmp_path):
+    db_path = str(tmp_path / 'cache.db')
+    old = AnalysisCache(lambda: 'v1', db_path=db_path)
+    old.put('a', RESULT)
+    old.put('b', RESULT)
+    assert rows(db_path) == [('a', 'v1'), ('b', 'v1')]
+
+    new = AnalysisCache(lambda: 'v2', db_path=db_path)
+    assert new.get('a') is None
+    assert rows(db_path) == []
+    new.put('c', RESULT)
+    assert rows(db_path) == [('c', 'v2')]
+    assert new.snapshot()['disk_hits'] == 0
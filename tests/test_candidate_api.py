@@ -0,0 +1,58 @@
+import io
+
+import pytest
+
+import app
+from candidate_store import CandidateStore
+
+RESUME = b"Aarav Sharma\naarav.sharma@example.com\n+91 98765 43210\nPython developer with SQL and Docker experience."
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    store = CandidateStore(str(tmp_path / 'candidates.db'), app.candidate_vector_space, app.skill_vocabulary,
+                           app.education_vocabulary)
+    monkeypatch.setattr(app, 'candidate_store', store)
+    # A cached analysis is not saved again
+    app.analysis_cache.clear()
+    client = app.app.test_client()
+    response = client.post('/pred', data={'resume': (io.BytesIO(RESUME), 'resume.txt')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 200
+    assert store.snapshot()['candidates'] == 1
+    return client
+
+
+def search(client, headers=None):
+    return client.post('/candidates/search', json={'skills': ['Python']}, headers=headers or {})
+
+
+def test_endpoints_are_off_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(app, 'ADMIN_API_TOKEN', '')
+    assert search(client, {'Authorization': 'Bearer '}).status_code == 404
+    assert client.get('/candidates/stats').status_code == 404
+    assert client.get('/candidates/skills').status_code == 404
+
+
+@pytest.mark.parametrize('authorization', [None, 'Bearer wrong', 'secret', 'Bearer secret2'])
+def test_endpoints_require_the_token(client, monkeypatch, authorization):
+    monkeypatch.setattr(app, 'ADMIN_API_TOKEN', 'secret')
+    headers = {'Authorization': authorization} if authorization else {}
+    response = search(client, headers)
+    assert response.status_code == 401
+    assert b'example.com' not in response.data
+    assert client.get('/candidates/stats', headers=headers).status_code == 401
+
+
+def test_search_with_the_token(client, monkeypatch):
+    monkeypatch.setattr(app, 'ADMIN_API_TOKEN', 'secret')
+    headers = {'Authorization': 'Bearer secret'}
+    response = search(client, headers)
+    assert response.status_code == 200
+    assert response.get_json()['results'][0]['email'] == 'aarav.sharma@example.com'
+    assert client.get('/candidates/stats', headers=headers).get_json()['candidates'] == 1
+
+
+def test_store_is_off_by_default():
+    # conftest.py leaves CANDIDATE_STORE_DB empty, as a server without it set
+    assert app.candidate_store is None
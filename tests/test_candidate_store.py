@@ -0,0 +1,151 @@
+import random
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+import candidate_store
+from candidate_store import CandidateStore
+from keyword_bitsets import KeywordVocabulary
+
+SKILLS = ['Python', 'Java', 'SQL', 'C++', 'Machine Learning', 'Docker', 'Kubernetes', 'React', 'Excel', 'Tableau',
+          'AWS', 'Azure', 'Spark', 'Hadoop', 'Git', 'Linux', 'TensorFlow', 'Pandas', 'Django', 'Flask']
+EDUCATION = ['Bachelor', 'Master', 'PhD', 'MBA', 'B.Tech']
+CATEGORIES = ['Data Science', 'Java Developer', 'HR', 'Testing']
+DIMENSION = 40
+
+
+def make_candidates(rng, count, start=0):
+    candidates = []
+    for n in range(start, start + count):
+        candidates.append({
+            'key': f'resume-{n}', 'source': f'{n}.txt', 'name': f'Candidate {n}', 'email': 'N/A', 'phone': 'N/A',
+            'predicted_category': rng.choice(CATEGORIES), 'recommended_job': 'Engineer',
+            'extracted_skills': rng.sample(SKILLS, rng.randint(0, 8)),
+            'extracted_education': rng.sample(EDUCATION, rng.randint(0, 2)), 'ats_score': rng.randint(0, 100),
+        })
+    return candidates
+
+
+def make_vectors(seed, count):
+    vectors = sp.random(count, DIMENSION, density=0.2, format='csr', dtype=np.float32, random_state=seed)
+    norms = np.sqrt(vectors.multiply(vectors).sum(axis=1)).A1
+    norms[norms == 0] = 1
+    return sp.csr_matrix(vectors.multiply(1 / norms[:, None]), dtype=np.float32)
+
+
+def brute_force(candidates, vectors, query, skills=(), required_skills=(), required_education=(), category=None,
+                skill_weight=0.3):
+    """Score of every candidate passing the filters, computed one candidate at a time."""
+    skills = list(dict.fromkeys(skill.lower() for skill in skills))
+    scores = {}
+    for n, candidate in enumerate(candidates):
+        have_skills = {skill.lower() for skill in candidate['extracted_skills']}
+        have_education = {keyword.lower() for keyword in candidate['extracted_education']}
+        if not all(skill.lower() in have_skills for skill in required_skills):
+            continue
+        if not all(keyword.lower() in have_education for keyword in required_education):
+            continue
+        if category and candidate['predicted_category'] != category:
+            continue
+        share = sum(skill in have_skills for skill in skills) / len(skills) if skills else 0.0
+        if query is None:
+            scores[candidate['key']] = share
+            continue
+        similarity = float(vectors[n].toarray().ravel() @ query.toarray().ravel()) / np.linalg.norm(query.toarray())
+        scores[candidate['key']] = (1 - skill_weight) * similarity + skill_weight * share if skills else similarity
+    return scores
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # Small enough that the pool below spans the merged matrix and the recent rows
+    monkeypatch.setattr(candidate_store, 'MERGE_ROWS', 64)
+    return CandidateStore(str(tmp_path / 'candidates.db'), lambda: ('v1', DIMENSION),
+                          KeywordVocabulary(SKILLS), KeywordVocabulary(EDUCATION))
+
+
+@pytest.fixture
+def pool(store):
+    rng = random.Random(0)
+    candidates, vectors = [], []
+    # Added in batches with searches in between, so the index is refreshed incrementally
+    for batch, count in enumerate([50, 100, 30]):
+        batch_candidates = make_candidates(rng, count, len(candidates))
+        batch_vectors = make_vectors(batch, count)
+        assert store.add_many(batch_candidates, batch_vectors, 'v1') == count
+        store.search(skills=['Python'])
+        candidates += batch_candidates
+        vectors.append(batch_vectors)
+    return candidates, sp.vstack(vectors, format='csr')
+
+
+def check_ranking(store, candidates, vectors, query, limit=10, **options):
+    expected = brute_force(candidates, vectors, query, **options)
+    total, results = store.search(query, 'v1' if query is not None else None, limit=limit, **options)
+    assert total == len(expected)
+    assert len(results) == min(limit, len(expected))
+
+    scores = [result['score'] for result in results]
+    assert scores == sorted(scores, reverse=True)
+    for result in results:
+        candidate = candidates[int(result['source'].split('.')[0])]
+        assert result['score'] == pytest.approx(expected[candidate['key']], abs=1e-4)
+        assert result['extracted_skills'] == candidate['extracted_skills']
+    # Nothing left out scores higher than the last result returned
+    if results:
+        returned = {candidates[int(result['source'].split('.')[0])]['key'] for result in results}
+        assert all(score <= scores[-1] + 1e-4 for key, score in expected.items() if key not in returned)
+
+
+def test_ranking_matches_brute_force(store, pool):
+    candidates, vectors = pool
+    rng = random.Random(1)
+    for seed in range(10):
+        query = make_vectors(100 + seed, 1) * 3  # Queries need not be unit length
+        skills = rng.sample(SKILLS, rng.randint(0, 5))
+        check_ranking(store, candidates, vectors, query, skills=skills)
+        check_ranking(store, candidates, vectors, None, skills=skills or ['SQL'])
+        check_ranking(store, candidates, vectors, query, skills=skills, required_skills=rng.sample(SKILLS, 1),
+                      limit=5)
+        check_ranking(store, candidates, vectors, query, required_education=['bachelor'],
+                      category=rng.choice(CATEGORIES), limit=500)
+
+
+def test_matched_and_missing_skills(store, pool):
+    candidates, _ = pool
+    _, results = store.search(skills=['python', 'SQL', 'Rust'], limit=50)
+    for result in results:
+        have = {skill.lower() for skill in result['extracted_skills']}
+        assert sorted(skill.lower() for skill in result['matched_skills']) == sorted(have & {'python', 'sql'})
+        assert result['missing_skills'] == [skill for skill in ['Python', 'SQL'] if skill.lower() not in have]
+
+
+def test_unknown_filters_match_nothing(store, pool):
+    assert store.search(skills=['Python'], required_skills=['COBOL']) == (0, [])
+    assert store.search(skills=['Python'], category='Astronaut') == (0, [])
+
+
+def test_other_vector_versions_get_no_similarity(tmp_path):
+    vocabulary = KeywordVocabulary(SKILLS)
+    store = CandidateStore(str(tmp_path / 'candidates.db'), lambda: ('v2', DIMENSION), vocabulary,
+                           KeywordVocabulary(EDUCATION))
+    candidates = make_candidates(random.Random(2), 5)
+    store.add_many(candidates, make_vectors(3, 5), 'v1')
+    total, results = store.search(make_vectors(4, 1), 'v2', skills=['Python'])
+    assert total == 5
+    assert all(result['similarity'] == 0 for result in results)
+    assert store.snapshot()['with_vectors'] == 0
+
+
+def test_duplicate_keys_are_ignored(store):
+    candidates = make_candidates(random.Random(3), 3)
+    assert store.add_many(candidates, make_vectors(5, 3), 'v1') == 3
+    assert store.add_many(candidates, make_vectors(5, 3), 'v1') == 0
+    assert store.snapshot()['candidates'] == 3
+
+
+@pytest.mark.parametrize('limit', [0, -1, 2.5, '10', True, None])
+def test_invalid_limit(store, limit):
+    with pytest.raises(ValueError):
+        store.search(skills=['Python'], limit=limit)
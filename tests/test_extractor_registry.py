@@ -0,0 +1,62 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app
+from extractor_registry import ExtractorRegistry
+from process_local import ProcessLocal
+
+
+def test_parallel_run_matches_sequential_run(resume_texts, monkeypatch):
+    registry = app.extractors
+    monkeypatch.setattr(registry, 'max_workers', 4)
+    monkeypatch.setattr(registry, '_executor', ProcessLocal(lambda: ThreadPoolExecutor(max_workers=4)))
+    for text in resume_texts:
+        sequential = registry.run(text, parallel=False)
+        parallel = registry.run(text, parallel=True)
+        assert parallel.values == sequential.values
+        assert list(parallel.values) == registry.fields
+        assert set(parallel.timings) == set(sequential.timings) == set(registry.extractors)
+
+
+@pytest.mark.parametrize('chunk_chars', [64, 4096])
+def test_run_matches_extract_functions(resume_texts, monkeypatch, chunk_chars):
+    monkeypatch.setattr(app.extractors, 'chunk_chars', chunk_chars)
+    for text in resume_texts:
+        values = app.extractors.run(text, parallel=False).values
+        assert values['name'] == app.extract_name_from_resume(text)
+        assert values['phone'] == app.extract_contact_number_from_resume(text)
+        assert values['email'] == app.extract_email_from_resume(text)
+        assert sorted(values['extracted_skills']) == sorted(app.extract_skills_from_resume(text))
+        assert sorted(values['extracted_education']) == sorted(app.extract_education_from_resume(text))
+        assert values['years_of_experience'] == app.extract_years_of_experience(text)
+        assert values['certifications'] == app.certification_matcher.find(text.lower())
+
+
+def test_without_workers_parallel_runs_sequentially():
+    registry = ExtractorRegistry(max_workers=0)
+    threads = []
+    registry.add_function('thread', lambda text: threads.append(threading.current_thread()) or text)
+    assert registry.run('Python developer', parallel=True).values == {'thread': 'Python developer'}
+    assert threads == [threading.current_thread()]
+
+
+def test_workers_run_extractors_on_the_pool():
+    registry = ExtractorRegistry(max_workers=2)
+    registry.add_function('thread', lambda text: threading.current_thread().name)
+    assert registry.run('text').values['thread'].startswith('extractor')
+    assert registry.run('text', parallel=False).values['thread'] == threading.current_thread().name
+
+
+def test_registration():
+    registry = ExtractorRegistry()
+    registry.add_pattern('email', r'\S+@\S+', transform=str.lower, default='N/A')
+    registry.add_function('head', lambda text: text, field='first_chars', head_chars=5)
+    with pytest.raises(ValueError):
+        registry.add_function('email', len)
+    assert registry.fields == ['email', 'first_chars']
+
+    extraction = registry.run('Contact: R.Sharma@Example.com')
+    assert extraction.values == {'email': 'r.sharma@example.com', 'first_chars': 'Conta'}
+    assert registry.run('No contact details').values['email'] == 'N/A'
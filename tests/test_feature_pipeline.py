@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+import app
+from feature_pipeline import FeaturePipeline, StageTimer
+
+
+def assert_same_features(features, vectorizer, clean_texts):
+    expected = vectorizer.transform(clean_texts)
+    assert features.dtype == expected.dtype
+    assert features.shape == expected.shape
+    tolerance = 1e-6 if expected.dtype == np.float32 else 1e-12
+    np.testing.assert_allclose(features.toarray(), expected.toarray(), rtol=tolerance, atol=tolerance)
+    assert features.nnz == expected.nnz
+
+
+def test_shipped_vectorizers(resume_texts):
+    models = app.model_registry.current()
+    vectorizers = {'categorization': models.get(app.CATEGORIZATION_VECTORIZER),
+                   'job_recommendation': models.get(app.JOB_RECOMMENDATION_VECTORIZER)}
+    if not all(isinstance(vectorizer, TfidfVectorizer) for vectorizer in vectorizers.values()):
+        pytest.skip("The shipped vectorizers are not in models/")
+
+    timer = StageTimer()
+    clean_texts, features = FeaturePipeline(app.cleanResume, vectorizers).run(resume_texts, timer)
+    assert clean_texts == [app.cleanResume(text) for text in resume_texts]
+    assert set(timer.timings) == {'clean', 'vectorize'}
+    for name, vectorizer in vectorizers.items():
+        assert_same_features(features[name], vectorizer, clean_texts)
+
+
+@pytest.mark.parametrize('params', [
+    {'dtype': np.float32, 'sublinear_tf': True},
+    {'dtype': np.float32, 'sublinear_tf': True, 'stop_words': 'english', 'max_features': 500},
+    {'binary': True, 'norm': 'l1'},
+    {'use_idf': False, 'ngram_range': (1, 2)},
+    {'smooth_idf': False, 'norm': None, 'min_df': 2},
+])
+def test_fitted_vectorizers(resume_texts, params):
+    clean_texts = [app.cleanResume(text) for text in resume_texts]
+    fitted = TfidfVectorizer(**params).fit(clean_texts[::2])
+    # Same tokenization, another vocabulary: both share one token group
+    default = TfidfVectorizer(**dict(params, max_features=None, min_df=1)).fit(clean_texts[1::2])
+    pipeline = FeaturePipeline(app.cleanResume, {'fitted': fitted, 'default': default})
+    assert len(pipeline.groups) == 1
+
+    _, features = pipeline.run(resume_texts)
+    assert_same_features(features['fitted'], fitted, clean_texts)
+    assert_same_features(features['default'], default, clean_texts)
+
+
+def test_vectorizers_with_other_tokenization(resume_texts):
+    clean_texts = [app.cleanResume(text) for text in resume_texts]
+    words = TfidfVectorizer(dtype=np.float32, sublinear_tf=True).fit(clean_texts)
+    characters = TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 3)).fit(clean_texts)
+    pipeline = FeaturePipeline(app.cleanResume, {'words': words, 'characters': characters,
+                                                 'mock': app.MockVectorizer()})
+    assert len(pipeline.groups) == 2
+
+    _, features = pipeline.run(resume_texts)
+    assert set(features) == {'words', 'characters'}
+    assert_same_features(features['words'], words, clean_texts)
+    assert_same_features(features['characters'], characters, clean_texts)
+    assert pipeline.run([]) == ([], {})
@@ -0,0 +1,177 @@
+import math
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+import app
+from jd_matching import JobMatcher, skill_weights
+from keyword_matcher import KeywordMatcher
+from model_registry import ModelRegistry
+
+JOB_DESCRIPTIONS = [
+    "Python developer with SQL, Docker and AWS experience to build data pipelines.",
+    "Data scientist: machine learning, deep learning, pandas and numpy. Python a plus.",
+    "Usability testing lead. Usability testing and user research every week.",
+    "We need a friendly person to greet our visitors at the front desk.",  # Names no skill
+]
+
+
+def brute_force(matcher, resume_vectors, resume_skills, job_descriptions):
+    """Scores every pair one at a time: dense cosine similarity and weighted overlap of lowercased skills."""
+    positions = {}
+    for n, skill in enumerate(matcher.skill_matcher.keywords):
+        positions.setdefault(skill.lower(), n)
+    jd_vectors = matcher.vectorize(job_descriptions)
+    use_vectors = resume_vectors is not None and jd_vectors is not None
+
+    n, m = len(resume_skills), len(job_descriptions)
+    ats_score, similarity, overlap = np.zeros((n, m), dtype=int), np.zeros((n, m)), np.full((n, m), np.nan)
+    for j, text in enumerate(job_descriptions):
+        wanted = {skill.lower() for skill in matcher.skill_matcher.find(text.lower())}
+        total = sum(matcher.weights[positions[skill]] for skill in wanted)
+        for i, skills in enumerate(resume_skills):
+            if use_vectors:
+                a, b = resume_vectors[i].toarray().ravel(), jd_vectors[j].toarray().ravel()
+                norms = np.linalg.norm(a) * np.linalg.norm(b)
+                similarity[i, j] = a @ b / norms if norms else 0.0
+            have = {skill.lower() for skill in skills}
+            if total > 0:
+                overlap[i, j] = sum(matcher.weights[positions[skill]] for skill in wanted & have) / total
+                blended = (matcher.similarity_weight * similarity[i, j] + (1 - matcher.similarity_weight) * overlap[i, j]
+                           if use_vectors else overlap[i, j])
+            else:
+                blended = similarity[i, j] if use_vectors else 0.0
+            ats_score[i, j] = int(np.rint(100 * min(max(blended, 0.0), 1.0)))
+    return ats_score, similarity, overlap
+
+
+def assert_matches_brute_force(matcher, resume_texts, job_descriptions):
+    resume_skills = [app.extract_skills_from_resume(text) for text in resume_texts]
+    resume_vectors = matcher.vectorize(resume_texts)
+    scores = matcher.score(resume_vectors, resume_skills, job_descriptions)
+    ats_score, similarity, overlap = brute_force(matcher, resume_vectors, resume_skills, job_descriptions)
+    np.testing.assert_allclose(scores['similarity'], similarity, atol=1e-9)
+    np.testing.assert_allclose(scores['skill_overlap'], overlap, atol=1e-9)  # NaN where the JD names no skill
+    np.testing.assert_array_equal(scores['ats_score'], ats_score)
+    return scores
+
+
+@pytest.fixture
+def matcher():
+    return app.get_job_matcher(app.model_registry.current())
+
+
+def test_score_matches_brute_force(matcher, resume_texts):
+    scores = assert_matches_brute_force(matcher, resume_texts, JOB_DESCRIPTIONS)
+    # The JD naming no skill is scored on similarity alone
+    assert scores['skills'][3] == []
+    assert np.isnan(scores['skill_overlap'][:, 3]).all()
+    np.testing.assert_array_equal(scores['ats_score'][:, 3], np.rint(100 * np.clip(scores['similarity'][:, 3], 0, 1)))
+
+
+@pytest.mark.parametrize('similarity_weight', [0.0, 0.3, 1.0])
+def test_blending_by_similarity_weight(matcher, resume_texts, similarity_weight):
+    weighted = JobMatcher(matcher.vectorize, matcher.skill_matcher, matcher.weights, similarity_weight)
+    scores = assert_matches_brute_force(weighted, resume_texts, JOB_DESCRIPTIONS)
+    if similarity_weight == 1.0:
+        np.testing.assert_array_equal(scores['ats_score'], np.rint(100 * np.clip(scores['similarity'], 0, 1)))
+
+
+def test_skills_listed_twice_count_once():
+    vectorizer = TfidfVectorizer().fit(["python developer", "sql database", "python and sql", "docker"])
+    skills = ['Python', 'SQL', 'python', 'Docker']
+    weights = skill_weights(skills, vectorizer)
+    assert weights[2] == 0.0
+    assert weights[0] == pytest.approx(vectorizer.idf_[vectorizer.vocabulary_['python']])
+    assert weights[3] == pytest.approx(vectorizer.idf_.max())  # Only seen once, the rarest token
+    assert list(skill_weights(skills)) == [1.0, 1.0, 0.0, 1.0]
+
+    matcher = JobMatcher(lambda texts: None, KeywordMatcher(skills), weights)
+    scores = matcher.score(None, [['PYTHON'], ['Docker']], ["Python, python and Docker"])
+    total = weights[0] + weights[3]
+    assert scores['skill_overlap'][:, 0] == pytest.approx([weights[0] / total, weights[3] / total])
+    assert scores['skills'] == [['Python', 'Docker']]
+
+
+def test_duplicated_app_skill(matcher):
+    # 'Usability Testing' appears twice in ALL_SKILLS; only its first position has a weight
+    first, second = [n for n, skill in enumerate(app.ALL_SKILLS) if skill == 'Usability Testing']
+    assert matcher.weights[first] > 0 and matcher.weights[second] == 0
+    scores = matcher.score(None, [['usability testing']], ["Usability testing, then more usability testing."])
+    assert scores['skills'] == [['Usability Testing']]
+    assert scores['skill_overlap'][0, 0] == 1.0
+
+
+def test_job_description_cache_is_lru():
+    vectorized = []
+    vectorizer = TfidfVectorizer().fit(JOB_DESCRIPTIONS)
+
+    def vectorize(texts):
+        vectorized.extend(texts)
+        return vectorizer.transform(texts)
+
+    matcher = JobMatcher(vectorize, app.skill_matcher, np.ones(len(app.ALL_SKILLS)), cache_size=2)
+    a, b, c = JOB_DESCRIPTIONS[:3]
+    first = matcher.score(None, [['Python']], [a, b, a])
+    assert vectorized == [a, b]
+    assert matcher.score(None, [['Python']], [b, a])['ats_score'].tolist() == [first['ats_score'][0, [1, 0]].tolist()]
+    assert vectorized == [a, b]
+
+    matcher.score(None, [['Python']], [c])  # Evicts b, the least recently used
+    assert vectorized == [a, b, c]
+    matcher.score(None, [['Python']], [a])
+    assert vectorized == [a, b, c]
+    matcher.score(None, [['Python']], [b])
+    assert vectorized == [a, b, c, b]
+
+
+@pytest.fixture
+def mock_models(tmp_path, monkeypatch):
+    # No pickles: the models fall back to mocks and no vectorizer is available
+    monkeypatch.setattr(app, 'model_registry', ModelRegistry(str(tmp_path), app.load_model))
+    return app.model_registry.current()
+
+
+def test_mock_mode_scores_skill_overlap_only(mock_models, resume_texts):
+    matcher = app.get_job_matcher(mock_models)
+    assert matcher.vectorize(JOB_DESCRIPTIONS) is None
+    scores = assert_matches_brute_force(matcher, resume_texts, JOB_DESCRIPTIONS)
+    assert not scores['similarity'].any()
+    assert not scores['ats_score'][:, 3].any()
+
+
+def assert_route_matches_brute_force(matcher, resume_texts, job_descriptions):
+    response = app.app.test_client().post('/match', json={'resumes': resume_texts, 'job_descriptions': job_descriptions})
+    assert response.status_code == 200
+    matches = response.get_json()['matches']
+    resume_skills = [app.extract_skills_from_resume(text) for text in resume_texts]
+    ats_score, similarity, overlap = brute_force(matcher, matcher.vectorize(resume_texts), resume_skills,
+                                                 job_descriptions)
+    assert len(matches) == len(resume_texts)
+    for i, row in enumerate(matches):
+        have = {skill.lower() for skill in resume_skills[i]}
+        for j, match in enumerate(row):
+            assert match['ats_score'] == ats_score[i, j]
+            assert match['similarity'] == pytest.approx(similarity[i, j], abs=1e-4)
+            if math.isnan(overlap[i, j]):
+                assert match['skill_overlap'] is None
+            else:
+                assert match['skill_overlap'] == pytest.approx(overlap[i, j], abs=1e-4)
+            wanted = list(dict.fromkeys(app.skill_matcher.find(job_descriptions[j].lower())))
+            assert match['matched_skills'] + match['missing_skills'] == \
+                [skill for skill in wanted if skill.lower() in have] + [skill for skill in wanted if skill.lower() not in have]
+
+
+def test_match_route(matcher, resume_texts):
+    assert_route_matches_brute_force(matcher, resume_texts[:4], JOB_DESCRIPTIONS)
+
+
+def test_match_route_in_mock_mode(mock_models, resume_texts):
+    assert_route_matches_brute_force(app.get_job_matcher(mock_models), resume_texts[:4], JOB_DESCRIPTIONS)
+
+
+@pytest.mark.parametrize('body', [{}, {'resumes': ['text']}, {'resumes': 'text', 'job_descriptions': ['jd']},
+                                  {'resumes': ['text'], 'job_descriptions': [1]}])
+def test_match_route_rejects_bad_queries(body):
+    assert app.app.test_client().post('/match', json=body).status_code == 400
@@ -0,0 +1,141 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from job_queue import JobQueue, JobQueueFull
+
+
+def wait_for(queue, job_id, statuses, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        record = queue.get(job_id)
+        if record is not None and record['status'] in statuses:
+            return record
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not reach {statuses}")
+
+
+def test_job_lifecycle():
+    queue = JobQueue(max_workers=1)
+    release = threading.Event()
+    job_id = queue.submit(lambda x: release.wait(5) and x * 2, 21)
+    assert wait_for(queue, job_id, ('running',))['status'] == 'running'
+    assert queue.snapshot()['running'] == 1
+
+    release.set()
+    record = wait_for(queue, job_id, ('done',))
+    assert record['result'] == 42
+    assert record['submitted_at'] <= record['started_at'] <= record['finished_at']
+    assert queue.snapshot() == {'submitted': 1, 'rejected': 0, 'completed': 1, 'failed': 0, 'queued': 0, 'running': 0}
+
+
+def test_failed_job():
+    queue = JobQueue(max_workers=1)
+
+    def fail():
+        raise ValueError("Unreadable resume")
+
+    record = wait_for(queue, queue.submit(fail), ('done', 'failed'))
+    assert record['status'] == 'failed'
+    assert record['error'] == "Unreadable resume"
+    assert queue.snapshot()['failed'] == 1
+
+
+def test_full_queue_rejects_submissions():
+    queue = JobQueue(max_workers=1, max_pending=1)
+    release = threading.Event()
+    running = queue.submit(release.wait, 5)
+    wait_for(queue, running, ('running',))
+    queued = queue.submit(release.wait, 5)
+    with pytest.raises(JobQueueFull):
+        queue.submit(release.wait, 5)
+    assert queue.snapshot()['rejected'] == 1
+
+    release.set()
+    wait_for(queue, queued, ('done',))
+    wait_for(queue, queue.submit(str, 1), ('done',))
+
+
+def test_finished_jobs_expire(monkeypatch):
+    queue = JobQueue(max_workers=1, ttl_seconds=60)
+    release = threading.Event()
+    done = queue.submit(str, 1)
+    wait_for(queue, done, ('done',))
+    running = queue.submit(release.wait, 5)
+    wait_for(queue, running, ('running',))
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    assert queue.get(done) is None
+    # Unfinished jobs never expire
+    assert queue.get(running)['status'] == 'running'
+    monkeypatch.undo()
+    release.set()
+    wait_for(queue, running, ('done',))
+
+
+def test_unknown_job():
+    assert JobQueue().get('0' * 32) is None
+
+
+def test_status_shared_through_sqlite(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'jobs.db')
+    queue = JobQueue(max_workers=1, ttl_seconds=60, db_path=db_path)
+    job_id = queue.submit(lambda: {'ats_score': 80})
+    wait_for(queue, job_id, ('done',))
+
+    # Another process sharing the file sees the job, though it did not run it
+    other = JobQueue(db_path=db_path, ttl_seconds=60)
+    record = other.get(job_id)
+    assert record['status'] == 'done'
+    assert record['result'] == {'ats_score': 80}
+    assert other.snapshot()['submitted'] == 0
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    assert other.get(job_id) is None
+
+
+def test_failed_status_write_does_not_stop_the_worker(monkeypatch):
+    queue = JobQueue(max_workers=1)
+    save = queue._save
+    failures = []
+
+    def save_failing_once(record):
+        if record['status'] == 'running' and not failures:
+            failures.append(record['status'])
+            raise sqlite3.OperationalError("database is locked")
+        save(record)
+
+    monkeypatch.setattr(queue, '_save', save_failing_once)
+    record = wait_for(queue, queue.submit(str, 1), ('done', 'failed'))
+    assert record['status'] == 'failed'
+    assert record['error'] == "database is locked"
+    # The same single worker still runs the next job
+    assert wait_for(queue, queue.submit(str, 2), ('done', 'failed'))['result'] == '2'
+    assert queue.snapshot()['failed'] == 1
+
+
+def test_result_that_cannot_be_saved_fails_the_job(tmp_path):
+    queue = JobQueue(max_workers=1, db_path=str(tmp_path / 'jobs.db'))
+    record = wait_for(queue, queue.submit(object), ('done', 'failed'))
+    assert record['status'] == 'failed'
+    assert 'JSON' in record['error']
+    assert JobQueue(db_path=str(tmp_path / 'jobs.db')).get(record['id'])['status'] == 'failed'
+    assert wait_for(queue, queue.submit(str, 2), ('done', 'failed'))['status'] == 'done'
+
+
+def test_failure_kept_in_memory_when_it_cannot_be_saved(monkeypatch):
+    queue = JobQueue(max_workers=1)
+    save = queue._save
+
+    def save_only_queued(record):
+        if record['status'] != 'queued':
+            raise sqlite3.OperationalError("database is locked")
+        save(record)
+
+    monkeypatch.setattr(queue, '_save', save_only_queued)
+    assert wait_for(queue, queue.submit(str, 1), ('done', 'failed'))['status'] == 'failed'
+
@@ -0,0 +1,139 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+from candidate_store import CandidateStore
+from keyword_bitsets import (KeywordVocabulary, contains_all, coverage_gaps, keyword_frequency, overlap_counts,
+                             popcount, read_bitsets, write_bitsets)
+
+# 21 keywords, so rows end in a partly used byte; 'sql' repeats 'SQL' and shares its bit
+KEYWORDS = ['Python', 'Java', 'SQL', 'C++', 'Machine Learning', 'Docker', 'Kubernetes', 'React', 'Excel', 'Tableau',
+            'AWS', 'Azure', 'Spark', 'Hadoop', 'Git', 'Linux', 'TensorFlow', 'Pandas', 'Django', 'Flask', 'sql']
+
+
+def random_lists(count, seed=0):
+    rng = random.Random(seed)
+    return [rng.sample(KEYWORDS[:-1], rng.randint(0, 10)) for _ in range(count)]
+
+
+def test_encode_decode_round_trip():
+    vocabulary = KeywordVocabulary(KEYWORDS)
+    lists = random_lists(100)
+    packed = vocabulary.encode(lists)
+    assert packed.shape == (100, 3) and packed.dtype == np.uint8
+    decoded = vocabulary.decode(packed)
+    for keywords, row in zip(lists, decoded):
+        assert row == [keyword for keyword in KEYWORDS if keyword in keywords]
+    assert list(popcount(packed)) == [len(keywords) for keywords in lists]
+
+
+def test_encoding_is_case_insensitive_and_ignores_unknown_keywords():
+    vocabulary = KeywordVocabulary(KEYWORDS)
+    assert vocabulary.decode(vocabulary.mask(['python', 'SQL', 'sql', 'COBOL'])) == [['Python', 'SQL']]
+    assert vocabulary.encode([]).shape == (0, 3)
+
+
+def test_set_operations_match_python_sets():
+    vocabulary = KeywordVocabulary(KEYWORDS)
+    lists = random_lists(200)
+    packed = vocabulary.encode(lists)
+    rng = random.Random(1)
+    for _ in range(50):
+        query_keywords = rng.sample(KEYWORDS[:-1], rng.randint(1, 4))
+        query = vocabulary.mask(query_keywords)
+        overlaps = overlap_counts(packed, query)
+        matches = contains_all(packed, query)
+        gaps = vocabulary.decode(coverage_gaps(packed, query))
+        for n, keywords in enumerate(lists):
+            assert overlaps[n] == len(set(keywords) & set(query_keywords))
+            assert matches[n] == (set(query_keywords) <= set(keywords))
+            assert set(gaps[n]) == set(query_keywords) - set(keywords)
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 7, 65536])
+def test_keyword_frequency(chunk_rows):
+    vocabulary = KeywordVocabulary(KEYWORDS)
+    lists = random_lists(300)
+    packed = vocabulary.encode(lists)
+    counts = keyword_frequency(packed, vocabulary.size, chunk_rows=chunk_rows)
+    assert [int(count) for count in counts[:-1]] == [sum(keyword in keywords for keywords in lists)
+                                                     for keyword in KEYWORDS[:-1]]
+    assert counts[-1] == 0
+
+    groups = np.array([n % 4 for n in range(len(lists))])
+    by_group = keyword_frequency(packed, vocabulary.size, groups, 5, chunk_rows=chunk_rows)
+    assert by_group.shape == (5, vocabulary.size)
+    assert (by_group.sum(axis=0) == counts).all()
+    for group in range(4):
+        assert (by_group[group] == keyword_frequency(packed[groups == group], vocabulary.size)).all()
+    assert not by_group[4].any()
+
+
+def test_write_read_round_trip(tmp_path):
+    vocabulary = KeywordVocabulary(KEYWORDS)
+    lists = random_lists(1000)
+    packed = vocabulary.encode(lists)
+    path = str(tmp_path / 'skills.bits')
+    chunks = [packed[start:start + 300] for start in range(0, len(packed), 300)]
+    assert write_bitsets(path, vocabulary, chunks, {'categories': ['HR', 'Testing']}) == 1000
+
+    file_vocabulary, rows, metadata = read_bitsets(path, vocabulary)
+    assert isinstance(rows, np.memmap)
+    assert file_vocabulary.keywords == KEYWORDS
+    assert metadata == {'categories': ['HR', 'Testing']}
+    assert (np.asarray(rows) == packed).all()
+    assert file_vocabulary.decode(rows[:10]) == vocabulary.decode(packed[:10])
+    # Rows start at an aligned offset
+    assert rows.offset % 64 == 0
+
+
+def test_read_empty_file(tmp_path):
+    vocabulary = KeywordVocabulary(KEYWORDS)
+    path = str(tmp_path / 'empty.bits')
+    assert write_bitsets(path, vocabulary, []) == 0
+    _, rows, metadata = read_bitsets(path)
+    assert rows.shape == (0, 3)
+    assert metadata == {}
+
+
+def test_vocabulary_mismatch(tmp_path):
+    path = str(tmp_path / 'skills.bits')
+    write_bitsets(path, KeywordVocabulary(KEYWORDS), [KeywordVocabulary(KEYWORDS).encode(random_lists(5))])
+    with pytest.raises(ValueError):
+        read_bitsets(path, KeywordVocabulary(KEYWORDS[::-1]))
+
+
+def test_write_rejects_wrong_row_width(tmp_path):
+    with pytest.raises(ValueError):
+        write_bitsets(str(tmp_path / 'skills.bits'), KeywordVocabulary(KEYWORDS), [np.zeros((2, 4), dtype=np.uint8)])
+
+
+def test_read_rejects_other_files(tmp_path):
+    path = tmp_path / 'resume.txt'
+    path.write_bytes(b'Python developer')
+    with pytest.raises(ValueError):
+        read_bitsets(str(path))
+
+
+def test_candidate_store_export(tmp_path):
+    skills, education = KeywordVocabulary(KEYWORDS[:-1]), KeywordVocabulary(['Bachelor', 'Master'])
+    store = CandidateStore(str(tmp_path / 'candidates.db'), lambda: (None, 0), skills, education)
+    lists = random_lists(50)
+    store.add_many([{'key': str(n), 'name': 'N/A', 'email': 'N/A', 'phone': 'N/A',
+                     'predicted_category': ['HR', 'Testing'][n % 2], 'recommended_job': 'N/A',
+                     'extracted_skills': keywords, 'extracted_education': ['Master'], 'ats_score': 0}
+                    for n, keywords in enumerate(lists)])
+    assert store.export_bitsets(str(tmp_path / 'pool')) == 50
+
+    _, rows, metadata = read_bitsets(str(tmp_path / 'pool' / 'skills.bits'), skills)
+    assert skills.decode(rows) == [[keyword for keyword in KEYWORDS if keyword in keywords] for keywords in lists]
+    candidates = np.load(os.path.join(str(tmp_path / 'pool'), 'candidates.npy'))
+    assert list(candidates['id']) == list(range(1, 51))
+
+    by_category = store.keyword_frequency(by_category=True)
+    for code, category in enumerate(metadata['categories']):
+        counts = keyword_frequency(rows[candidates['category'] == code], skills.size)
+        assert by_category[category] == {skills.keywords[i]: int(counts[i]) for i in np.argsort(-counts, kind='stable')
+                                         if counts[i]}
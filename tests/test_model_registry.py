@@ -0,0 +1,86 @@
+import os
+import pickle
+
+import pytest
+
+import app
+from model_registry import ModelRegistry
+
+
+def load(filename, models_dir):
+    with open(os.path.join(models_dir, filename), 'rb') as f:
+        return pickle.load(f)
+
+
+def write_model(models_dir, filename, model, mtime):
+    path = os.path.join(models_dir, filename)
+    with open(path, 'wb') as f:
+        pickle.dump(model, f)
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    write_model(tmp_path, 'model.pkl', 'first', mtime=1_000_000)
+    return str(tmp_path)
+
+
+def test_current_swaps_when_pickles_change(models_dir):
+    registry = ModelRegistry(models_dir, load, preload=['model.pkl'], check_interval=0)
+    first = registry.current()
+    assert first.get('model.pkl') == 'first'
+    assert registry.current() is first
+
+    write_model(models_dir, 'model.pkl', 'second', mtime=2_000_000)
+    second = registry.current()
+    assert second is not first
+    assert second.generation == first.generation + 1
+    # Preloaded by the swap, before any request asks for it
+    assert 'model.pkl' in second.info
+    assert second.get('model.pkl') == 'second'
+    assert registry.current() is second
+    # Requests that started on the old set keep it
+    assert first.get('model.pkl') == 'first'
+
+    write_model(models_dir, 'other.pkl', 'new file', mtime=3_000_000)
+    assert registry.current().generation == second.generation + 1
+
+
+def test_checks_are_throttled(models_dir):
+    registry = ModelRegistry(models_dir, load, check_interval=3600)
+    first = registry.current()
+    write_model(models_dir, 'model.pkl', 'second', mtime=2_000_000)
+    assert registry.current() is first
+
+    registry = ModelRegistry(models_dir, load)
+    first = registry.current()
+    write_model(models_dir, 'model.pkl', 'third', mtime=3_000_000)
+    assert registry.current() is first
+
+
+def test_swap_replacing_a_set_that_is_already_gone(models_dir):
+    registry = ModelRegistry(models_dir, load)
+    old = registry.current()
+    new = registry.swap()
+    assert registry.swap(replacing=old) is new
+    assert registry.current().generation == new.generation
+
+
+@pytest.fixture
+def reload_client(models_dir, monkeypatch):
+    monkeypatch.setattr(app, 'model_registry', ModelRegistry(models_dir, load))
+    monkeypatch.setattr(app, 'MODEL_FILES', ['model.pkl'])
+    return app.app.test_client()
+
+
+def test_reload_route_requires_the_token(reload_client, monkeypatch):
+    monkeypatch.setattr(app, 'ADMIN_API_TOKEN', '')
+    assert reload_client.post('/models/reload').status_code == 404
+    monkeypatch.setattr(app, 'ADMIN_API_TOKEN', 'secret')
+    assert reload_client.post('/models/reload', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert app.model_registry.current().generation == 0
+
+    response = reload_client.post('/models/reload', headers={'Authorization': 'Bearer secret'})
+    assert response.status_code == 200
+    assert response.get_json()['generation'] == 1
+    assert 'model.pkl' in response.get_json()['models']
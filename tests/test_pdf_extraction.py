@@ -0,0 +1,139 @@
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PyPDF2 import PdfReader
+
+import app
+from benchmarks import synthetic_resumes
+from benchmarks.synthetic_resumes import render_pdf
+from pdf_extraction import MAX_FORM_DEPTH, PdfExtractionService, PdfExtractionTimeout, PdfHasNoTextLayer
+
+
+def lines(count, word='python'):
+    return '\n'.join(f"Line {n}: {word} developer with SQL and Docker" for n in range(count))
+
+
+def pypdf2_pages(pdf):
+    return [page.extract_text() or '' for page in PdfReader(io.BytesIO(pdf)).pages]
+
+
+def stream(dictionary, content):
+    return f"<< {dictionary} /Length {len(content)} >>\nstream\n".encode() + content + b"\nendstream"
+
+
+def one_page_pdf(resources, content, *objects):
+    """A one-page PDF; objects are numbered from 5, after the catalog, page tree, page and its content."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>",
+               b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+               f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources {resources} /Contents 4 0 R >>".encode(),
+               stream('', content), *objects]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return bytes(pdf)
+
+
+def nested_form_pdf(depth):
+    """A page whose only text is drawn by a form XObject nested depth forms deep."""
+    forms = []
+    for level in range(1, depth):
+        forms.append(stream(f"/Type /XObject /Subtype /Form /BBox [0 0 612 792] "
+                            f"/Resources << /XObject << /Fm{level + 1} {5 + level} 0 R >> >>", f"/Fm{level + 1} Do".encode()))
+    forms.append(stream(f"/Type /XObject /Subtype /Form /BBox [0 0 612 792] /Resources << /Font << /F1 {5 + depth} 0 R >> >>",
+                        b"BT /F1 12 Tf 72 700 Td (Python developer in a nested form) Tj ET"))
+    font = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    return one_page_pdf("<< /XObject << /Fm1 5 0 R >> >>", b"/Fm1 Do", *forms, font)
+
+
+@pytest.fixture(scope='module')
+def service():
+    # Warm: the workers are started before any test's timeout runs
+    service = PdfExtractionService(max_workers=2, timeout=30, fallback=False)
+    service.extract_text(render_pdf('warm-up'))
+    return service
+
+
+def test_pages_stream_in_order(service):
+    pdf = render_pdf(lines(300))
+    expected = pypdf2_pages(pdf)
+    assert len(expected) == 5
+    assert list(service.iter_pages(pdf)) == list(enumerate(expected))
+    assert service.extract_text(io.BytesIO(pdf)) == ' '.join(expected)
+
+
+def test_page_cap(service, monkeypatch):
+    counts = []
+    monkeypatch.setattr(service, 'max_pages', 3)
+    monkeypatch.setattr(service, 'on_page_count', counts.append)
+    pdf = render_pdf(lines(300, word='java'))
+    truncated = service.stats['truncated']
+    assert service.extract_pages(pdf) == pypdf2_pages(pdf)[:3]
+    assert service.stats['truncated'] == truncated + 1
+    assert counts == [5]
+
+
+def test_timeout_leaves_other_documents_extracted(service, monkeypatch):
+    monkeypatch.setattr(synthetic_resumes, 'PDF_LINES_PER_PAGE', 30000)
+    slow = render_pdf(lines(30000, word='cobol'))  # One page taking seconds to extract
+    monkeypatch.setattr(synthetic_resumes, 'PDF_LINES_PER_PAGE', 3000)
+    others = [render_pdf(lines(24000, word=word)) for word in ('rust', 'scala')]  # 8 pages each
+    expected = [' '.join(pypdf2_pages(pdf)) for pdf in others]
+
+    stats = dict(service.stats)
+    monkeypatch.setattr(service, 'timeout', 0.5)
+    with ThreadPoolExecutor(max_workers=3) as threads:
+        timed_out = threads.submit(service.extract_text, slow)
+        # The slow document's deadline is set once its probe has been counted
+        while service.stats['documents'] == stats['documents']:
+            time.sleep(0.01)
+        monkeypatch.setattr(service, 'timeout', 30)
+        in_flight = [threads.submit(service.extract_text, pdf) for pdf in others]
+
+        with pytest.raises(PdfExtractionTimeout):
+            timed_out.result()
+        assert [future.result() for future in in_flight] == expected
+    assert service.stats['timeouts'] == stats['timeouts'] + 1
+    # Their pages still queued or running when the pool was replaced were resubmitted
+    assert service.stats['resubmitted_tasks'] > stats['resubmitted_tasks']
+
+
+def test_bad_pdf_gives_empty_text():
+    assert app.pdf_to_text(io.BytesIO(b'%PDF-1.4 this is not really a PDF')) == ""
+    assert app.pdfs_to_text([io.BytesIO(b'not a PDF'), io.BytesIO(render_pdf('Python developer'))]) == \
+        ["", 'Python developer\n']
+
+
+def test_image_only_pdf_is_rejected(service):
+    image = stream("/Type /XObject /Subtype /Image /Width 1 /Height 1 /ColorSpace /DeviceGray /BitsPerComponent 8",
+                   b"\xff")
+    pdf = one_page_pdf("<< /XObject << /Im1 5 0 R >> >>", b"q 100 0 0 100 0 0 cm /Im1 Do Q", image)
+    image_only = service.stats['image_only']
+    with pytest.raises(PdfHasNoTextLayer):
+        service.extract_text(pdf)
+    assert service.stats['image_only'] == image_only + 1
+    with pytest.raises(ValueError, match='no text layer'):
+        app.pdf_to_text(io.BytesIO(pdf))
+
+
+@pytest.mark.parametrize('depth', [1, MAX_FORM_DEPTH, MAX_FORM_DEPTH + 1, MAX_FORM_DEPTH + 2])
+def test_text_in_nested_forms_is_extracted(service, depth):
+    pdf = nested_form_pdf(depth)
+    assert 'Python developer in a nested form' in service.extract_text(pdf)
+
+
+def test_reupload_is_served_from_the_page_cache(service):
+    pdf = render_pdf(lines(300, word='golang'))
+    stats = dict(service.stats)
+    first = service.extract_pages(pdf)
+    assert service.stats['cached_pages'] == stats['cached_pages']
+    assert service.extract_pages(io.BytesIO(pdf)) == first
+    assert service.stats['cached_pages'] == stats['cached_pages'] + len(first)
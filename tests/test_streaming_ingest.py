@@ -0,0 +1,107 @@
+import io
+import random
+import zipfile
+
+import pytest
+
+import app
+from streaming_ingest import (ArchiveTooLarge, ChunkedTextScanner, FileTooLarge, iter_decoded_chunks,
+                              iter_text_chunks, spool_stream)
+
+PATTERNS = {'phone': app.PHONE_PATTERN, 'email': app.EMAIL_PATTERN}
+MATCHERS = {'skills': app.skill_matcher, 'education': app.education_matcher,
+            'certifications': app.certification_matcher}
+
+
+def scan(text, chunk_chars, overlap):
+    scanner = ChunkedTextScanner(patterns=PATTERNS, matchers=MATCHERS, overlap=overlap)
+    for chunk in iter_text_chunks(text, chunk_chars):
+        scanner.feed(chunk)
+    return scanner.close()
+
+
+@pytest.mark.parametrize('chunk_chars', [1, 7, 64, 333, 4096, 1 << 20])
+def test_chunked_scan_matches_whole_text(resume_texts, chunk_chars):
+    for text in resume_texts:
+        scanner = scan(text, chunk_chars, overlap=512)
+        for name, pattern in PATTERNS.items():
+            match = pattern.search(text)
+            assert scanner.matches[name] == (match.group() if match else None)
+        for name, matcher in MATCHERS.items():
+            assert scanner.found_keywords(name) == matcher.find(text.lower())
+
+
+def test_chunked_scan_random_boundaries(resume_texts):
+    rng = random.Random(1)
+    for text in resume_texts:
+        scanner = ChunkedTextScanner(patterns=PATTERNS, matchers=MATCHERS, overlap=64)
+        position = 0
+        while position < len(text):
+            size = rng.randint(0, 40)
+            scanner.feed(text[position:position + size])
+            position += size
+        scanner.close()
+        for name, pattern in PATTERNS.items():
+            match = pattern.search(text)
+            assert scanner.matches[name] == (match.group() if match else None)
+        for name, matcher in MATCHERS.items():
+            assert scanner.found_keywords(name) == matcher.find(text.lower())
+
+
+def test_empty_text():
+    scanner = scan('', 16, overlap=8)
+    assert scanner.matches == {'phone': None, 'email': None}
+    assert all(scanner.found_keywords(name) == [] for name in MATCHERS)
+
+
+def test_decoded_chunks_split_multibyte_characters():
+    text = 'R\u00e9sum\u00e9 \u2013 na\u00efve \u4e2d\u6587 \U0001f600 ' * 50
+    data = text.encode('utf-8')
+    for block_bytes in (1, 2, 3, 5, 64):
+        assert ''.join(iter_decoded_chunks(io.BytesIO(data), block_bytes=block_bytes)) == text
+    with pytest.raises(UnicodeDecodeError):
+        list(iter_decoded_chunks(io.BytesIO(b'abc\xff'), block_bytes=2))
+
+
+def test_spool_stream_limit():
+    spooled = spool_stream(io.BytesIO(b'x' * 1000), max_bytes=1000, spool_threshold=100)
+    assert spooled.read() == b'x' * 1000
+    with pytest.raises(FileTooLarge):
+        spool_stream(io.BytesIO(b'x' * 1001), max_bytes=1000, spool_threshold=100)
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def test_archive_member_limit(monkeypatch):
+    monkeypatch.setattr(app, 'MAX_ARCHIVE_MEMBERS', 3)
+    assert len(app.read_resume_archive(make_zip({f'{n}.txt': b'resume' for n in range(3)}))) == 3
+    with pytest.raises(ArchiveTooLarge):
+        app.read_resume_archive(make_zip({f'{n}.txt': b'resume' for n in range(4)}))
+
+
+def test_archive_size_limits(monkeypatch):
+    monkeypatch.setattr(app, 'MAX_RESUME_BYTES', 1000)
+    monkeypatch.setattr(app, 'MAX_ARCHIVE_BYTES', 2500)
+    named_files = app.read_resume_archive(make_zip({'a.txt': b'a' * 1000, 'big.txt': b'b' * 5000, 'c.txt': b'c' * 1000}))
+    assert [name for name, _ in named_files] == ['a.txt', 'big.txt', 'c.txt']
+    assert isinstance(named_files[1][1], FileTooLarge)
+    assert named_files[2][1].read() == b'c' * 1000
+
+    # Oversized members do not count towards the total; the third full-size member does
+    with pytest.raises(ArchiveTooLarge):
+        app.read_resume_archive(make_zip({f'{n}.txt': b'r' * 1000 for n in range(3)}))
+
+
+def test_batch_route_rejects_large_archive(monkeypatch):
+    monkeypatch.setattr(app, 'MAX_ARCHIVE_MEMBERS', 2)
+    archive = make_zip({f'{n}.txt': b'Python developer' for n in range(3)})
+    response = app.app.test_client().post('/pred/batch', data={'resumes': (archive, 'resumes.zip')},
+                                          content_type='multipart/form-data')
+    assert response.status_code == 400
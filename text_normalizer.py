@@ -0,0 +1,43 @@
+import re
+import string
+
+# Sequences the original cleaner turns into whitespace before hashtags/mentions are matched:
+# URLs followed by whitespace, and every 'RT' / 'cc'.
+_BREAKS = r'http\S+\s|RT|cc'
+
+_HASHTAG_START = r'#(?!' + _BREAKS + r')\S'
+
+# Pass 1: URLs, 'RT'/'cc', hashtags and mentions in one scan. Hashtag and mention bodies
+# stop where an earlier-stage substitution would already have split them (a mention also
+# stops at a hashtag), so this matches applying the four original substitutions in order.
+_MARKUP_PATTERN = re.compile(
+    r'http\S+\s'
+    r'|RT|cc'
+    r'|#(?:(?!' + _BREAKS + r')\S)+(?:\s|' + _BREAKS + r')*'
+    r'|@(?:(?!' + _BREAKS + r'|' + _HASHTAG_START + r')\S)+'
+)
+
+# Pass 2: isolated non-alphanumeric characters between whitespace (ATS margin noise)
+_ISOLATED_CHAR_PATTERN = re.compile(r'\s+[^a-z0-9\s]\s+')
+
+# Pass 3: punctuation, non-ASCII characters and whitespace all become spaces and runs of
+# them collapse to one. This runs on bytes: encoding with errors='replace' turns every
+# non-ASCII character into '?', and one translate table maps punctuation (including '?')
+# and the extra ASCII whitespace str.split() misses on bytes to spaces, and folds case.
+_SEPARATOR_TABLE = bytearray(range(256))
+for _byte in string.punctuation.encode('ascii') + b'\x1c\x1d\x1e\x1f':
+    _SEPARATOR_TABLE[_byte] = ord(' ')
+for _byte in string.ascii_uppercase.encode('ascii'):
+    _SEPARATOR_TABLE[_byte] = _byte + 32
+_SEPARATOR_TABLE = bytes(_SEPARATOR_TABLE)
+
+
+def clean_resume_text(txt):
+    """
+    Normalizes resume text for ML prediction with two precompiled regex passes and one
+    byte-level translate. The output is identical to the original eight-substitution cleanResume.
+    """
+    clean_text = _MARKUP_PATTERN.sub(' ', txt)
+    clean_text = _ISOLATED_CHAR_PATTERN.sub(' ', clean_text)
+    words = clean_text.encode('ascii', 'replace').translate(_SEPARATOR_TABLE).split()
+    return b' '.join(words).decode('ascii')
@@ -0,0 +1,208 @@
+"""
+Offline training for the two model pairs app.py loads from models/:
+  - categorization: TF-IDF + classifier on UpdatedResumeDataSet.csv (Resume -> Category);
+  - job recommendation: TF-IDF + classifier on job_title_des.csv (Job Description -> Job Title),
+    the dataset of 'Resume Job Recommendation System.ipynb'. It is not in the repository,
+    so this pair is only trained when the file is present (see --job-data).
+
+Each preset is trained on the same split and compared on accuracy, pickle size and
+predict latency. The preset given with --save is written as drop-in pickles for
+load_model, plus manifest.json with their versions (shown by /models).
+
+Examples (run from the repository root):
+    python train_models.py                                  # compare the presets
+    python train_models.py --save linear --output models    # then POST /models/reload
+    python train_models.py --model forest --trees 50 --max-depth 40 --max-features 20000 --save custom
+"""
+import argparse
+import csv
+import json
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import train_test_split
+from sklearn.svm import LinearSVC
+
+from model_registry import MANIFEST_FILENAME, file_checksum
+from text_normalizer import clean_resume_text
+
+RESUME_DATASET = 'UpdatedResumeDataSet.csv'
+JOB_DATASET = 'job_title_des.csv'
+
+# The filenames app.py loads (see 'Model Loading and Configuration' there)
+MODEL_FILES = {
+    'categorization': ('tfidf_vectorizer_categorization.pkl', 'rf_classifier_categorization.pkl'),
+    'job_recommendation': ('tfidf_vectorizer_job_recommendation.pkl', 'rf_classifier_job_recommendation.pkl'),
+}
+
+# Vectorizer and classifier settings per preset. 'baseline' is what the notebooks train.
+PRESETS = {
+    'baseline': {'model': 'forest', 'trees': 100, 'max_depth': None, 'max_features': None, 'dtype': 'float64'},
+    'compact': {'model': 'forest', 'trees': 40, 'max_depth': 40, 'max_features': 20000, 'dtype': 'float32'},
+    'linear': {'model': 'linear', 'max_features': 20000, 'dtype': 'float32'},
+}
+
+LATENCY_REPEATS = 50  # Single-document predictions timed per preset
+
+
+def load_dataset(path, text_column, label_column, min_label_count=2):
+    """
+    Reads (texts, labels) from a CSV, dropping repeated texts (the resume dataset lists most
+    resumes several times, which would leak between the train and test split) and labels
+    with fewer than min_label_count examples.
+    """
+    csv.field_size_limit(sys.maxsize)
+    examples = {}
+    with open(path, encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            text, label = row.get(text_column), row.get(label_column)
+            if text and label:
+                examples.setdefault(text, label)
+    counts = {}
+    for label in examples.values():
+        counts[label] = counts.get(label, 0) + 1
+    pairs = [(text, label) for text, label in examples.items() if counts[label] >= min_label_count]
+    return [clean_resume_text(text) for text, _ in pairs], [label for _, label in pairs]
+
+
+def build_models(preset, seed):
+    vectorizer = TfidfVectorizer(max_features=preset.get('max_features'), dtype=np.dtype(preset.get('dtype', 'float64')).type)
+    if preset['model'] == 'linear':
+        classifier = LinearSVC(random_state=seed)
+    else:
+        classifier = RandomForestClassifier(n_estimators=preset.get('trees', 100), max_depth=preset.get('max_depth'),
+                                            random_state=seed)
+    return vectorizer, classifier
+
+
+def train_and_evaluate(name, preset, split, seed):
+    """Fits one preset and measures it. Returns (vectorizer, classifier, report row)."""
+    train_texts, test_texts, train_labels, test_labels = split
+    vectorizer, classifier = build_models(preset, seed)
+
+    start = time.perf_counter()
+    classifier.fit(vectorizer.fit_transform(train_texts), train_labels)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predictions = classifier.predict(vectorizer.transform(test_texts))
+    batch_seconds = time.perf_counter() - start
+
+    # Single-resume latency, as in /pred: one transform and one predict
+    latencies = []
+    for text in (test_texts * LATENCY_REPEATS)[:LATENCY_REPEATS]:
+        start = time.perf_counter()
+        classifier.predict(vectorizer.transform([text]))
+        latencies.append(time.perf_counter() - start)
+
+    return vectorizer, classifier, {
+        'preset': name,
+        'accuracy': round(accuracy_score(test_labels, predictions), 4),
+        'macro_f1': round(f1_score(test_labels, predictions, average='macro', zero_division=0), 4),
+        'size_kb': round((len(pickle.dumps(vectorizer)) + len(pickle.dumps(classifier))) / 1024, 1),
+        'vocabulary': len(vectorizer.vocabulary_),
+        'fit_seconds': round(fit_seconds, 2),
+        'predict_p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 3),
+        'batch_docs_per_sec': round(len(test_texts) / batch_seconds, 1),
+    }
+
+
+def print_table(task, rows, file=sys.stderr):
+    columns = ['preset', 'accuracy', 'macro_f1', 'size_kb', 'vocabulary', 'fit_seconds', 'predict_p50_ms', 'batch_docs_per_sec']
+    print(f"\n{task}", file=file)
+    print('  '.join(f"{column:>18}" for column in columns), file=file)
+    for row in rows:
+        print('  '.join(f"{row[column]!s:>18}" for column in columns), file=file)
+
+
+def save_models(task, vectorizer, classifier, output, version, manifest):
+    """Writes one model pair as the pickles load_model expects and records their versions."""
+    os.makedirs(output, exist_ok=True)
+    for filename, model in zip(MODEL_FILES[task], (vectorizer, classifier)):
+        path = os.path.join(output, filename)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump(model, f)
+        # Replaced atomically, so a running server never reads a half-written pickle
+        os.replace(temp_path, path)
+        manifest[filename] = f"{version}-{file_checksum(path)[:8]}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the categorization and job recommendation models and compare presets.")
+    parser.add_argument('--resume-data', default=RESUME_DATASET, help="Resume CSV with Resume and Category columns")
+    parser.add_argument('--job-data', default=JOB_DATASET, help="Job CSV with 'Job Description' and 'Job Title' columns")
+    parser.add_argument('--min-label-count', type=int, default=2, help="Drop labels with fewer examples than this")
+    parser.add_argument('--presets', nargs='*', default=list(PRESETS), help="Presets to train and compare")
+    parser.add_argument('--save', help="Preset to write to --output (default: only compare)")
+    parser.add_argument('--output', default='models', help="Directory for the pickles and manifest.json (default: models)")
+    parser.add_argument('--report', help="Also write the comparison as JSON to this file")
+    parser.add_argument('--test-size', type=float, default=0.2, help="Share of each dataset held out for evaluation")
+    parser.add_argument('--seed', type=int, default=42)
+    custom = parser.add_argument_group("custom preset (trained as 'custom' when --model is given)")
+    custom.add_argument('--model', choices=['forest', 'linear'], help="Random forest or linear SVM classifier")
+    custom.add_argument('--trees', type=int, default=100, help="Trees in the forest")
+    custom.add_argument('--max-depth', type=int, help="Maximum tree depth (default: unlimited)")
+    custom.add_argument('--max-features', type=int, help="Vocabulary size cap (default: unlimited)")
+    custom.add_argument('--dtype', choices=['float32', 'float64'], default='float32', help="TF-IDF feature dtype")
+    args = parser.parse_args(argv)
+
+    presets = {name: PRESETS[name] for name in args.presets if name in PRESETS}
+    if args.model:
+        presets['custom'] = {'model': args.model, 'trees': args.trees, 'max_depth': args.max_depth,
+                             'max_features': args.max_features, 'dtype': args.dtype}
+    unknown = [name for name in args.presets if name not in PRESETS]
+    if unknown or not presets:
+        parser.error(f"unknown presets: {', '.join(unknown)} (choose from {', '.join(PRESETS)}, or give --model)")
+    if args.save and args.save not in presets:
+        parser.error(f"--save must be one of the trained presets: {', '.join(presets)}")
+
+    datasets = {'categorization': (args.resume_data, 'Resume', 'Category')}
+    if os.path.exists(args.job_data):
+        datasets['job_recommendation'] = (args.job_data, 'Job Description', 'Job Title')
+    else:
+        print(f"{args.job_data} not found; the job recommendation models are left as they are.", file=sys.stderr)
+
+    manifest_path = os.path.join(args.output, MANIFEST_FILENAME)
+    manifest = {}
+    if args.save and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    report = {}
+    for task, (path, text_column, label_column) in datasets.items():
+        texts, labels = load_dataset(path, text_column, label_column, args.min_label_count)
+        split = train_test_split(texts, labels, test_size=args.test_size, random_state=args.seed, stratify=labels)
+        print(f"{task}: {len(texts)} unique examples, {len(set(labels))} labels, {len(split[1])} held out", file=sys.stderr)
+
+        rows = []
+        for name, preset in presets.items():
+            vectorizer, classifier, row = train_and_evaluate(name, preset, split, args.seed)
+            rows.append(row)
+            if name == args.save:
+                # The saved models are refitted on every example, not just the training split
+                vectorizer, classifier = build_models(preset, args.seed)
+                classifier.fit(vectorizer.fit_transform(texts), labels)
+                save_models(task, vectorizer, classifier, args.output, f"{name}-{time.strftime('%Y%m%d')}", manifest)
+        print_table(task, rows)
+        report[task] = {'examples': len(texts), 'labels': len(set(labels)), 'presets': rows}
+
+    if args.save:
+        manifest['training'] = {'preset': args.save, 'settings': presets[args.save], 'trained_at': time.time(),
+                                'report': report}
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        print(f"\nSaved the '{args.save}' models to {args.output}. POST /models/reload to serve them.", file=sys.stderr)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()